@@ -2,7 +2,23 @@ from django.contrib import admin
 from authentication.models import *
 
 admin.site.register(User)
-admin.site.register(StudentProfile)
-admin.site.register(AdminProfile)
+
+
+@admin.register(StudentProfile)
+class StudentProfileAdmin(admin.ModelAdmin):
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(AdminProfile)
+class AdminProfileAdmin(admin.ModelAdmin):
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'subject', 'status', 'attempts', 'next_attempt_at')
+    list_filter = ('status',)
 
 # Register your models here.
@@ -3,3 +3,12 @@ from django.apps import AppConfig
 class AuthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'  
+
+    def ready(self):
+        from authentication.signals import connect_signals
+        connect_signals()
+
+        from authentication import login, throttling
+        from core.metrics import register_gauges
+        register_gauges('mpas_login_hashing', login.metrics.snapshot, 'Login password hashing pool.')
+        register_gauges('mpas_auth_throttle', throttling.metrics.snapshot, 'Auth endpoint requests allowed and throttled.')
@@ -1,22 +1,25 @@
 from django.contrib.auth.backends import BaseBackend
 from .models import User
 
+
+def lookup_user(username, role):
+    """The user a login form refers to: students by student_id, admins by email."""
+    if role == 'student':
+        lookup = {'student_id': username, 'role': 'student'}
+    elif role and role.startswith('admin'):
+        lookup = {'email': username, 'role': role}
+    else:
+        return None
+
+    try:
+        return User.objects.get(**lookup)
+    except User.DoesNotExist:
+        return None
+
+
 class StudentAdminAuthBackend(BaseBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
-        # Try student login
-        user = None
-
-        if 'role' in kwargs and kwargs['role'] == 'student':
-            try:
-                user = User.objects.get(student_id=username, role='student')
-            except User.DoesNotExist:
-                return None
-
-        elif 'role' in kwargs and kwargs['role'].startswith('admin'):
-            try:
-                user = User.objects.get(email=username, role=kwargs['role'])
-            except User.DoesNotExist:
-                return None
+        user = lookup_user(username, kwargs.get('role'))
 
         if user and user.check_password(password):
             return user
@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from authentication.models import EmailOutbox, StudentProfile, User
+from authentication.outbox import account_created_email
+from authentication.stats import invalidate_stats
+from core.academic import current_academic_year
+from core.models import FeeStructure, ProgramFee
+from core.processes import django_process_pool
+
+REQUIRED_FIELDS = ['full_name', 'student_id', 'password', 'program', 'level']
+OPTIONAL_FIELDS = ['email', 'phone_number', 'status']
+
+# SQLite caps bound parameters per statement; keep IN (...) lookups below it.
+LOOKUP_CHUNK = 500
+
+
+def get_import_settings():
+    return {
+        'CHUNK_SIZE': 1000,
+        'HASH_WORKERS': None,
+        'INLINE_HASH_THRESHOLD': 200,
+        'MAX_API_ROWS': 200,
+        **getattr(settings, 'STUDENT_IMPORT', {}),
+    }
+
+
+def parse_rows(content, fmt):
+    """Rows as dicts from CSV text or a JSON list (or ``{"students": [...]}``)."""
+    if fmt == 'csv':
+        return [dict(row) for row in csv.DictReader(io.StringIO(content))]
+    data = json.loads(content) if isinstance(content, str) else content
+    if isinstance(data, dict):
+        data = data.get('students', [])
+    if not isinstance(data, list):
+        raise ValueError("Expected a list of student rows.")
+    return data
+
+
+def _existing(field, values):
+    found = set()
+    values = list(values)
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        found.update(
+            User.objects.filter(**{f'{field}__in': values[start:start + LOOKUP_CHUNK]}).values_list(field, flat=True)
+        )
+    return found
+
+
+def validate_rows(rows):
+    """
+    Check every row before anything is written. Returns ``(valid, errors)``
+    where ``valid`` holds ``(row_number, cleaned)`` pairs and ``errors`` one
+    entry per rejected row. Row numbers are 1-based data rows.
+    """
+    cleaned_rows = []
+    errors = []
+    seen_ids, seen_emails = {}, {}
+
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({'row': number, 'errors': ["Row must be an object."]})
+            continue
+        cleaned = {
+            field: str(row.get(field) or '').strip()
+            for field in REQUIRED_FIELDS + OPTIONAL_FIELDS
+        }
+        row_errors = [f"{field} is required." for field in REQUIRED_FIELDS if not cleaned[field]]
+
+        status = cleaned['status'] or 'active'
+        if status not in dict(StudentProfile.STATUS_CHOICES):
+            row_errors.append("Status must be either 'active' or 'inactive'.")
+        cleaned['status'] = status
+        cleaned['email'] = cleaned['email'].lower() or None
+
+        if cleaned['student_id'] in seen_ids:
+            row_errors.append(f"Duplicate student_id (also on row {seen_ids[cleaned['student_id']]}).")
+        elif cleaned['student_id']:
+            seen_ids[cleaned['student_id']] = number
+        if cleaned['email'] and cleaned['email'] in seen_emails:
+            row_errors.append(f"Duplicate email (also on row {seen_emails[cleaned['email']]}).")
+        elif cleaned['email']:
+            seen_emails[cleaned['email']] = number
+
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+        else:
+            cleaned_rows.append((number, cleaned))
+
+    taken_ids = _existing('student_id', (row['student_id'] for _, row in cleaned_rows))
+    taken_emails = _existing('email', (row['email'] for _, row in cleaned_rows if row['email']))
+
+    valid = []
+    for number, row in cleaned_rows:
+        row_errors = []
+        if row['student_id'] in taken_ids:
+            row_errors.append("A user with this student_id already exists.")
+        if row['email'] and row['email'] in taken_emails:
+            row_errors.append("A user with this email already exists.")
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+        else:
+            valid.append((number, row))
+
+    errors.sort(key=lambda error: error['row'])
+    return valid, errors
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    PBKDF2 is deliberately slow, so large batches are spread over a process
+    pool; small ones are not worth the pool start-up cost.
+    """
+    config = get_import_settings()
+    if len(passwords) <= config['INLINE_HASH_THRESHOLD']:
+        return [make_password(password) for password in passwords]
+
+    workers = workers or config['HASH_WORKERS']
+    with django_process_pool(workers) as pool:
+        chunksize = max(1, len(passwords) // ((workers or 4) * 8))
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def import_students(rows, workers=None, skip_invalid=False, notify=False, dry_run=False):
+    """
+    Validate, hash and bulk insert students with their profiles and fee
+    structures. Without ``skip_invalid`` a single bad row aborts the import.
+    Returns a report dict.
+    """
+    config = get_import_settings()
+    valid, errors = validate_rows(rows)
+    report = {'total': len(rows), 'created': 0, 'errors': errors, 'warnings': []}
+
+    if dry_run or not valid or (errors and not skip_invalid):
+        return report
+
+    program_fees = {(fee.program, fee.level): fee for fee in ProgramFee.objects.all()}
+    for number, row in valid:
+        if (row['program'], row['level']) not in program_fees:
+            report['warnings'].append({
+                'row': number,
+                'warning': f"No program fee for {row['program']} level {row['level']}; no fee structure created.",
+            })
+
+    hashed = hash_passwords([row['password'] for _, row in valid], workers)
+    academic_year = current_academic_year()
+    chunk_size = config['CHUNK_SIZE']
+
+    with transaction.atomic():
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            users = User.objects.bulk_create([
+                User(
+                    full_name=row['full_name'],
+                    email=row['email'],
+                    student_id=row['student_id'],
+                    phone_number=row['phone_number'],
+                    role='student',
+                    password=password,
+                )
+                for (_, row), password in zip(chunk, hashed[start:start + chunk_size])
+            ])
+            StudentProfile.objects.bulk_create([
+                StudentProfile(user=user, program=row['program'], level=row['level'], status=row['status'])
+                for user, (_, row) in zip(users, chunk)
+            ])
+
+            fee_structures = []
+            for user, (_, row) in zip(users, chunk):
+                fee = program_fees.get((row['program'], row['level']))
+                if fee:
+                    fee_structures.append(FeeStructure(
+                        student=user,
+                        academic_year=academic_year,
+                        tuition_fee=fee.tuition_fee,
+                        hostel_fee=fee.hostel_fee,
+                        other_fee=fee.other_fee,
+                        # bulk_create skips save(), which normally sets this.
+                        total_fee=fee.tuition_fee + fee.hostel_fee + fee.other_fee,
+                    ))
+            FeeStructure.objects.bulk_create(fee_structures)
+
+            if notify:
+                outbox = []
+                for user, (_, row) in zip(users, chunk):
+                    if user.email:
+                        subject, html_content = account_created_email(user, row['password'])
+                        outbox.append(EmailOutbox(to_email=user.email, subject=subject, html_message=html_content))
+                EmailOutbox.objects.bulk_create(outbox)
+
+            report['created'] += len(users)
+
+    # bulk_create sends no post_save, so the dashboard counters would
+    # otherwise stay stale until their cache entry expires.
+    invalidate_stats()
+    return report
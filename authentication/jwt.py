@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import User
+
+VERSION_CLAIM = 'ver'
+
+
+def get_jwt_cache_settings():
+    return {
+        'TIMEOUT': 60,
+        'TOKEN_CLAIMS': False,
+        **getattr(settings, 'JWT_USER_CACHE', {}),
+    }
+
+
+def user_cache_key(user_id):
+    return f"jwt_user:{user_id}"
+
+
+def load_user(user_id):
+    """The user with both profiles joined, so views reading them do not query."""
+    try:
+        return User.objects.select_related('student_profile', 'admin_profile').get(pk=user_id)
+    except User.DoesNotExist:
+        return None
+
+
+def get_cached_user(user_id):
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = load_user(user_id)
+        if user is not None:
+            cache.set(key, user, get_jwt_cache_settings()['TIMEOUT'])
+    return user
+
+
+def invalidate_user(sender, instance, **kwargs):
+    """Signal receiver for User and profile changes."""
+    cache.delete(user_cache_key(instance.pk if sender is User else instance.user_id))
+
+
+def profile_claims(user):
+    if user.role == 'student' and hasattr(user, 'student_profile'):
+        profile = user.student_profile
+        return {'program': profile.program, 'level': profile.level, 'status': profile.status}
+    if user.role == 'admin' and hasattr(user, 'admin_profile'):
+        profile = user.admin_profile
+        return {'department': profile.department, 'status': profile.status}
+    return {}
+
+
+def get_tokens_for_user(user):
+    refresh = RefreshToken.for_user(user)
+    refresh[VERSION_CLAIM] = user.token_version
+    if get_jwt_cache_settings()['TOKEN_CLAIMS']:
+        refresh['role'] = user.role
+        refresh['profile'] = profile_claims(user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from the cache instead of
+    loading the row on every request. Entries expire after ``TIMEOUT``
+    seconds and are dropped when the user or a profile is saved; tokens
+    whose ``ver`` claim no longer matches the user's ``token_version``
+    are rejected.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Tokens issued before token_version existed carry no claim.
+        if validated_token.get(VERSION_CLAIM, 0) != user.token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        return user
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher
+
+from authentication.backends import lookup_user
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class LoginBusy(Exception):
+    """More logins are waiting for a hashing thread than ``MAX_QUEUE`` allows."""
+
+
+def get_login_settings():
+    return {
+        'HASH_WORKERS': 2,
+        'MAX_QUEUE': 200,
+        'SLOW_QUEUE_SECONDS': 1.0,
+        **getattr(settings, 'LOGIN_HASHING', {}),
+    }
+
+
+class HashingMetrics:
+    """
+    Counters for the hashing pool. Queue time is how long a login waited
+    for a free hashing thread; the most recent samples give percentiles.
+    """
+
+    def __init__(self, samples=1024):
+        self._lock = threading.Lock()
+        self._queue_times = deque(maxlen=samples)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.submitted = 0
+            self.rejected = 0
+            self.waiting = 0
+            self.running = 0
+            self.queue_time_total = 0.0
+            self.queue_time_max = 0.0
+            self._queue_times.clear()
+
+    def try_enqueue(self, max_queue):
+        with self._lock:
+            if self.waiting >= max_queue:
+                self.rejected += 1
+                return False
+            self.submitted += 1
+            self.waiting += 1
+            return True
+
+    def started(self, queue_time):
+        with self._lock:
+            self.waiting -= 1
+            self.running += 1
+            self.queue_time_total += queue_time
+            self.queue_time_max = max(self.queue_time_max, queue_time)
+            self._queue_times.append(queue_time)
+
+    def finished(self):
+        with self._lock:
+            self.running -= 1
+
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self._queue_times)
+            started = self.submitted - self.waiting
+
+            def pct(p):
+                if not recent:
+                    return 0.0
+                return recent[min(len(recent) - 1, int(round(p / 100 * (len(recent) - 1))))]
+
+            return {
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'waiting': self.waiting,
+                'running': self.running,
+                'queue_time_avg': self.queue_time_total / started if started else 0.0,
+                'queue_time_max': self.queue_time_max,
+                'queue_time_p50': pct(50),
+                'queue_time_p95': pct(95),
+                'queue_time_p99': pct(99),
+            }
+
+
+metrics = HashingMetrics()
+
+
+def hash_workers():
+    """
+    ``HASH_WORKERS``, capped one below the CPU count (at least one) so
+    hashing never takes every core from the event loop.
+    """
+    return max(1, min(get_login_settings()['HASH_WORKERS'], (os.cpu_count() or 2) - 1))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=hash_workers(),
+                    thread_name_prefix='login-hash',
+                )
+    return _executor
+
+
+def _timed_check(submitted, password, encoded):
+    queue_time = time.perf_counter() - submitted
+    metrics.started(queue_time)
+    if queue_time > get_login_settings()['SLOW_QUEUE_SECONDS']:
+        logger.warning("Login waited %.2fs for a hashing thread", queue_time)
+    try:
+        return check_password(password, encoded)
+    finally:
+        metrics.finished()
+
+
+async def verify_password(password, encoded):
+    """
+    Check ``password`` on the hashing pool instead of the event loop or
+    the thread sync views share. hashlib releases the GIL while running
+    PBKDF2, so ``hash_workers()`` threads hash in parallel; the pool size
+    caps how much CPU a login storm can take from other requests.
+    """
+    config = get_login_settings()
+    if not metrics.try_enqueue(config['MAX_QUEUE']):
+        raise LoginBusy()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), _timed_check, time.perf_counter(), password, encoded
+    )
+
+
+def _upgrade_password(user, password):
+    user.set_password(password)
+    user.save(update_fields=['password'])
+
+
+async def authenticate_login(username, password, role):
+    """
+    Async counterpart of ``StudentAdminAuthBackend.authenticate``: the user
+    lookup runs on Django's sync thread, the hash check on the hashing pool.
+    """
+    user = await sync_to_async(lookup_user)(username, role)
+    if user is None or not user.has_usable_password():
+        return None
+
+    if not await verify_password(password, user.password):
+        return None
+
+    # Same rehash-on-login as AbstractBaseUser.check_password when the
+    # hasher's iteration count has been raised.
+    if identify_hasher(user.password).must_update(user.password):
+        await sync_to_async(_upgrade_password)(user, password)
+    return user
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.importers import import_students, parse_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import students, with their profiles and fee structures, from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV with a header row, or a JSON list of student objects.")
+        parser.add_argument('--format', choices=['csv', 'json'], help="Defaults to the file extension.")
+        parser.add_argument('--workers', type=int, help="Password hashing processes (defaults to the CPU count).")
+        parser.add_argument('--skip-invalid', action='store_true', help="Import the valid rows even if some are invalid.")
+        parser.add_argument('--notify', action='store_true', help="Queue an account email for every student with an address.")
+        parser.add_argument('--dry-run', action='store_true', help="Validate only; write nothing.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('json' if path.lower().endswith('.json') else 'csv')
+        try:
+            with open(path, encoding='utf-8-sig', newline='') as f:
+                rows = parse_rows(f.read(), fmt)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+        report = import_students(
+            rows,
+            workers=options['workers'],
+            skip_invalid=options['skip_invalid'],
+            notify=options['notify'],
+            dry_run=options['dry_run'],
+        )
+
+        for error in report['errors']:
+            self.stderr.write(f"Row {error['row']}: {' '.join(error['errors'])}")
+        for warning in report['warnings']:
+            self.stdout.write(f"Row {warning['row']}: {warning['warning']}")
+
+        if report['errors'] and not options['skip_invalid']:
+            raise CommandError(f"{len(report['errors'])} invalid rows; nothing imported.")
+
+        verb = "would be imported" if options['dry_run'] else "imported"
+        count = report['total'] - len(report['errors']) if options['dry_run'] else report['created']
+        self.stdout.write(self.style.SUCCESS(f"{count} of {report['total']} students {verb}."))
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.utils import timezone
 
 class UserManager(BaseUserManager):
     def create_user(self, email=None, student_id=None, password=None, **extra_fields):
@@ -35,12 +36,20 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Carried in every JWT; bumping it rejects all tokens issued before.
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['full_name', 'role']
 
+    class Meta:
+        indexes = [
+            # Student and admin listings filter on role.
+            models.Index(fields=['role', 'created_at'], name='auth_user_role_created_idx'),
+        ]
+
     def __str__(self):
         return self.email or self.student_id
 
@@ -74,3 +83,29 @@ class AdminProfile(models.Model):
 
     def __str__(self):
         return f"AdminProfile({self.user.full_name})"
+
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    html_message = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='auth_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"EmailOutbox({self.id}, {self.to_email}, {self.status})"
@@ -0,0 +1,133 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.models import EmailOutbox
+from core.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+def get_outbox_settings():
+    return {
+        'BATCH_SIZE': 50,
+        'MAX_ATTEMPTS': 5,
+        'BACKOFF_SECONDS': 30,
+        'LEASE_SECONDS': 300,
+        **getattr(settings, 'EMAIL_OUTBOX', {}),
+    }
+
+
+def queue_email(to_email, subject, html_message):
+    return EmailOutbox.objects.create(to_email=to_email, subject=subject, html_message=html_message)
+
+
+def account_created_email(user, raw_password):
+    subject = 'Your GCTU Student Account Details'
+    html_content = f"""
+        <p>Hello <strong>{user.full_name}</strong>,</p>
+        <p>Your student portal account has been created.</p>
+        <p><strong>Login Details:</strong><br>
+        Student ID: {user.student_id}<br>
+        PIN (Password): <strong>{raw_password}</strong></p>
+        <p>Please keep this information safe. Contact administration if you need to change your PIN.</p>
+        <p>Best regards,<br>GCTU Admin Team</p>
+        """
+    return subject, html_content
+
+
+def _build_message(item, connection):
+    message = EmailMultiAlternatives(
+        subject=item.subject,
+        body='',
+        from_email=settings.EMAIL_HOST_USER,
+        to=[item.to_email],
+        connection=connection,
+    )
+    message.attach_alternative(item.html_message, 'text/html')
+    return message
+
+
+def _record_failure(item, error, config, now):
+    item.attempts += 1
+    item.last_error = str(error)
+    if item.attempts >= config['MAX_ATTEMPTS']:
+        item.status = 'dead'
+        # Never sent, but the body can still hold credentials.
+        item.html_message = ''
+        logger.error("Email %s to %s moved to dead letter: %s", item.pk, item.to_email, error)
+    else:
+        # Exponential backoff: 30s, 60s, 120s, ...
+        delay = config['BACKOFF_SECONDS'] * 2 ** (item.attempts - 1)
+        item.next_attempt_at = now + timedelta(seconds=delay)
+    item.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at', 'html_message'])
+
+
+def claim_due(batch_size, lease_seconds, now):
+    """
+    Lease up to ``batch_size`` due messages to the caller by moving their
+    next_attempt_at past the lease, so an overlapping send_outbox run
+    skips them. If the caller dies mid-batch they come due again once the
+    lease runs out.
+    """
+    with transaction.atomic():
+        # Row locks where the database has them; SQLite's IMMEDIATE
+        # transactions already hold its write lock from here to commit.
+        items = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        lease_until = now + timedelta(seconds=lease_seconds)
+        EmailOutbox.objects.filter(pk__in=[item.pk for item in items]).update(next_attempt_at=lease_until)
+    for item in items:
+        item.next_attempt_at = lease_until
+    return items
+
+
+def deliver_batch(batch_size=None):
+    """
+    Send up to ``batch_size`` due messages over a single SMTP connection.
+    Returns ``(sent, failed)``.
+    """
+    config = get_outbox_settings()
+    now = timezone.now()
+    items = claim_due(batch_size or config['BATCH_SIZE'], config['LEASE_SECONDS'], now)
+    if not items:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        with timed('smtp'):
+            connection.open()
+    except Exception as e:
+        for item in items:
+            _record_failure(item, e, config, now)
+        return 0, len(items)
+
+    sent = failed = 0
+    try:
+        for item in items:
+            try:
+                with timed('smtp'):
+                    connection.send_messages([_build_message(item, connection)])
+            except Exception as e:
+                _record_failure(item, e, config, now)
+                failed += 1
+                continue
+            # The body can hold credentials (registration PINs), so it is
+            # not kept once delivered.
+            item.status = 'sent'
+            item.sent_at = timezone.now()
+            item.attempts += 1
+            item.html_message = ''
+            item.last_error = ''
+            item.save(update_fields=['status', 'sent_at', 'attempts', 'html_message', 'last_error'])
+            sent += 1
+    finally:
+        connection.close()
+    return sent, failed
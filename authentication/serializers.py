@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from authentication.models import User,StudentProfile,AdminProfile
+from core.academic import current_academic_year
 from core.models import ProgramFee, FeeStructure
-from datetime import datetime
 
 class StudentProfileSerializer(serializers.ModelSerializer):
     class Meta:
@@ -101,7 +101,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
                 )
                 FeeStructure.objects.create(
                     student=user,
-                    academic_year=f"{datetime.now().year}/{datetime.now().year + 1}",
+                    academic_year=current_academic_year(),
                     tuition_fee=program_fee.tuition_fee,
                     hostel_fee=program_fee.hostel_fee,
                     other_fee=program_fee.other_fee
@@ -145,25 +145,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
 
 
-class UserLoginSerializer(serializers.Serializer):
+class LoginCredentialsSerializer(serializers.Serializer):
     role = serializers.ChoiceField(choices=User.ROLE_CHOICES)
     username = serializers.CharField()  
     password = serializers.CharField(write_only=True)
-
-    def validate(self, data):
-        from django.contrib.auth import authenticate
-
-        user = authenticate(
-            request=self.context.get('request'),
-            username=data['username'],
-            password=data['password'],
-            role=data['role']
-        )
-
-        if not user:
-            raise serializers.ValidationError("Invalid credentials.")
-        if not user.is_active:
-            raise serializers.ValidationError("User account is disabled.")
-
-        data['user'] = user
-        return data
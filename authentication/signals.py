@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+
+from authentication.jwt import invalidate_user
+from authentication.models import AdminProfile, StudentProfile, User
+from authentication.stats import invalidate_stats
+
+
+def connect_signals():
+    from core.models import Transaction
+
+    for model in (User, StudentProfile, AdminProfile, Transaction):
+        post_save.connect(invalidate_stats, sender=model, dispatch_uid=f"stats-save-{model.__name__}")
+        post_delete.connect(invalidate_stats, sender=model, dispatch_uid=f"stats-delete-{model.__name__}")
+
+    for model in (User, StudentProfile, AdminProfile):
+        post_save.connect(invalidate_user, sender=model, dispatch_uid=f"jwt-user-save-{model.__name__}")
+        post_delete.connect(invalidate_user, sender=model, dispatch_uid=f"jwt-user-delete-{model.__name__}")
@@ -0,0 +1,70 @@
+import time as clock
+from datetime import datetime, time
+
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils.timezone import make_aware, now
+
+from authentication.models import User
+
+STATS_CACHE_TIMEOUT = 300
+STATS_GENERATION_KEY = "authentication:stats:generation"
+
+
+def start_of_current_month():
+    today = now()
+    return make_aware(datetime.combine(today.replace(day=1), time.min))
+
+
+def stats_generation():
+    """
+    Bumped by ``invalidate_stats``. Stats are stored under the generation
+    read before computing them, so a computation that overlaps a change
+    lands under a key no reader uses any more.
+    """
+    return cache.get_or_set(STATS_GENERATION_KEY, clock.time_ns, timeout=None)
+
+
+def stats_cache_key(start_of_month, generation):
+    return f"authentication:stats:{start_of_month:%Y-%m}:{generation}"
+
+
+def compute_stats(start_of_month):
+    """
+    Every dashboard counter in two queries: one over users joined to their
+    (one-to-one) profiles, one sum over completed transactions.
+    """
+    from core.models import Transaction
+
+    counts = User.objects.aggregate(
+        total_students=Count('id', filter=Q(role='student')),
+        total_admins=Count('id', filter=Q(role='admin')),
+        new_students_this_month=Count('id', filter=Q(role='student', created_at__gte=start_of_month)),
+        new_admins_this_month=Count('id', filter=Q(role='admin', created_at__gte=start_of_month)),
+        active_students=Count('student_profile', filter=Q(student_profile__status='active')),
+        inactive_students=Count('student_profile', filter=Q(student_profile__status='inactive')),
+        active_admins=Count('admin_profile', filter=Q(admin_profile__status='active')),
+        inactive_admins=Count('admin_profile', filter=Q(admin_profile__status='inactive')),
+    )
+    counts['total_amount_paid'] = Transaction.objects.filter(status='completed').aggregate(
+        total=Sum('amount')
+    )['total'] or 0
+    return counts
+
+
+def get_stats():
+    start_of_month = start_of_current_month()
+    key = stats_cache_key(start_of_month, stats_generation())
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_stats(start_of_month)
+        cache.set(key, stats, timeout=STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_stats(**kwargs):
+    try:
+        cache.incr(STATS_GENERATION_KEY)
+    except ValueError:
+        # Never read, or evicted: any fresh generation will do.
+        cache.set(STATS_GENERATION_KEY, clock.time_ns(), timeout=None)
@@ -0,0 +1,138 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def get_throttle_settings():
+    return {
+        'login': {'IP': '30/min', 'IDENTIFIER': '10/min'},
+        'forgot_password': {'IP': '10/hour', 'IDENTIFIER': '3/hour'},
+        'reset_password': {'IP': '20/hour', 'IDENTIFIER': '5/hour'},
+        **getattr(settings, 'AUTH_THROTTLES', {}),
+    }
+
+
+def parse_rate(rate):
+    """``"10/min"`` -> ``(10, 60)``: bursts of 10, refilled at 10 per minute."""
+    if not rate:
+        return None
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+class ThrottleMetrics:
+    """Requests allowed and throttled per scope, and which bucket ran dry."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+
+    def record(self, scope, outcome):
+        with self._lock:
+            key = f"{scope}_{outcome}"
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+metrics = ThrottleMetrics()
+
+_bucket_lock = threading.Lock()
+
+
+def take_token(key, rate, now=None):
+    """
+    Take one token from the bucket stored under ``key``. Returns None if
+    there was one, otherwise the seconds until the next token.
+    """
+    capacity, period = rate
+    refill = capacity / period
+    now = time.time() if now is None else now
+    # A bucket left alone for `period` is full again, same as no entry.
+    timeout = math.ceil(period) + 1
+
+    def take(state):
+        tokens, updated = state or (capacity, now)
+        tokens = min(capacity, tokens + (now - updated) * refill)
+        if tokens >= 1:
+            return (tokens - 1, now), None
+        return (tokens, now), (1 - tokens) / refill
+
+    if hasattr(cache, 'update'):
+        # core.cache.SQLiteCache: read, refill and write in one transaction
+        # on the file every worker process shares.
+        return cache.update(key, take, timeout)
+    # Other backends: atomic between threads of this process only.
+    with _bucket_lock:
+        state, wait = take(cache.get(key))
+        cache.set(key, state, timeout)
+    return wait
+
+
+class AuthRateThrottle(BaseThrottle):
+    """
+    Token buckets per client IP and per identifier (the username or email
+    the request is about), so one address cannot hammer many accounts and
+    many addresses cannot hammer one. Requests are refused before they reach
+    the database, the password hasher or the outbox.
+    """
+    scope = None
+    identifier_field = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def check(self, ident, identifier=None):
+        config = get_throttle_settings().get(self.scope, {})
+        buckets = [('ip', ident, parse_rate(config.get('IP')))]
+        if identifier:
+            digest = hashlib.sha256(str(identifier).strip().lower().encode()).hexdigest()[:32]
+            buckets.append(('identifier', digest, parse_rate(config.get('IDENTIFIER'))))
+
+        for dimension, value, rate in buckets:
+            if rate is None:
+                continue
+            wait = take_token(f"throttle:{self.scope}:{dimension}:{value}", rate)
+            if wait is not None:
+                metrics.record(self.scope, f"throttled_{dimension}")
+                self.wait_seconds = wait
+                return False
+        metrics.record(self.scope, 'allowed')
+        return True
+
+    def allow_request(self, request, view):
+        identifier = None
+        if self.identifier_field and hasattr(request.data, 'get'):
+            identifier = request.data.get(self.identifier_field)
+        return self.check(self.get_ident(request), identifier)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginThrottle(AuthRateThrottle):
+    scope = 'login'
+    identifier_field = 'username'
+
+
+class ForgotPasswordThrottle(AuthRateThrottle):
+    scope = 'forgot_password'
+    identifier_field = 'email'
+
+
+class ResetPasswordThrottle(AuthRateThrottle):
+    scope = 'reset_password'
+    identifier_field = 'email'
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import register_user,update_admin,dashboard_stats,forgot_password,reset_password,login_user,list_all_admins,admin_stats, user_profile,student_stats,list_all_students,update_student
+from .views import register_user,update_admin,dashboard_stats,forgot_password,reset_password,login_user,list_all_admins,admin_stats, user_profile,student_stats,list_all_students,update_student,import_students
 from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
@@ -11,6 +11,7 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('students/', list_all_students, name='list-all-students'),
     path('admins/', list_all_admins, name='list-all-admins'),
+    path('students/import/', import_students, name='import-students'),
     path("students/<str:student_id>/", update_student),
     path("admins/<str:email>/", update_admin),
     path('dashboard/stats/', dashboard_stats, name='dashboard-stats'),
@@ -1,29 +1,11 @@
 
-from django.core.mail import send_mail
-from django.conf import settings
-
-def send_email_notification(to_email, subject, html_message):
-    send_mail(
-        subject=subject,
-        message='', 
-        from_email=settings.EMAIL_HOST_USER,
-        recipient_list=[to_email],
-        html_message=html_message,
-        fail_silently=False,
-    )
-
 # utils/receipt_generator.py
 from reportlab.pdfgen import canvas
-from django.conf import settings
-import os
-import uuid
 
-def generate_receipt_pdf(transaction, user):
-    filename = f"receipt_{transaction.id}_{uuid.uuid4().hex[:6]}.pdf"
-    receipt_path = os.path.join(settings.MEDIA_ROOT, 'receipts', filename)
-    os.makedirs(os.path.dirname(receipt_path), exist_ok=True)
-
-    c = canvas.Canvas(receipt_path)
+def draw_receipt_pdf(transaction, user, receipt_path):
+    # invariant=1 leaves out creation timestamps, so the same transaction
+    # always renders to the same bytes.
+    c = canvas.Canvas(receipt_path, invariant=1)
     c.setFont("Helvetica", 14)
     c.drawString(100, 800, "Payment Receipt")
     c.setFont("Helvetica", 10)
@@ -36,5 +18,3 @@ def generate_receipt_pdf(transaction, user):
     c.drawString(100, 650, f"Status: {transaction.status}")
     c.save()
 
-    return f"{settings.MEDIA_URL}receipts/{filename}"
-
@@ -1,17 +1,24 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.exceptions import Throttled
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.contrib.auth import login
-from rest_framework_simplejwt.tokens import RefreshToken
-from authentication.models import User, StudentProfile,AdminProfile
-from datetime import datetime, time
-from django.utils.timezone import now, make_aware
-from authentication.utils import send_email_notification
-from core.models import Transaction
-from django.db import models
+from authentication.models import User
+from authentication.stats import get_stats
+from authentication.outbox import account_created_email, queue_email
+from authentication.jwt import get_tokens_for_user
+from authentication.login import LoginBusy, authenticate_login
+from authentication.throttling import ForgotPasswordThrottle, LoginThrottle, ResetPasswordThrottle
+from authentication.importers import get_import_settings, import_students as run_student_import, parse_rows
 from django.core.mail import send_mail
 from django.conf import settings
+import json
+import math
 import random
 import string
 from django.core.cache import cache
@@ -19,11 +26,16 @@ from django.core.cache import cache
 
 from .serializers import (
     UserRegistrationSerializer,
-    UserLoginSerializer,
+    LoginCredentialsSerializer,
     UserSerializer,
     StudentProfileSerializer,
     AdminProfileSerializer,StudentDetailSerializer,AdminDetailSerializer
 )
+from core.projections import Projection
+
+# The listings render whole tables; build them from .values() rows.
+STUDENT_LIST = Projection(StudentDetailSerializer)
+ADMIN_LIST = Projection(AdminDetailSerializer)
 
 
 
@@ -36,21 +48,13 @@ def register_user(request):
         user = serializer.save()
         raw_password = serializer.validated_data.get('password')
 
-        subject = 'Your GCTU Student Account Details'
-        html_content = f"""
-        <p>Hello <strong>{user.full_name}</strong>,</p>
-        <p>Your student portal account has been created.</p>
-        <p><strong>Login Details:</strong><br>
-        Student ID: {user.student_id}<br>
-        PIN (Password): <strong>{raw_password}</strong></p>
-        <p>Please keep this information safe. Contact administration if you need to change your PIN.</p>
-        <p>Best regards,<br>GCTU Admin Team</p>
-        """
-
-        send_email_notification(user.email, subject, html_content)
+        # Delivered by the send_outbox worker, not inside the request.
+        if user.email:
+            subject, html_content = account_created_email(user, raw_password)
+            queue_email(user.email, subject, html_content)
 
         return Response({
-            'message': 'User registered successfully. Email sent.',
+            'message': 'User registered successfully.',
             'user': UserSerializer(user).data
         }, status=status.HTTP_201_CREATED)
 
@@ -65,29 +69,78 @@ def register_user(request):
 
 
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def login_user(request):
-    serializer = UserLoginSerializer(data=request.data, context={'request': request})
-    if serializer.is_valid():
-        user = serializer.validated_data['user']
-        tokens = get_tokens_for_user(user)
-        return Response({
-            'message': 'Login successful.',
-            'tokens': tokens,
-            'user': UserSerializer(user).data
-        }, status=status.HTTP_200_OK)
-    return Response(serializer.errors, status=status.HTTP_401_UNAUTHORIZED)
+def _api_response(data, status_code):
+    # Plain async views skip DRF's finalize_response, so pick the renderer
+    # here to keep login responses identical to the @api_view endpoints.
+    response = Response(data, status=status_code)
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = response.accepted_renderer.media_type
+    response.renderer_context = {}
+    return response
 
 
-def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+def _login_payload(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+    return request.POST
+
+
+def _login_success(user):
     return {
-        'refresh': str(refresh),
-        'access': str(refresh.access_token),
+        'message': 'Login successful.',
+        'tokens': get_tokens_for_user(user),
+        'user': UserSerializer(user).data
     }
 
 
+@csrf_exempt
+@require_POST
+async def login_user(request):
+    """
+    Async so that password hashing during a login storm runs on the
+    bounded hashing pool instead of holding up the thread sync views use.
+    """
+    payload = _login_payload(request)
+    if not isinstance(payload, dict):
+        return _api_response({'detail': 'JSON parse error.'}, status.HTTP_400_BAD_REQUEST)
+
+    throttle = LoginThrottle()
+    # Off the event loop, but not on the thread sync views share.
+    allowed = await sync_to_async(throttle.check, thread_sensitive=False)(
+        throttle.get_ident(request), payload.get('username'),
+    )
+    if not allowed:
+        throttled = Throttled(throttle.wait())
+        response = _api_response({'detail': throttled.detail}, throttled.status_code)
+        response['Retry-After'] = '%d' % math.ceil(throttle.wait())
+        return response
+
+    serializer = LoginCredentialsSerializer(data=payload)
+    if not serializer.is_valid():
+        return _api_response(serializer.errors, status.HTTP_401_UNAUTHORIZED)
+    credentials = serializer.validated_data
+
+    try:
+        user = await authenticate_login(credentials['username'], credentials['password'], credentials['role'])
+    except LoginBusy:
+        response = _api_response(
+            {'detail': 'Too many logins in progress. Please try again shortly.'},
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+        response['Retry-After'] = '1'
+        return response
+
+    if not user:
+        return _api_response({'non_field_errors': ['Invalid credentials.']}, status.HTTP_401_UNAUTHORIZED)
+    if not user.is_active:
+        return _api_response({'non_field_errors': ['User account is disabled.']}, status.HTTP_401_UNAUTHORIZED)
+
+    return _api_response(await sync_to_async(_login_success)(user), status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_profile(request):
@@ -106,22 +159,13 @@ def user_profile(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def student_stats(request):
-    today = now()
-    start_of_month = make_aware(datetime.combine(today.replace(day=1), time.min))
-
-    total_students = User.objects.filter(role='student').count()
-    total_active_students = StudentProfile.objects.filter(status='active').count()
-    total_inactive_students = StudentProfile.objects.filter(status='inactive').count()
-    new_students_this_month = User.objects.filter(
-        role='student',
-        created_at__gte=start_of_month
-    ).count()
+    stats = get_stats()
 
     return Response({
-        "total_students": total_students,
-        "total_active_students": total_active_students,
-        "total_inactive_students":total_inactive_students,
-        "new_students_this_month": new_students_this_month,
+        "total_students": stats['total_students'],
+        "total_active_students": stats['active_students'],
+        "total_inactive_students": stats['inactive_students'],
+        "new_students_this_month": stats['new_students_this_month'],
     })
 
 
@@ -129,16 +173,60 @@ def student_stats(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_all_students(request):
-    students = User.objects.filter(role='student').select_related('student_profile')
-    serializer = StudentDetailSerializer(students, many=True)
-    return Response(serializer.data)
+    students = User.objects.filter(role='student')
+    return Response(STUDENT_LIST.data(students))
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_all_admins(request):
-    students = User.objects.filter(role='admin').select_related('admin_profile')
-    serializer = AdminDetailSerializer(students, many=True)
-    return Response(serializer.data)
+    admins = User.objects.filter(role='admin')
+    return Response(ADMIN_LIST.data(admins))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_students(request):
+    """
+    Bulk create students from an uploaded CSV/JSON ``file`` or a JSON body
+    ``{"students": [...]}``. Rows are all validated first; unless
+    ``skip_invalid`` is set, any invalid row rejects the whole import.
+    Files over ``STUDENT_IMPORT['MAX_API_ROWS']`` rows are refused: every
+    password is hashed before the response, so they go through the
+    ``import_students`` management command instead.
+    """
+    if request.user.role != 'admin':
+        return Response({"error": "Only admins can import students."}, status=status.HTTP_403_FORBIDDEN)
+
+    def flag(name):
+        return str(request.data.get(name, '')).lower() in ('1', 'true', 'yes')
+
+    upload = request.FILES.get('file')
+    try:
+        if upload:
+            fmt = 'json' if upload.name.lower().endswith('.json') else 'csv'
+            rows = parse_rows(upload.read().decode('utf-8-sig'), fmt)
+        else:
+            rows = parse_rows(request.data.get('students'), 'json')
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({"error": f"Could not read students: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    max_rows = get_import_settings()['MAX_API_ROWS']
+    if len(rows) > max_rows:
+        return Response(
+            {"error": f"At most {max_rows} students can be imported per request; "
+                      f"use `manage.py import_students` for larger files."},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    report = run_student_import(
+        rows,
+        skip_invalid=flag('skip_invalid'),
+        notify=flag('notify'),
+        dry_run=flag('dry_run'),
+    )
+    if report['errors'] and not flag('skip_invalid'):
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
 
 
 @api_view(['PUT'])
@@ -173,22 +261,13 @@ def update_admin(request, email):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_stats(request):
-    today = now()
-    start_of_month = make_aware(datetime.combine(today.replace(day=1), time.min))
-
-    total_admin = User.objects.filter(role='admin').count()
-    total_active_admin = AdminProfile.objects.filter(status='active').count()
-    total_inactive_admin = AdminProfile.objects.filter(status='inactive').count()
-    new_admin_this_month = User.objects.filter(
-        role='admin',
-        created_at__gte=start_of_month
-    ).count()
+    stats = get_stats()
 
     return Response({
-        "total_admin": total_admin,
-        "total_active_admin": total_active_admin,
-        "total_inactive_admin":total_inactive_admin,
-        "new_admin_this_month": new_admin_this_month,
+        "total_admin": stats['total_admins'],
+        "total_active_admin": stats['active_admins'],
+        "total_inactive_admin": stats['inactive_admins'],
+        "new_admin_this_month": stats['new_admins_this_month'],
     })
 
 
@@ -196,24 +275,13 @@ def admin_stats(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
-    total_students = User.objects.filter(role='student').count()
-    total_admins = User.objects.filter(role='admin').count()
-
-    # Total amount paid from completed transactions only
-    total_amount_paid = Transaction.objects.filter(status='completed').aggregate(
-        total=models.Sum('amount')
-    )['total'] or 0
-
-    # Active users (students + admins with active profiles)
-    active_students = StudentProfile.objects.filter(status='active').count()
-    active_admins = AdminProfile.objects.filter(status='active').count()
-    total_active_users = active_students + active_admins
+    stats = get_stats()
 
     return Response({
-        "total_students": total_students,
-        "total_admins": total_admins,
-        "total_amount_paid": float(total_amount_paid),
-        "total_active_users": total_active_users,
+        "total_students": stats['total_students'],
+        "total_admins": stats['total_admins'],
+        "total_amount_paid": float(stats['total_amount_paid']),
+        "total_active_users": stats['active_students'] + stats['active_admins'],
     })
 
 
@@ -222,6 +290,7 @@ def dashboard_stats(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([ForgotPasswordThrottle])
 def forgot_password(request):
     email = request.data.get('email')
 
@@ -243,7 +312,7 @@ def forgot_password(request):
         <p>Best regards,<br>GCTU Admin Team</p>
         """
 
-        send_email_notification(user.email, subject, html_content)
+        queue_email(user.email, subject, html_content)
 
         return Response({
             'message': 'Password reset instructions sent to your email'
@@ -257,6 +326,7 @@ def forgot_password(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([ResetPasswordThrottle])
 def reset_password(request):
     email = request.data.get('email')
     token = request.data.get('token')
@@ -273,6 +343,8 @@ def reset_password(request):
     try:
         user = User.objects.get(email=email)
         user.set_password(new_password)
+        # Sign out every session that used the old password.
+        user.token_version += 1
         user.save()
 
         # Delete the used token
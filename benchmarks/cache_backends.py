@@ -0,0 +1,149 @@
+"""
+Cache backend microbenchmark: core.cache.SQLiteCache against Django's
+database cache (on a SQLite file with the project's tuned profile) and
+file-based cache, with the per-process local-memory cache as a reference.
+
+For each backend it measures single-process latency of set, get (hit and
+miss), add and incr, then runs ``--processes`` workers against the same
+cache for ``--seconds`` with a 90/10 get/set mix, and finally has every
+worker incr one shared counter ``--increments`` times to count increments
+lost to non-atomic read-modify-write:
+
+    python -m benchmarks.cache_backends --ops 2000 --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import emit, summarize
+
+BACKENDS = ('sqlite', 'db', 'file', 'locmem')
+
+
+def setup_django(workdir):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mpas_backend.settings")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.DATABASES['default']['NAME'] = os.path.join(workdir, "db.sqlite3")
+    settings.CACHES = {
+        'sqlite': {'BACKEND': 'core.cache.SQLiteCache', 'LOCATION': os.path.join(workdir, "cache.sqlite3")},
+        'db': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'bench_cache'},
+        'file': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': os.path.join(workdir, "files")},
+        'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    }
+    for config in settings.CACHES.values():
+        config.setdefault('OPTIONS', {})['MAX_ENTRIES'] = 100000
+
+
+def time_ops(fn, keys):
+    latencies = []
+    for key in keys:
+        started = time.perf_counter()
+        fn(key)
+        latencies.append(time.perf_counter() - started)
+    return summarize(latencies)
+
+
+def single_process(cache, ops):
+    keys = [f"bench:{i}" for i in range(ops)]
+    value = {'student_id': 'ST000001', 'level': '300', 'balance': '1250.00'}
+    result = {
+        'set': time_ops(lambda key: cache.set(key, value, 300), keys),
+        'get_hit': time_ops(lambda key: cache.get(key), keys),
+        'get_miss': time_ops(lambda key: cache.get(f"{key}:missing"), keys),
+        'add': time_ops(lambda key: cache.add(f"{key}:added", 1, 300), keys),
+    }
+    cache.set('bench:counter', 0, None)
+    result['incr'] = time_ops(lambda key: cache.incr('bench:counter'), keys)
+    return result
+
+
+def mixed_worker(alias, keys, deadline, results):
+    from django.core.cache import caches
+
+    cache = caches[alias]
+    rng = random.Random(os.getpid())
+    done = 0
+    while time.time() < deadline:
+        key = f"bench:{rng.randrange(keys)}"
+        if rng.random() < 0.9:
+            cache.get(key)
+        else:
+            cache.set(key, {'n': done}, 300)
+        done += 1
+    results.put(done)
+
+
+def incr_worker(alias, increments):
+    from django.core.cache import caches
+
+    cache = caches[alias]
+    for _ in range(increments):
+        cache.incr('bench:shared_counter')
+
+
+def multi_process(alias, args):
+    from django.core.cache import caches
+    from django.db import connections
+
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    deadline = time.time() + args.seconds
+    procs = [context.Process(target=mixed_worker, args=(alias, args.ops, deadline, results)) for _ in range(args.processes)]
+    for proc in procs:
+        proc.start()
+    total = sum(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+
+    caches[alias].set('bench:shared_counter', 0, None)
+    connections.close_all()
+    procs = [context.Process(target=incr_worker, args=(alias, args.increments)) for _ in range(args.processes)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    expected = args.processes * args.increments
+    return {
+        "mixed_ops_per_second": round(total / args.seconds, 1),
+        "incr_expected": expected,
+        "incr_lost": expected - caches[alias].get('bench:shared_counter'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default=','.join(BACKENDS), help="Comma-separated subset of %s." % ', '.join(BACKENDS))
+    parser.add_argument("--ops", type=int, default=2000, help="Operations per single-process measurement, and keys in the mix.")
+    parser.add_argument("--processes", type=int, default=4, help="Concurrent worker processes.")
+    parser.add_argument("--seconds", type=float, default=5, help="Duration of the mixed workload.")
+    parser.add_argument("--increments", type=int, default=500, help="incr calls per process on the shared counter.")
+    parser.add_argument("--output", help="Write the JSON result to this file as well.")
+    args = parser.parse_args()
+
+    setup_django(tempfile.mkdtemp(prefix="cache-bench-"))
+    from django.core.cache import caches
+    from django.core.management import call_command
+
+    call_command('createcachetable', 'bench_cache', verbosity=0)
+
+    result = {"ops": args.ops, "processes": args.processes, "backends": {}}
+    for alias in args.backends.split(','):
+        cache = caches[alias]
+        cache.clear()
+        entry = {"latency_ms": single_process(cache, args.ops)}
+        # Each process has its own local-memory cache; nothing to share.
+        if alias != 'locmem':
+            entry.update(multi_process(alias, args))
+        result["backends"][alias] = entry
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
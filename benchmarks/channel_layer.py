@@ -0,0 +1,97 @@
+"""
+Throughput benchmark for core.layers.SQLiteChannelLayer.
+
+Starts receiver processes that join one group, then group_sends messages
+from this process and reports send rate, delivery rate and end-to-end
+latency across processes:
+
+    python -m benchmarks.channel_layer --receivers 4 --messages 2000
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import emit, percentile
+from core.layers import SQLiteChannelLayer
+
+GROUP = "benchmark"
+
+
+def receiver(path, messages, ready, results):
+    async def run():
+        layer = SQLiteChannelLayer(path=path, capacity=messages + 1)
+        channel = await layer.new_channel()
+        await layer.group_add(GROUP, channel)
+        ready.release()
+        latencies = []
+        for _ in range(messages):
+            message = await layer.receive(channel)
+            latencies.append(time.time() - message["sent"])
+        await layer.close()
+        results.put(latencies)
+
+    asyncio.run(run())
+
+
+async def send_all(path, messages):
+    layer = SQLiteChannelLayer(path=path)
+    started = time.perf_counter()
+    for i in range(messages):
+        await layer.group_send(GROUP, {"type": "send_message", "n": i, "sent": time.time()})
+    elapsed = time.perf_counter() - started
+    await layer.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--receivers", type=int, default=4, help="Receiver processes joined to the group.")
+    parser.add_argument("--messages", type=int, default=1000, help="Messages sent to the group.")
+    parser.add_argument("--path", help="SQLite file to use; defaults to a temporary file.")
+    parser.add_argument("--output", help="Write the JSON result to this file as well.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="channel-bench-")
+    path = args.path or os.path.join(workdir, "channels.sqlite3")
+
+    ready = multiprocessing.Semaphore(0)
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=receiver, args=(path, args.messages, ready, results))
+        for _ in range(args.receivers)
+    ]
+    for proc in procs:
+        proc.start()
+    for _ in procs:
+        ready.acquire()
+
+    started = time.perf_counter()
+    send_seconds = asyncio.run(send_all(path, args.messages))
+    latencies = []
+    for _ in procs:
+        latencies.extend(results.get())
+    total_seconds = time.perf_counter() - started
+    for proc in procs:
+        proc.join()
+
+    result = {
+        "receivers": args.receivers,
+        "messages": args.messages,
+        "group_sends_per_second": round(args.messages / send_seconds, 1),
+        "deliveries_per_second": round(len(latencies) / total_seconds, 1),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 2),
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+        },
+    }
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
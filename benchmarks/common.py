@@ -0,0 +1,30 @@
+import json
+import statistics
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies):
+    """Latency summary in milliseconds from a list of seconds."""
+    if not latencies:
+        return {"requests": 0}
+    return {
+        "requests": len(latencies),
+        "mean": round(statistics.mean(latencies) * 1000, 2),
+        "p50": round(percentile(latencies, 50) * 1000, 2),
+        "p95": round(percentile(latencies, 95) * 1000, 2),
+        "p99": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def emit(result, output=None):
+    print(json.dumps(result, indent=2))
+    if output:
+        with open(output, "w") as fh:
+            json.dump(result, fh, indent=2)
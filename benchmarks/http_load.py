@@ -0,0 +1,305 @@
+"""
+Mixed-traffic load benchmark for the payment and dashboard endpoints.
+
+Seeds an institution of ``--students`` students into a SQLite file with
+core.seeding (the seed_institution command), then
+drives a weighted mix of requests from ``--concurrency`` threads for
+``--seconds`` and reports per-endpoint latency percentiles, throughput and
+(in-process only) SQL queries per request.
+
+In-process, through Django's test client against a scratch database:
+
+    python -m benchmarks.http_load --students 50000 --seconds 30
+
+Against a running server, seed its database first and point the server
+at it with SQLITE_PATH (tokens are minted locally, so SECRET_KEY must match):
+
+    SQLITE_PATH=/tmp/load.sqlite3 python -m benchmarks.http_load --database /tmp/load.sqlite3 --seed-only
+    SQLITE_PATH=/tmp/load.sqlite3 ALLOWED_HOSTS=127.0.0.1 daphne mpas_backend.asgi:application &
+    python -m benchmarks.http_load --database /tmp/load.sqlite3 --url http://127.0.0.1:8000
+
+Results are printed and, with ``--output``, saved as JSON; ``--compare``
+adds the change against an earlier result file.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.common import emit, summarize
+
+# name -> (method, path, who calls it)
+ENDPOINTS = {
+    'payment': ('POST', '/api/core/payments/', 'student'),
+    'pending_payments': ('GET', '/api/core/payments/pending/', 'student'),
+    'fee_stats': ('GET', '/api/core/fees/stats/', 'student'),
+    'transactions': ('GET', '/api/core/transactions/?page_size=50', 'admin'),
+    'list_all_students': ('GET', '/api/users/students/', 'admin'),
+}
+
+DEFAULT_MIX = 'payment=2,pending_payments=4,fee_stats=4,transactions=2,list_all_students=1'
+
+
+def setup_django(path):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mpas_backend.settings")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    # Must happen before the first connection is opened.
+    settings.DATABASES['default']['NAME'] = path
+    settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ['testserver']
+
+
+def seed(students, admins, seed_value):
+    from django.core.management import call_command
+
+    from authentication.models import User
+    from core.seeding import seed_institution
+
+    call_command('migrate', verbosity=0)
+    if not User.objects.exists():
+        seed_institution(students, admins=admins, seed=seed_value)
+
+
+def load_users():
+    """
+    Access tokens for every seeded user, minted locally, and one payment
+    per student that the API will accept: the first fee type with a
+    balance left.
+    """
+    from authentication.jwt import get_tokens_for_user
+    from authentication.models import User
+    from core.models import FeeStructure
+
+    tokens = {'student': [], 'admin': []}
+    by_pk = {}
+    for pk, role, version in User.objects.values_list('pk', 'role', 'token_version').order_by('pk'):
+        if role in tokens:
+            token = get_tokens_for_user(User(pk=pk, role=role, token_version=version))['access']
+            tokens[role].append(token)
+            by_pk[pk] = token
+
+    payments = []
+    rows = FeeStructure.objects.values_list(
+        'student_id', 'tuition_fee', 'hostel_fee', 'other_fee',
+        'ledger__tuition_paid', 'ledger__hostel_paid', 'ledger__other_paid',
+    ).order_by('student_id')
+    for student_id, tuition, hostel, other, tuition_paid, hostel_paid, other_paid in rows:
+        balances = {
+            'tuition': tuition - (tuition_paid or 0),
+            'hostel': hostel - (hostel_paid or 0),
+            'other': other - (other_paid or 0),
+        }
+        for fee_type, balance in balances.items():
+            if balance > 0:
+                payments.append((by_pk[student_id], fee_type, str(balance)))
+                break
+    return tokens, payments
+
+
+class ClientTransport:
+    """Django test client in this process; counts queries per request."""
+
+    def __init__(self):
+        from django.test import Client
+
+        self.client = Client()
+
+    def request(self, method, path, token, body=None):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        headers = {'Authorization': f"Bearer {token}"}
+        with CaptureQueriesContext(connection) as queries:
+            if method == 'POST':
+                response = self.client.post(path, body, content_type='application/json', headers=headers)
+            else:
+                response = self.client.get(path, headers=headers)
+        return response.status_code, len(queries)
+
+    def close(self):
+        from django.db import connection
+
+        connection.close()
+
+
+class HTTPTransport:
+    """Keep-alive HTTP connection to a running server; queries are not visible."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+
+    def request(self, method, path, token, body=None):
+        headers = {'Authorization': f"Bearer {token}"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            return 0, None
+        return response.status, None
+
+    def close(self):
+        self.connection.close()
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def drive(args, tokens, payments, mix):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    # Each student in ``payments`` pays once.
+    payers = itertools.count()
+    payers_lock = threading.Lock()
+    samples = {name: [] for name in names}
+    samples_lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def worker(seed_value):
+        rng = random.Random(seed_value)
+        transport = HTTPTransport(args.url) if args.url else ClientTransport()
+        local = []
+        try:
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                method, path, role = ENDPOINTS[name]
+                body = None
+                if name == 'payment':
+                    with payers_lock:
+                        index = next(payers)
+                    if index >= len(payments):
+                        continue
+                    token, fee_type, amount = payments[index]
+                    body = {'phoneNumber': '0240000000', 'network': 'MTN', 'amount': amount, 'feeType': fee_type}
+                else:
+                    token = rng.choice(tokens[role])
+                started = time.perf_counter()
+                status_code, queries = transport.request(method, path, token, body)
+                local.append((name, time.perf_counter() - started, status_code, queries))
+        finally:
+            transport.close()
+            with samples_lock:
+                for name, elapsed, status_code, queries in local:
+                    samples[name].append((elapsed, status_code, queries))
+
+    threads = [threading.Thread(target=worker, args=(args.seed + i,)) for i in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def report(samples, elapsed):
+    endpoints = {}
+    for name, rows in samples.items():
+        statuses = {}
+        for _, status_code, _ in rows:
+            statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+        queries = [q for _, _, q in rows if q is not None]
+        endpoints[name] = {
+            "throughput_rps": round(len(rows) / elapsed, 2),
+            "latency_ms": summarize([elapsed_ for elapsed_, _, _ in rows]),
+            "status_codes": statuses,
+            "errors": sum(count for code, count in statuses.items() if not code.startswith('2')),
+            "queries_per_request": {
+                "mean": round(sum(queries) / len(queries), 2), "max": max(queries),
+            } if queries else None,
+        }
+    everything = [elapsed_ for rows in samples.values() for elapsed_, _, _ in rows]
+    return endpoints, {"throughput_rps": round(len(everything) / elapsed, 2), "latency_ms": summarize(everything)}
+
+
+def compare(result, path):
+    with open(path) as fh:
+        previous = json.load(fh)
+    changes = {}
+    for name, current in result['endpoints'].items():
+        before = previous.get('endpoints', {}).get(name)
+        if not before or not before['latency_ms'].get('requests'):
+            continue
+        changes[name] = {
+            metric: round(current['latency_ms'][metric] / before['latency_ms'][metric], 2)
+            for metric in ('p50', 'p95', 'p99') if current['latency_ms'].get(metric) and before['latency_ms'][metric]
+        }
+        if before['throughput_rps']:
+            changes[name]['throughput'] = round(current['throughput_rps'] / before['throughput_rps'], 2)
+    return {"against": path, "ratios": changes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50000, help="Students to seed.")
+    parser.add_argument("--admins", type=int, default=50, help="Admins to seed.")
+    parser.add_argument("--database", help="SQLite file to seed and use; defaults to a scratch file.")
+    parser.add_argument("--seed-only", action="store_true", help="Seed the database and exit.")
+    parser.add_argument("--url", help="Base URL of a running server; defaults to the in-process test client.")
+    parser.add_argument("--seconds", type=float, default=30, help="How long to drive traffic.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Endpoint weights, e.g. 'fee_stats=3,payment=1'.")
+    parser.add_argument("--gateway-latency", type=float, help="Stub gateway delay for in-process runs, in seconds.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the seeded data and the request mix.")
+    parser.add_argument("--output", help="Write the JSON result to this file as well.")
+    parser.add_argument("--compare", help="Earlier result file to compare against.")
+    args = parser.parse_args()
+
+    path = args.database or os.path.join(tempfile.mkdtemp(prefix="http-load-"), "load.sqlite3")
+    setup_django(path)
+    if args.gateway_latency is not None:
+        from django.conf import settings
+        settings.PAYMENT_GATEWAY['OPTIONS']['latency'] = args.gateway_latency
+
+    seed(args.students, args.admins, args.seed)
+    if args.seed_only:
+        print(f"Seeded {path}")
+        return
+
+    tokens, payments = load_users()
+    mix = parse_mix(args.mix)
+    samples, elapsed = drive(args, tokens, payments, mix)
+    if not args.url:
+        # Let in-process gateway charges finish before the interpreter exits.
+        from core import payments
+        if payments._executor is not None:
+            payments._executor.shutdown(wait=True)
+    endpoints, overall = report(samples, elapsed)
+
+    result = {
+        "target": args.url or "test-client",
+        "students": len(tokens['student']),
+        "admins": len(tokens['admin']),
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 2),
+        "mix": mix,
+        "overall": overall,
+        "endpoints": endpoints,
+    }
+    if args.compare:
+        result["comparison"] = compare(result, args.compare)
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
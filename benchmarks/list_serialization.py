@@ -0,0 +1,120 @@
+"""
+Serialization benchmark for the large list endpoints: the nested DRF
+serializers (StudentDetailSerializer, AdminDetailSerializer,
+PaymentHistorySerializer over model instances) against the
+core.projections.Projection read path over ``.values()`` rows.
+
+For each size in ``--rows`` it seeds that many students and admins with
+core.seeding into a scratch SQLite file, then builds each listing of
+``rows`` rows both ways (query included) and renders it to JSON, keeping
+the best of ``--repeat`` runs. The two outputs are checked to be
+byte-identical:
+
+    python -m benchmarks.list_serialization --rows 10000,100000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from benchmarks.common import emit
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mpas_backend.settings")
+    import django
+
+    django.setup()
+
+
+def listings(rows):
+    from authentication.models import User
+    from authentication.serializers import AdminDetailSerializer, StudentDetailSerializer
+    from core.models import PaymentHistory
+    from core.serilizers import PaymentHistorySerializer
+
+    # name -> (serializer, queryset for the serializer, queryset for the projection)
+    return {
+        'list_all_students': (
+            StudentDetailSerializer,
+            User.objects.filter(role='student').select_related('student_profile').order_by('id'),
+            User.objects.filter(role='student').order_by('id'),
+        ),
+        'list_all_admins': (
+            AdminDetailSerializer,
+            User.objects.filter(role='admin').select_related('admin_profile').order_by('id'),
+            User.objects.filter(role='admin').order_by('id'),
+        ),
+        'payment_history': (
+            PaymentHistorySerializer,
+            PaymentHistory.objects.select_related('student__student_profile').order_by('-date_paid', '-id')[:rows],
+            PaymentHistory.objects.order_by('-date_paid', '-id')[:rows],
+        ),
+    }
+
+
+def best_of(repeat, build):
+    from rest_framework.renderers import JSONRenderer
+
+    timings = {"build": [], "render": []}
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        data = build()
+        built = time.perf_counter()
+        body = JSONRenderer().render(data)
+        timings["build"].append(built - started)
+        timings["render"].append(time.perf_counter() - built)
+    result = {step: round(min(values), 4) for step, values in timings.items()}
+    result["rows"] = len(data)
+    return result, body
+
+
+def run_size(rows, args):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+
+    from core.projections import Projection
+    from core.seeding import seed_institution
+
+    # A fresh database per size.
+    connections.close_all()
+    settings.DATABASES['default']['NAME'] = os.path.join(tempfile.mkdtemp(prefix="list-bench-"), "db.sqlite3")
+    call_command('migrate', verbosity=0)
+    seed_institution(rows, admins=rows, seed=args.seed)
+
+    result = {}
+    for name, (serializer_class, queryset, projected) in listings(rows).items():
+        projection = Projection(serializer_class)
+        drf, drf_body = best_of(args.repeat, lambda: serializer_class(queryset.all(), many=True).data)
+        fast, fast_body = best_of(args.repeat, lambda: projection.data(projected.all()))
+        if drf_body != fast_body:
+            raise SystemExit(f"{name}: projection output differs from the serializer's")
+        result[name] = {
+            "serializer": drf,
+            "projection": fast,
+            "build_speedup": round(drf["build"] / fast["build"], 1),
+            "total_speedup": round((drf["build"] + drf["render"]) / (fast["build"] + fast["render"]), 1),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10000,100000", help="Comma-separated listing sizes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON result to this file as well.")
+    args = parser.parse_args()
+
+    setup_django()
+    result = {"repeat": args.repeat, "sizes": {}}
+    for rows in (int(value) for value in args.rows.split(',')):
+        result["sizes"][rows] = run_size(rows, args)
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Login storm benchmark for the async login view.
+
+Measures latency of an ordinary authenticated endpoint (the profile view)
+on its own, then again while a burst of logins hashes passwords, all
+through Django's ASGI handler on one event loop as under Daphne:
+
+    python -m benchmarks.login_storm --logins 200 --requests 400
+
+Uses a throwaway test database; the project database is not touched.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mpas_backend.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import AsyncClient  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from authentication import login  # noqa: E402
+from benchmarks.common import emit, summarize  # noqa: E402
+from authentication.models import User  # noqa: E402
+
+PASSWORD = "StormPass123"
+
+
+def seed(students):
+    # One hash for everyone: seeding should not itself be the bottleneck.
+    encoded = make_password(PASSWORD)
+    User.objects.bulk_create([
+        User(full_name=f"Storm Student {i}", student_id=f"STORM{i:05d}", role="student", password=encoded)
+        for i in range(students)
+    ])
+    reader = User.objects.create_user(full_name="Storm Reader", student_id="READER", password=PASSWORD, role="student")
+    return str(RefreshToken.for_user(reader).access_token)
+
+
+async def run_requests(count, concurrency, token):
+    client = AsyncClient()
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get("/api/users/profile/", headers={"Authorization": f"Bearer {token}"})
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.status_code
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+async def run_logins(count, concurrency, students):
+    client = AsyncClient()
+    latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/users/login/",
+                {"username": f"STORM{i % students:05d}", "password": PASSWORD, "role": "student"},
+                content_type="application/json",
+            )
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return latencies, statuses
+
+
+async def storm(args, token):
+    baseline = await run_requests(args.requests, args.concurrency, token)
+    login.metrics.reset()
+    (login_latencies, statuses), during = await asyncio.gather(
+        run_logins(args.logins, args.login_concurrency, args.students),
+        run_requests(args.requests, args.concurrency, token),
+    )
+    return baseline, during, login_latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200, help="Student accounts to log in as.")
+    parser.add_argument("--logins", type=int, default=200, help="Logins fired during the storm.")
+    parser.add_argument("--login-concurrency", type=int, default=100, help="Logins in flight at once.")
+    parser.add_argument("--requests", type=int, default=400, help="Profile requests per phase.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Profile requests in flight at once.")
+    parser.add_argument("--output", help="Write the JSON result to this file as well.")
+    args = parser.parse_args()
+
+    setup_test_environment()
+    # Every login comes from one address; measure the pool, not the throttle.
+    settings.AUTH_THROTTLES = {**settings.AUTH_THROTTLES, 'login': {}}
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        token = seed(args.students)
+        baseline, during, login_latencies, statuses = asyncio.run(storm(args, token))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    result = {
+        "hash_workers": login.hash_workers(),
+        "profile_latency_ms": {
+            "baseline": summarize(baseline),
+            "during_login_storm": summarize(during),
+        },
+        "login_latency_ms": summarize(login_latencies),
+        "login_statuses": statuses,
+        "hashing_pool": login.metrics.snapshot(),
+    }
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Reader/writer throughput on SQLite with the stock Django settings versus
+the tuned profile in settings.DATABASES (WAL, pragmas, IMMEDIATE
+transactions, and persistent connections when DB_CONN_MAX_AGE is set).
+
+Each profile gets a fresh database file. Writer processes create and
+complete payments through core.validation.create_payment, reader processes
+load fee summaries and transaction lists, all for a fixed duration.
+Connections are closed between operations the way request_finished does,
+so CONN_MAX_AGE takes effect:
+
+    python -m benchmarks.sqlite_profile --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import emit
+
+BASELINE = {'CONN_MAX_AGE': 0, 'OPTIONS': {}}
+
+
+def setup_django(profile, path):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mpas_backend.settings")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    default = settings.DATABASES['default']
+    default['NAME'] = path
+    if profile == 'baseline':
+        default.update(BASELINE)
+
+
+def prepare(profile, path, students):
+    setup_django(profile, path)
+    from decimal import Decimal
+
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+
+    from authentication.models import User
+    from core.models import FeeLedger, FeeStructure
+
+    call_command('migrate', verbosity=0)
+    users = User.objects.bulk_create([
+        User(full_name=f"Bench Student {i}", student_id=f"BENCH{i:06d}", role='student', password=make_password(None))
+        for i in range(students)
+    ], batch_size=1000)
+    fee_structures = FeeStructure.objects.bulk_create([
+        FeeStructure(
+            student=user,
+            academic_year='2025/2026',
+            tuition_fee=Decimal('1000.00'),
+            hostel_fee=Decimal('500.00'),
+            other_fee=Decimal('100.00'),
+            total_fee=Decimal('1600.00'),
+        )
+        for user in users
+    ], batch_size=1000)
+    # Readers should only read; a missing ledger would be built on first use.
+    FeeLedger.objects.bulk_create([FeeLedger(fee_structure=fs) for fs in fee_structures], batch_size=1000)
+
+
+def writer(profile, path, index, writers, students, start, deadline, results):
+    setup_django(profile, path)
+    from decimal import Decimal
+
+    from django.db import OperationalError, close_old_connections
+
+    from authentication.models import User
+    from core.validation import create_payment
+
+    time.sleep(max(0, start - time.time()))
+    done = errors = 0
+    # Each writer owns a disjoint slice of students so payments never
+    # conflict on validation, only on the database lock.
+    for student_index in range(index, students, writers):
+        if time.time() >= deadline:
+            break
+        try:
+            student = User.objects.get(student_id=f"BENCH{student_index:06d}")
+            transaction = create_payment(student, Decimal('1000.00'), 'tuition', 'mobile_money')
+            transaction.complete()
+            done += 1
+        except OperationalError:
+            errors += 1
+        finally:
+            close_old_connections()
+    results.put(('writer', done, errors))
+
+
+def reader(profile, path, students, start, deadline, results):
+    setup_django(profile, path)
+    from django.db import OperationalError, close_old_connections
+
+    from authentication.models import User
+    from core.queries import get_fee_summary
+
+    time.sleep(max(0, start - time.time()))
+    done = errors = 0
+    while time.time() < deadline:
+        try:
+            student = User.objects.get(student_id=f"BENCH{random.randrange(students):06d}")
+            get_fee_summary(student.fee_structures.select_related('ledger').last())
+            list(student.transactions.filter(status='completed').order_by('-transaction_date')[:20])
+            done += 1
+        except OperationalError:
+            errors += 1
+        finally:
+            close_old_connections()
+    results.put(('reader', done, errors))
+
+
+def run_profile(profile, args):
+    workdir = tempfile.mkdtemp(prefix=f"sqlite-{profile}-")
+    path = os.path.join(workdir, "bench.sqlite3")
+    proc = multiprocessing.Process(target=prepare, args=(profile, path, args.students))
+    proc.start()
+    proc.join()
+
+    results = multiprocessing.Queue()
+    # Start everyone together once Django is set up in each process.
+    start = time.time() + 5
+    deadline = start + args.seconds
+    procs = [
+        multiprocessing.Process(target=writer, args=(profile, path, i, args.writers, args.students, start, deadline, results))
+        for i in range(args.writers)
+    ] + [
+        multiprocessing.Process(target=reader, args=(profile, path, args.students, start, deadline, results))
+        for _ in range(args.readers)
+    ]
+    for proc in procs:
+        proc.start()
+    totals = {'writer': [0, 0], 'reader': [0, 0]}
+    for _ in procs:
+        kind, done, errors = results.get()
+        totals[kind][0] += done
+        totals[kind][1] += errors
+    for proc in procs:
+        proc.join()
+
+    return {
+        "payments_per_second": round(totals['writer'][0] / args.seconds, 1),
+        "payment_lock_errors": totals['writer'][1],
+        "reads_per_second": round(totals['reader'][0] / args.seconds, 1),
+        "read_lock_errors": totals['reader'][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4, help="Processes making payments.")
+    parser.add_argument("--readers", type=int, default=8, help="Processes reading fee summaries.")
+    parser.add_argument("--seconds", type=float, default=10, help="How long each profile runs.")
+    parser.add_argument("--students", type=int, default=20000, help="Seeded students; one payment each at most.")
+    parser.add_argument("--output", help="Write the JSON result to this file as well.")
+    args = parser.parse_args()
+
+    result = {
+        "writers": args.writers,
+        "readers": args.readers,
+        "seconds": args.seconds,
+        "baseline": run_profile('baseline', args),
+        "tuned": run_profile('tuned', args),
+    }
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from datetime import date
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def academic_year_start(today=None):
+    """First day of the academic year ``today`` falls in."""
+    today = today or timezone.localdate()
+    month = getattr(settings, 'ACADEMIC_YEAR_START_MONTH', 9)
+    return date(today.year if today.month >= month else today.year - 1, month, 1)
+
+
+def academic_year_label(start):
+    return f"{start.year}/{start.year + 1}"
+
+
+def current_academic_year(today=None):
+    """``FeeStructure.academic_year`` for the year ``today`` falls in, e.g. "2025/2026"."""
+    return academic_year_label(academic_year_start(today))
@@ -2,8 +2,36 @@ from django.contrib import admin
 from core.models import *
 # Register your models here.
 
-admin.site.register(PaymentHistory)
-admin.site.register(Transaction)
-admin.site.register(FeeStructure)
+
+@admin.register(PaymentHistory)
+class PaymentHistoryAdmin(admin.ModelAdmin):
+    list_select_related = ('transaction', 'student')
+    raw_id_fields = ('transaction', 'student')
+
+
+@admin.register(Transaction)
+class TransactionAdmin(admin.ModelAdmin):
+    list_select_related = ('student',)
+    raw_id_fields = ('student', 'fee_structure')
+
+
+@admin.register(FeeStructure)
+class FeeStructureAdmin(admin.ModelAdmin):
+    list_select_related = ('student',)
+    raw_id_fields = ('student',)
+
+
 admin.site.register(ProgramFee)
 
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('key', 'user', 'status_code', 'created_at')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(FeeLedger)
+class FeeLedgerAdmin(admin.ModelAdmin):
+    list_select_related = ('fee_structure__student',)
+    raw_id_fields = ('fee_structure',)
@@ -0,0 +1,230 @@
+import pickle
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from core.sqlite_files import shared_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires);
+"""
+
+# Keys for get_many/delete_many per statement, under SQLite's variable limit.
+CHUNK_SIZE = 500
+
+# When each cache file is next culled, shared by every cache instance on it.
+_next_cull = {}
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache shared by every worker process on one host through a SQLite file
+    in WAL mode, so a value set by one Daphne worker (a password reset
+    token, a throttle bucket) is seen by the others, without Redis or
+    memcached.
+
+    Integers are stored as SQLite integers, which makes ``incr`` a single
+    atomic UPDATE; everything else is pickled, so the file must only be
+    writable by the user running the application. Expired entries are
+    ignored on read and deleted, along with the oldest entries once there
+    are more than MAX_ENTRIES, at most every CULL_INTERVAL seconds.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = str(location or 'cache.sqlite3')
+        self.cull_interval = float(options.get('CULL_INTERVAL', 5))
+        self._file = shared_file(self.path, SCHEMA)
+
+    # Encoding
+
+    @staticmethod
+    def _encode(value):
+        if type(value) is int and -2**63 <= value < 2**63:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(stored):
+        return stored if isinstance(stored, int) else pickle.loads(stored)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._file.connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return default if row is None else self._decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._file.write() as conn:
+            conn.execute(
+                "INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                (key, self._encode(value), self.get_backend_timeout(timeout)),
+            )
+        self._maybe_cull()
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._file.write() as conn:
+            # Takes the place of an expired entry, never of a live one.
+            added = conn.execute(
+                "INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires "
+                "WHERE cache_entries.expires IS NOT NULL AND cache_entries.expires <= ?",
+                (key, self._encode(value), self.get_backend_timeout(timeout), time.time()),
+            ).rowcount
+        self._maybe_cull()
+        return bool(added)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._file.write() as conn:
+            return bool(conn.execute(
+                "UPDATE cache_entries SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (self.get_backend_timeout(timeout), key, time.time()),
+            ).rowcount)
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        with self._file.write() as conn:
+            row = conn.execute(
+                "UPDATE cache_entries SET value = value + ? "
+                "WHERE key = ? AND typeof(value) = 'integer' AND (expires IS NULL OR expires > ?) "
+                "RETURNING value",
+                (delta, key, now),
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            # Missing, or a pickled number; the write lock keeps this atomic too.
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            value = self._decode(row[0]) + delta
+            conn.execute("UPDATE cache_entries SET value = ? WHERE key = ?", (self._encode(value), key))
+            return value
+
+    def update(self, key, func, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Replace the value under ``key`` with ``func(current)`` (current is
+        None when missing or expired) in one write transaction, so no other
+        process can change it in between. ``func`` returns
+        ``(new_value, result)``; ``result`` is returned.
+        """
+        key = self.make_and_validate_key(key, version=version)
+        with self._file.write() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+            value, result = func(None if row is None else self._decode(row[0]))
+            conn.execute(
+                "INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                (key, self._encode(value), self.get_backend_timeout(timeout)),
+            )
+        self._maybe_cull()
+        return result
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._file.write() as conn:
+            return bool(conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._file.connection() as conn:
+            return conn.execute(
+                "SELECT 1 FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone() is not None
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        stored = list(key_map)
+        found = {}
+        now = time.time()
+        with self._file.connection() as conn:
+            for start in range(0, len(stored), CHUNK_SIZE):
+                chunk = stored[start:start + CHUNK_SIZE]
+                rows = conn.execute(
+                    "SELECT key, value FROM cache_entries WHERE key IN (%s) AND (expires IS NULL OR expires > ?)"
+                    % ', '.join('?' * len(chunk)),
+                    (*chunk, now),
+                )
+                for key, value in rows:
+                    found[key_map[key]] = self._decode(value)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._encode(value), expires)
+            for key, value in data.items()
+        ]
+        with self._file.write() as conn:
+            conn.executemany(
+                "INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                rows,
+            )
+        self._maybe_cull()
+        return []
+
+    def delete_many(self, keys, version=None):
+        stored = [self.make_and_validate_key(key, version=version) for key in keys]
+        with self._file.write() as conn:
+            for start in range(0, len(stored), CHUNK_SIZE):
+                chunk = stored[start:start + CHUNK_SIZE]
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE key IN (%s)" % ', '.join('?' * len(chunk)), chunk,
+                )
+
+    def clear(self):
+        with self._file.write() as conn:
+            conn.execute("DELETE FROM cache_entries")
+
+    def close(self, **kwargs):
+        # Connections stay pooled between requests.
+        pass
+
+    # Eviction
+
+    def _maybe_cull(self):
+        now = time.time()
+        if now < _next_cull.get(self.path, 0.0):
+            return
+        _next_cull[self.path] = now + self.cull_interval
+        with self._file.write() as conn:
+            self._cull(conn, now)
+
+    def _cull(self, conn, now):
+        """Drop expired entries, then 1/CULL_FREQUENCY of the rest (soonest to expire first) if over MAX_ENTRIES."""
+        conn.execute("DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        count = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        if count <= self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            conn.execute("DELETE FROM cache_entries")
+            return
+        # NULLs (no expiry) sort first in SQLite, so list them last.
+        conn.execute(
+            "DELETE FROM cache_entries WHERE key IN ("
+            "SELECT key FROM cache_entries ORDER BY expires IS NULL, expires LIMIT ?)",
+            (count // self._cull_frequency,),
+        )
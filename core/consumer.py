@@ -1,29 +1,32 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
 import json
 
+from core.notifications import notification_groups
+
+
 class MyConsumer(AsyncWebsocketConsumer):
 
     async def connect(self):
-        self.room_name = self.scope['url_route']['kwargs']['room_name']
-        self.room_group_name=f'chat__{self.room_name}'
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
 
-        await self.channel_layer.group_add(
-            self.room_group_name,
-            self.channel_name
-        )
+        # Each connection only hears about its own user and role.
+        self.notification_groups = notification_groups(user)
+        for group in self.notification_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
 
         await self.accept()
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.room_group_name,
-            self.channel_name
-        )
+        for group in getattr(self, 'notification_groups', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
 
     async def receive(self, text_data):
         data = json.loads(text_data)
         await self.send(text_data=json.dumps({"echo": data.get("message", "")}))
 
     async def send_message(self,event):
-        message=event["message"]
-        await self.send(text_data=json.dumps({"message": message}))
\ No newline at end of file
+        payload = {key: value for key, value in event.items() if key != "type"}
+        await self.send(text_data=json.dumps(payload))
@@ -0,0 +1,162 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from django.utils.timezone import make_aware
+from rest_framework.exceptions import ValidationError
+
+from core.models import Transaction
+
+EXPORT_CHUNK_SIZE = 2000
+
+# (output column, queryset lookup)
+TRANSACTION_COLUMNS = [
+    ('id', 'id'),
+    ('reference', 'reference'),
+    ('student_name', 'student__full_name'),
+    ('student_id', 'student__student_id'),
+    ('payment_type', 'payment_type'),
+    ('payment_method', 'payment_method'),
+    ('amount', 'amount'),
+    ('status', 'status'),
+    ('date', 'transaction_date'),
+]
+
+HISTORY_COLUMNS = [
+    ('id', 'id'),
+    ('transaction', 'transaction_id'),
+    ('student_name', 'student__full_name'),
+    ('student_id', 'student__student_id'),
+    ('amount', 'amount'),
+    ('date_paid', 'date_paid'),
+]
+
+
+class _Echo:
+    """Pseudo-buffer that hands each CSV line straight back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_keyset_chunks(queryset, date_field, lookups, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of ``values_list`` rows in ``(date_field, id)`` order, one
+    bounded query per chunk, each fetched only when the client has taken
+    the previous one. Unlike ``.iterator()`` no cursor stays open between
+    chunks, so a long export never holds a read transaction.
+    """
+    date_index = lookups.index(date_field)
+    id_index = lookups.index('id')
+    queryset = queryset.order_by(date_field, 'id').values_list(*lookups)
+
+    last = None
+    while True:
+        chunk = queryset
+        if last is not None:
+            chunk = chunk.filter(
+                Q(**{f'{date_field}__gt': last[date_index]}) | Q(**{date_field: last[date_index], 'id__gt': last[id_index]})
+            )
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1]
+
+
+def filter_export_queryset(request, queryset, date_field, allow_status=False):
+    params = request.query_params
+    errors = {}
+
+    for param, lookup in (('start', 'gte'), ('end', 'lt')):
+        raw = params.get(param)
+        if not raw:
+            continue
+        day = parse_date(raw)
+        if day is None:
+            errors[param] = ["Use the YYYY-MM-DD date format."]
+            continue
+        if param == 'end':
+            # The end date is inclusive.
+            day += timedelta(days=1)
+        queryset = queryset.filter(**{f'{date_field}__{lookup}': make_aware(datetime.combine(day, time.min))})
+
+    status_value = params.get('status')
+    if allow_status and status_value:
+        valid_statuses = [choice[0] for choice in Transaction.STATUS_CHOICES]
+        if status_value not in valid_statuses:
+            errors['status'] = [f"Status must be one of: {', '.join(valid_statuses)}."]
+        queryset = queryset.filter(status=status_value)
+
+    if errors:
+        raise ValidationError(errors)
+    return queryset
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _csv_lines(columns, chunks):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in columns])
+    for rows in chunks:
+        yield ''.join(writer.writerow([_format_value(value) for value in row]) for row in rows)
+
+
+def _ndjson_lines(columns, chunks):
+    names = [name for name, _ in columns]
+    for rows in chunks:
+        yield ''.join(
+            json.dumps(dict(zip(names, (_format_value(value) for value in row)))) + '\n' for row in rows
+        )
+
+
+async def _step_in_thread(parts):
+    """
+    ``parts`` as an async iterator advanced one part at a time on the sync
+    thread. Django would otherwise consume a sync body whole before sending
+    any of it under ASGI.
+    """
+    done = object()
+    step = sync_to_async(next)
+    while True:
+        part = await step(parts, done)
+        if part is done:
+            return
+        yield part
+
+
+def stream_export(request, queryset, columns, date_field, filename):
+    """
+    Stream ``queryset`` as CSV or NDJSON, one part per chunk, so memory stays
+    bounded by the chunk size. The body is a sync generator; under ASGI it is
+    stepped through ``sync_to_async`` so each chunk is still sent as soon as
+    it is read.
+    """
+    lookups = [lookup for _, lookup in columns]
+    rows = iter_keyset_chunks(queryset, date_field, lookups, chunk_size=EXPORT_CHUNK_SIZE)
+
+    renderer = request.accepted_renderer
+    if renderer.format == 'csv':
+        body = _csv_lines(columns, rows)
+    else:
+        body = _ndjson_lines(columns, rows)
+    if isinstance(request._request, ASGIRequest):
+        body = _step_in_thread(body)
+
+    response = StreamingHttpResponse(body, content_type=f"{renderer.media_type}; charset=utf-8")
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{renderer.format}"'
+    return response
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction as db_transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def get_idempotency_settings():
+    return {
+        'TTL_SECONDS': 86400,
+        'WAIT_SECONDS': 10,
+        'POLL_INTERVAL': 0.05,
+        'STALE_SECONDS': 60,
+        **getattr(settings, 'IDEMPOTENCY', {}),
+    }
+
+
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.method}:{request.path}:{body}".encode()).hexdigest()
+
+
+def _claim(user, key, fingerprint, config):
+    """
+    Try to become the request that does the work for ``key``. Returns
+    ``(record, claimed)``; ``record`` is None when an expired or abandoned
+    key was just cleared and the claim should be retried.
+    """
+    now = timezone.now()
+    try:
+        with db_transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, fingerprint=fingerprint, locked_at=now), True
+    except IntegrityError:
+        pass
+
+    record = IdempotencyKey.objects.filter(user=user, key=key).first()
+    if record is None:
+        return None, False
+
+    if record.created_at < now - timedelta(seconds=config['TTL_SECONDS']):
+        IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).delete()
+        return None, False
+
+    if (
+        record.status_code is None
+        and record.fingerprint == fingerprint
+        and record.locked_at < now - timedelta(seconds=config['STALE_SECONDS'])
+    ):
+        # The first request died without finishing; take the work over.
+        taken = IdempotencyKey.objects.filter(
+            pk=record.pk, status_code__isnull=True, locked_at=record.locked_at,
+        ).update(locked_at=now)
+        if taken:
+            record.locked_at = now
+            return record, True
+    return record, False
+
+
+def _run(view, record, request, args, kwargs):
+    try:
+        response = view(request, *args, **kwargs)
+    except BaseException:
+        record.delete()
+        raise
+    if response.status_code >= 500:
+        # Nothing useful to replay; let the client retry with the same key.
+        record.delete()
+        return response
+    record.status_code = response.status_code
+    record.response_body = response.data
+    record.save(update_fields=['status_code', 'response_body'])
+    return response
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view):
+    """
+    Honour an ``Idempotency-Key`` header on a DRF function view. The first
+    request with a key runs the view and stores its response; retries with
+    the same key and body get that response back without running the view.
+    A retry that arrives while the first is still running waits up to
+    WAIT_SECONDS for it to finish, then gets a 409. Keys are scoped to the
+    authenticated user, so place this below ``permission_classes``.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f"{HEADER} must be at most {MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        config = get_idempotency_settings()
+        fingerprint = request_fingerprint(request)
+        deadline = time.monotonic() + config['WAIT_SECONDS']
+        while True:
+            record, claimed = _claim(request.user, key, fingerprint, config)
+            if claimed:
+                return _run(view, record, request, args, kwargs)
+            if record is not None:
+                if record.fingerprint != fingerprint:
+                    return Response(
+                        {'error': f"{HEADER} has already been used for a different request."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                if record.status_code is not None:
+                    return _replay(record)
+            if time.monotonic() >= deadline:
+                response = Response(
+                    {'error': f"A request with this {HEADER} is still being processed."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+                response['Retry-After'] = '1'
+                return response
+            time.sleep(config['POLL_INTERVAL'])
+
+    return wrapper
+
+
+def purge_expired(now=None):
+    cutoff = (now or timezone.now()) - timedelta(seconds=get_idempotency_settings()['TTL_SECONDS'])
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,285 @@
+import asyncio
+import collections
+import logging
+import pickle
+import random
+import string
+import time
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+from core.sqlite_files import SQLiteFile
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_messages_channel_id ON channel_messages (channel, id);
+CREATE INDEX IF NOT EXISTS channel_messages_expires ON channel_messages (expires);
+CREATE TABLE IF NOT EXISTS channel_groups (
+    grp TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    joined REAL NOT NULL,
+    PRIMARY KEY (grp, channel)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS channel_groups_channel ON channel_groups (channel);
+"""
+
+# Channels per IN (...) when polling, under SQLite's variable limit.
+POLL_CHUNK = 500
+
+
+class _LocalReceivers:
+    """
+    The channels being received on in one event loop, each with a buffer
+    that a single poller task fills for all of them.
+    """
+
+    def __init__(self):
+        self.buffers = {}
+        self.waiting = collections.Counter()
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def idle(self):
+        return not self.waiting and not any(buffer.qsize() for buffer in self.buffers.values())
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    Channel layer shared by every process on one host through a SQLite file
+    in WAL mode, so several Daphne workers can fan out group messages to
+    each other's WebSocket clients without Redis.
+
+    Messages are pickled, so the database file must only be writable by the
+    user running the application. One poller task per process reads the
+    messages for every channel being received on and hands them out through
+    in-memory buffers, backing off from ``poll_interval`` up to
+    ``max_poll_interval`` while they are all idle; idle clients add no
+    queries of their own.
+    """
+
+    extensions = ["groups", "flush"]
+
+    def __init__(
+        self,
+        path='channels.sqlite3',
+        expiry=60,
+        group_expiry=86400,
+        capacity=100,
+        channel_capacity=None,
+        poll_interval=0.01,
+        max_poll_interval=0.25,
+        cleanup_interval=5,
+        **kwargs,
+    ):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity, **kwargs)
+        self.channel_capacity = self.compile_capacities(self.channel_capacity)
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.cleanup_interval = cleanup_interval
+        self._file = SQLiteFile(self.path, SCHEMA)
+        self._last_cleanup = 0.0
+        # Per event loop, since buffers and the poller belong to one.
+        self._receivers = {}
+
+    # Connection handling
+
+    def _write(self, callback, *args):
+        with self._file.write() as conn:
+            return callback(conn, *args)
+
+    async def _run(self, callback, *args):
+        return await asyncio.to_thread(self._write, callback, *args)
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), "message is not a dict"
+        self.require_valid_channel_name(channel)
+        assert "__asgi_channel__" not in message
+        if not await self._run(self._send, [channel], pickle.dumps(message), time.time()):
+            raise ChannelFull(channel)
+
+    def _send(self, conn, channels, payload, now):
+        """Insert ``payload`` for every channel with room left; return how many got it."""
+        delivered = 0
+        for channel in channels:
+            queued = conn.execute(
+                "SELECT COUNT(*) FROM channel_messages WHERE channel = ? AND expires > ?",
+                (channel, now),
+            ).fetchone()[0]
+            if queued >= self.get_capacity(channel):
+                continue
+            conn.execute(
+                "INSERT INTO channel_messages (channel, expires, payload) VALUES (?, ?, ?)",
+                (channel, now + self.expiry, payload),
+            )
+            delivered += 1
+        return delivered
+
+    async def receive(self, channel):
+        self.require_valid_channel_name(channel)
+        loop = asyncio.get_running_loop()
+        local = self._receivers.setdefault(loop, _LocalReceivers())
+        buffer = local.buffers.setdefault(channel, asyncio.Queue())
+        local.waiting[channel] += 1
+        if local.task is None or local.task.done():
+            local.task = loop.create_task(self._poll(loop, local))
+        # A new channel is looked up straight away rather than after the backoff.
+        local.wakeup.set()
+        try:
+            return await buffer.get()
+        finally:
+            local.waiting[channel] -= 1
+            if not local.waiting[channel]:
+                del local.waiting[channel]
+                if buffer.empty():
+                    local.buffers.pop(channel, None)
+
+    async def _poll(self, loop, local):
+        delay = self.poll_interval
+        try:
+            while local.waiting:
+                local.wakeup.clear()
+                try:
+                    await self._maybe_clean_expired()
+                    messages = await asyncio.to_thread(self._receive_many, list(local.waiting), time.time())
+                except Exception:
+                    # Every receiver in this loop depends on the poller, so a
+                    # failed query (e.g. a locked database) is retried after
+                    # the backoff rather than ending it.
+                    logger.exception("Channel layer poll failed; retrying in %.2fs", delay)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_poll_interval)
+                    continue
+                for channel, payload in messages:
+                    local.buffers.setdefault(channel, asyncio.Queue()).put_nowait(pickle.loads(payload))
+                if messages:
+                    delay = self.poll_interval
+                    continue
+                try:
+                    await asyncio.wait_for(local.wakeup.wait(), delay)
+                    delay = self.poll_interval
+                except asyncio.TimeoutError:
+                    delay = min(delay * 2, self.max_poll_interval)
+        finally:
+            # Buffered messages wait for their channel's next receive().
+            if self._receivers.get(loop) is local and local.idle():
+                del self._receivers[loop]
+
+    def _receive_many(self, channels, now):
+        """Pop every live message for ``channels``, in order, as ``(channel, payload)``."""
+        # Idle polls only read, so they never queue behind writers for the
+        # write lock; the lock is taken once there is something to pop.
+        ids = []
+        with self._file.connection() as conn:
+            for start in range(0, len(channels), POLL_CHUNK):
+                chunk = channels[start:start + POLL_CHUNK]
+                ids += [row[0] for row in conn.execute(
+                    "SELECT id FROM channel_messages WHERE channel IN (%s) AND expires > ?"
+                    % ', '.join('?' * len(chunk)),
+                    (*chunk, now),
+                )]
+        if not ids:
+            return []
+        return self._write(self._pop_many, ids, now)
+
+    def _pop_many(self, conn, ids, now):
+        # Another process may have popped some of them since they were read.
+        popped = []
+        for start in range(0, len(ids), POLL_CHUNK):
+            chunk = ids[start:start + POLL_CHUNK]
+            popped += conn.execute(
+                "DELETE FROM channel_messages WHERE id IN (%s) AND expires > ? RETURNING id, channel, payload"
+                % ', '.join('?' * len(chunk)),
+                (*chunk, now),
+            ).fetchall()
+        popped.sort()
+        return [(channel, payload) for _, channel, payload in popped]
+
+    async def new_channel(self, prefix="specific."):
+        return "%s.sqlite!%s" % (
+            prefix,
+            "".join(random.choice(string.ascii_letters) for i in range(12)),
+        )
+
+    # Expire cleanup
+
+    async def _maybe_clean_expired(self):
+        now = time.time()
+        if now - self._last_cleanup < self.cleanup_interval:
+            return
+        self._last_cleanup = now
+        await self._run(self._clean_expired, now)
+
+    def _clean_expired(self, conn, now):
+        """
+        Drop expired messages and memberships. A channel that let a message
+        expire has stopped reading, so it leaves all of its groups too.
+        """
+        conn.execute(
+            "DELETE FROM channel_groups WHERE channel IN "
+            "(SELECT DISTINCT channel FROM channel_messages WHERE expires <= ?)",
+            (now,),
+        )
+        conn.execute("DELETE FROM channel_messages WHERE expires <= ?", (now,))
+        conn.execute("DELETE FROM channel_groups WHERE joined < ?", (now - self.group_expiry,))
+
+    # Flush extension
+
+    async def flush(self):
+        await self._run(self._flush)
+
+    def _flush(self, conn):
+        conn.execute("DELETE FROM channel_messages")
+        conn.execute("DELETE FROM channel_groups")
+
+    async def close(self):
+        self._file.close()
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        await self._run(self._group_add, group, channel, time.time())
+
+    def _group_add(self, conn, group, channel, now):
+        conn.execute(
+            "INSERT INTO channel_groups (grp, channel, joined) VALUES (?, ?, ?) "
+            "ON CONFLICT (grp, channel) DO UPDATE SET joined = excluded.joined",
+            (group, channel, now),
+        )
+
+    async def group_discard(self, group, channel):
+        self.require_valid_channel_name(channel)
+        self.require_valid_group_name(group)
+        await self._run(self._group_discard, group, channel)
+
+    def _group_discard(self, conn, group, channel):
+        conn.execute("DELETE FROM channel_groups WHERE grp = ? AND channel = ?", (group, channel))
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        self.require_valid_group_name(group)
+        await self._maybe_clean_expired()
+        # Full channels are skipped, as with the in-memory layer.
+        await self._run(self._group_send, group, pickle.dumps(message), time.time())
+
+    def _group_send(self, conn, group, payload, now):
+        channels = [
+            row[0] for row in conn.execute(
+                "SELECT channel FROM channel_groups WHERE grp = ? AND joined >= ?",
+                (group, now - self.group_expiry),
+            )
+        ]
+        return self._send(conn, channels, payload, now)
@@ -0,0 +1,27 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import connection
+
+_payment_write_lock = threading.RLock()
+
+
+@contextmanager
+def payment_write():
+    """
+    Queue payment writes on a Python lock before they open a transaction.
+    The RLock only serializes threads within this process; writes from
+    other workers are kept apart by the IMMEDIATE transactions themselves
+    (and busy_timeout), which this lock does not replace. SQLite allows one
+    writer at a time, and threads waiting here are cheaper and fairer than
+    threads spinning in the busy handler.
+
+    Inside an atomic block the write lock is already held (transactions
+    start IMMEDIATE), and waiting here could deadlock with a thread that
+    holds this lock and is waiting for the database, so it is skipped.
+    """
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        yield
+        return
+    with _payment_write_lock:
+        yield
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.payments import expire_stale_payments
+
+
+class Command(BaseCommand):
+    help = "Fail payments still pending PAYMENT_GATEWAY['TIMEOUT'] seconds after they were made."
+
+    def handle(self, *args, **options):
+        expired = expire_stale_payments()
+        self.stdout.write(self.style.SUCCESS(f"Failed {expired} stale pending payments."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.models import Transaction
+from core.processes import django_process_pool
+from core.receipts import render_receipt_by_id
+
+
+class Command(BaseCommand):
+    help = "Render receipts for completed transactions ahead of demand, across a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help="Worker processes (defaults to the CPU count).")
+        parser.add_argument('--since', help="Only transactions on or after this date (YYYY-MM-DD).")
+        parser.add_argument('--chunk-size', type=int, default=50, help="Transaction ids handed to a worker at a time.")
+
+    def handle(self, *args, **options):
+        transactions = Transaction.objects.filter(status='completed').order_by('id')
+        if options['since']:
+            try:
+                since = parse_date(options['since'])
+            except ValueError:
+                since = None
+            if since is None:
+                raise CommandError(f"--since must be a date as YYYY-MM-DD, not {options['since']!r}.")
+            transactions = transactions.filter(transaction_date__date__gte=since)
+        ids = list(transactions.values_list('id', flat=True))
+
+        if not ids:
+            self.stdout.write("No completed transactions to render.")
+            return
+
+        rendered = 0
+        with django_process_pool(options['workers']) as pool:
+            for _ in pool.map(render_receipt_by_id, ids, chunksize=options['chunk_size']):
+                rendered += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{rendered} receipts ready."))
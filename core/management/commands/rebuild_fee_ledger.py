@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import FeeLedger, FeeStructure
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-student fee ledger from completed transactions, or verify it with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help="Compare stored ledger rows against transactions without writing anything.",
+        )
+        parser.add_argument(
+            '--student-id',
+            help="Only process fee structures belonging to this student ID.",
+        )
+
+    def handle(self, *args, **options):
+        fee_structures = FeeStructure.objects.select_related('student', 'ledger').order_by('pk')
+        if options['student_id']:
+            fee_structures = fee_structures.filter(student__student_id=options['student_id'])
+
+        checked = 0
+        mismatches = 0
+        for fee_structure in fee_structures.iterator(chunk_size=500):
+            checked += 1
+            expected = FeeLedger.compute(fee_structure)
+
+            if options['verify']:
+                ledger = getattr(fee_structure, 'ledger', None)
+                stored = {field: getattr(ledger, field) for field in expected} if ledger else None
+                if stored != expected:
+                    mismatches += 1
+                    self.stdout.write(self.style.WARNING(
+                        f"Mismatch for {fee_structure}: stored={stored} expected={expected}"
+                    ))
+                continue
+
+            with transaction.atomic():
+                FeeLedger.objects.update_or_create(fee_structure=fee_structure, defaults=expected)
+
+        if options['verify']:
+            if mismatches:
+                raise CommandError(f"{mismatches} of {checked} ledger rows are out of date.")
+            self.stdout.write(self.style.SUCCESS(f"All {checked} ledger rows match their transactions."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {checked} ledger rows."))
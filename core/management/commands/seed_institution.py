@@ -0,0 +1,69 @@
+import time
+from datetime import datetime, time as day_time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from authentication.models import User
+from core.seeding import LEVELS, PROGRAMS, seed_institution
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic institution: program fees, students with profiles, fee structures "
+        "and a year of payments, and admins. The same --seed always produces the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000, help="Students to create.")
+        parser.add_argument('--admins', type=int, default=10, help="Admins to create.")
+        parser.add_argument('--programs', type=int, default=6, help=f"Programs (at most {len(PROGRAMS)}).")
+        parser.add_argument('--levels', type=int, default=4, help=f"Levels per program (at most {len(LEVELS)}).")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed.")
+        parser.add_argument('--prefix', default="SEED", help="Student ID prefix; must not be in use yet.")
+        parser.add_argument('--password', default="Password123!", help="Password shared by every generated user.")
+        parser.add_argument('--failed-rate', type=float, default=0.3, help="Chance of a failed attempt before each payment.")
+        parser.add_argument('--as-of', help="Generate payments up to this date (YYYY-MM-DD) instead of now, for repeatable data.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Students written per transaction.")
+
+    def handle(self, *args, **options):
+        if not 0 < options['programs'] <= len(PROGRAMS) or not 0 < options['levels'] <= len(LEVELS):
+            raise CommandError(f"Use 1-{len(PROGRAMS)} programs and 1-{len(LEVELS)} levels.")
+        if User.objects.filter(student_id__startswith=options['prefix']).exists():
+            raise CommandError(f"Students with the prefix {options['prefix']!r} already exist; pick another --prefix.")
+
+        now = None
+        if options['as_of']:
+            day = parse_date(options['as_of'])
+            if day is None:
+                raise CommandError("--as-of must be a date in YYYY-MM-DD format.")
+            now = timezone.make_aware(datetime.combine(day, day_time(17)))
+
+        started = time.perf_counter()
+
+        def progress(counts):
+            self.stdout.write(
+                f"{counts['students']} students, {counts['transactions']} transactions "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+
+        counts = seed_institution(
+            options['students'],
+            admins=options['admins'],
+            programs=options['programs'],
+            levels=options['levels'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            password=options['password'],
+            failed_rate=options['failed_rate'],
+            batch_size=options['batch_size'],
+            now=now,
+            progress=progress,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['students']} students, {counts['admins']} admins, "
+            f"{counts['transactions']} transactions and {counts['payment_histories']} payment histories "
+            f"in {time.perf_counter() - started:.1f}s."
+        ))
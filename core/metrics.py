@@ -0,0 +1,232 @@
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils import timezone
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Label sets per histogram; anything past this is folded into "other".
+MAX_SERIES = 500
+
+PROFILE_MODES = ('cprofile', 'sql')
+
+
+def get_metrics_settings():
+    return {
+        'TOKEN': '',
+        'PROFILING': False,
+        'PROFILE_HEADER': 'X-Profile',
+        'PROFILE_DIR': 'profiles',
+        **getattr(settings, 'METRICS', {}),
+    }
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Prometheus histogram kept in process: fixed bucket counts and a sum per
+    label set, so memory is bounded by the buckets and MAX_SERIES rather
+    than by traffic.
+    """
+
+    def __init__(self, name, documentation, labels=(), buckets=TIME_BUCKETS, max_series=MAX_SERIES):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                if len(self._series) >= self.max_series:
+                    label_values = ('other',) * len(self.labels)
+                series = self._series.setdefault(label_values, [[0] * (len(self.buckets) + 1), 0])
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self):
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label_values, counts, total in series:
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            prefix = f"{labels}," if labels else ''
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ''
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+request_duration = Histogram(
+    'mpas_request_duration_seconds', 'Wall time per request.', ('view', 'method', 'status'),
+)
+request_queries = Histogram(
+    'mpas_request_queries', 'SQL queries per request.', ('view',), buckets=QUERY_BUCKETS,
+)
+request_sql_duration = Histogram(
+    'mpas_request_sql_seconds', 'Time spent in SQL per request.', ('view',),
+)
+request_external_duration = Histogram(
+    'mpas_request_external_seconds', 'Time spent in external calls per request.', ('view', 'service'),
+)
+external_call_duration = Histogram(
+    'mpas_external_call_seconds', 'Duration of each external call, in or out of a request.', ('service',),
+)
+
+HISTOGRAMS = [request_duration, request_queries, request_sql_duration, request_external_duration, external_call_duration]
+
+_gauges = []
+
+
+def register_gauges(prefix, snapshot, documentation):
+    """Export every numeric value of ``snapshot()`` as the gauge ``<prefix>_<key>``."""
+    _gauges.append((prefix, snapshot, documentation))
+
+
+class RequestStats:
+    """What the current request has spent on SQL and external calls so far."""
+
+    def __init__(self, trace_sql=False):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.external = {}
+        self.sql_trace = [] if trace_sql else None
+
+
+_current = ContextVar('request_stats', default=None)
+
+
+def begin_request(trace_sql=False):
+    stats = RequestStats(trace_sql)
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection; a no-op outside requests."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.sql_time += elapsed
+        if stats.sql_trace is not None:
+            stats.sql_trace.append((elapsed, sql, params))
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """connection_created receiver."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed(service):
+    """Time a call to ``service`` (smtp, channel_layer, gateway)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        external_call_duration.observe(elapsed, service)
+        stats = _current.get()
+        if stats is not None:
+            stats.external[service] = stats.external.get(service, 0.0) + elapsed
+
+
+def observe_request(view, method, status_code, elapsed, stats):
+    request_duration.observe(elapsed, view, method, f"{status_code // 100}xx")
+    request_queries.observe(stats.queries, view)
+    request_sql_duration.observe(stats.sql_time, view)
+    for service, spent in stats.external.items():
+        request_external_duration.observe(spent, view, service)
+
+
+def render():
+    """Everything recorded so far in the Prometheus text format."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.collect())
+    for prefix, snapshot, documentation in _gauges:
+        for key, value in snapshot().items():
+            if isinstance(value, (int, float)):
+                lines.append(f"# HELP {prefix}_{key} {documentation}")
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    for histogram in HISTOGRAMS:
+        histogram.reset()
+
+
+# Opt-in per-request reports
+
+def _report_path(view, extension):
+    directory = get_metrics_settings()['PROFILE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+    name = ''.join(c if c.isalnum() else '-' for c in view)
+    return os.path.join(directory, f"{stamp}-{name}.{extension}")
+
+
+def write_profile(view, profilers):
+    """
+    Dump the request's cProfile stats (one profiler per thread it ran on)
+    in pstats format, readable with ``python -m pstats`` or snakeviz.
+    """
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    path = _report_path(view, 'prof')
+    stats.dump_stats(path)
+    return path
+
+
+def write_sql_trace(view, stats):
+    """Every query the request ran, slowest first, with repeated statements counted."""
+    path = _report_path(view, 'sql.txt')
+    repeated = Counter(sql for _, sql, _ in stats.sql_trace)
+    with open(path, 'w') as fh:
+        fh.write(f"-- {view}: {stats.queries} queries, {stats.sql_time * 1000:.2f} ms\n")
+        for sql, count in repeated.most_common():
+            if count > 1:
+                fh.write(f"-- repeated {count}x: {sql}\n")
+        for elapsed, sql, params in sorted(stats.sql_trace, key=lambda row: row[0], reverse=True):
+            fh.write(f"\n-- {elapsed * 1000:.3f} ms params={params!r}\n{sql};\n")
+    return path
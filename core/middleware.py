@@ -0,0 +1,179 @@
+import cProfile
+import logging
+import os
+import time
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework.exceptions import AuthenticationFailed
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from authentication.jwt import CachedJWTAuthentication
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def get_raw_token(scope):
+    """
+    Browsers cannot set headers on a WebSocket handshake, so the access
+    token is read from ``?token=`` first and the Authorization header second.
+    """
+    query = parse_qs(scope.get('query_string', b'').decode())
+    if query.get('token'):
+        return query['token'][0]
+
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0].lower() == 'bearer':
+                return parts[1]
+    return None
+
+
+@database_sync_to_async
+def get_user_for_token(raw_token):
+    authentication = CachedJWTAuthentication()
+    try:
+        validated_token = authentication.get_validated_token(raw_token)
+        return authentication.get_user(validated_token)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Populates ``scope['user']`` from a simplejwt access token."""
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        raw_token = get_raw_token(scope)
+        scope['user'] = await get_user_for_token(raw_token) if raw_token else AnonymousUser()
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    return JWTAuthMiddleware(inner)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise marked async-capable. The stock middleware is sync-only,
+    which makes Django run everything below it, async views included, on
+    the one thread sync code shares, so a single slow async view (login)
+    would hold up every other request.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records wall time, SQL queries and SQL time, and time spent in external
+    calls (see core.metrics.timed) for every request, labelled by URL name.
+
+    With METRICS['PROFILING'] on, a request sent with ``X-Profile: cprofile``
+    or ``X-Profile: sql`` also has a cProfile dump or SQL trace written to
+    PROFILE_DIR, named in the ``X-Profile-Report`` response header.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _profile_mode(self, request):
+        config = metrics.get_metrics_settings()
+        if not config['PROFILING']:
+            return None
+        mode = request.headers.get(config['PROFILE_HEADER'], '').strip().lower()
+        return mode if mode in metrics.PROFILE_MODES else None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        mode = self._profile_mode(request)
+        stats, token = metrics.begin_request(trace_sql=mode == 'sql')
+        profilers = []
+        started = time.perf_counter()
+        try:
+            if mode == 'cprofile':
+                profilers.append(cProfile.Profile())
+                response = profilers[0].runcall(self.get_response, request)
+            else:
+                response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self._finish(request, response, stats, time.perf_counter() - started, mode, profilers)
+        return response
+
+    async def __acall__(self, request):
+        mode = self._profile_mode(request)
+        stats, token = metrics.begin_request(trace_sql=mode == 'sql')
+        profilers = []
+        if mode == 'cprofile':
+            # Sync views run on another thread; process_view profiles them there.
+            request._metrics_profilers = profilers
+            profilers.append(cProfile.Profile())
+            profilers[0].enable()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            if profilers:
+                profilers[0].disable()
+            metrics.end_request(token)
+        self._finish(request, response, stats, time.perf_counter() - started, mode, profilers)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profilers = getattr(request, '_metrics_profilers', None)
+        if profilers is None or iscoroutinefunction(view_func):
+            return None
+        profiler = cProfile.Profile()
+        profilers.append(profiler)
+        return profiler.runcall(view_func, request, *view_args, **view_kwargs)
+
+    def _finish(self, request, response, stats, elapsed, mode, profilers):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<unmatched>'
+        metrics.observe_request(view, request.method, response.status_code, elapsed, stats)
+        if mode is None:
+            return
+        try:
+            if mode == 'cprofile':
+                path = metrics.write_profile(view, profilers)
+            else:
+                path = metrics.write_sql_trace(view, stats)
+        except OSError:
+            logger.exception("Could not write %s report for %s", mode, view)
+            return
+        # The file name only; the server's directory layout stays private.
+        response['X-Profile-Report'] = os.path.basename(path)
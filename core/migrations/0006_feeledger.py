@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 00:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_transaction_reference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeLedger',
+            fields=[
+                ('fee_structure', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ledger', serialize=False, to='core.feestructure')),
+                ('tuition_paid', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('hostel_paid', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('other_paid', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('total_paid', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 01:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_listing_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['student', 'status', '-transaction_date'], name='core_txn_student_status_date'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['student', 'status', 'payment_type', 'amount'], name='core_txn_student_status_type'),
+        ),
+    ]
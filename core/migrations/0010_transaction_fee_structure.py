@@ -0,0 +1,79 @@
+# Generated by Django 5.2.1 on 2026-10-18 01:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# The academic year start month when this migration was written. Fixed here
+# rather than imported so the migration keeps doing the same thing however
+# core.academic changes later.
+ACADEMIC_YEAR_START_MONTH = 9
+
+
+def academic_year_of(day):
+    start = day.year if day.month >= ACADEMIC_YEAR_START_MONTH else day.year - 1
+    return f"{start}/{start + 1}"
+
+
+def assign_fee_structures(apps, schema_editor):
+    """
+    Tie each existing payment to its student's fee structure for the
+    academic year it was made in, chosen the way
+    FeeStructureQuerySet.current_for would have chosen it that year.
+    """
+    FeeStructure = apps.get_model('core', 'FeeStructure')
+    FeeLedger = apps.get_model('core', 'FeeLedger')
+    Transaction = apps.get_model('core', 'Transaction')
+
+    structures = {}
+    for pk, student_id, academic_year in FeeStructure.objects.values_list('pk', 'student_id', 'academic_year'):
+        structures.setdefault(student_id, []).append((academic_year, pk))
+
+    batch = []
+    payments = Transaction.objects.filter(fee_structure__isnull=True).only('pk', 'student_id', 'transaction_date')
+    for payment in payments.iterator(chunk_size=2000):
+        candidates = structures.get(payment.student_id)
+        if not candidates:
+            continue
+        year = academic_year_of(timezone.localdate(payment.transaction_date))
+        _, payment.fee_structure_id = max(candidates, key=lambda c: (c[0] <= year, c[0], c[1]))
+        batch.append(payment)
+        if len(batch) >= 1000:
+            Transaction.objects.bulk_update(batch, ['fee_structure'])
+            batch = []
+    Transaction.objects.bulk_update(batch, ['fee_structure'])
+
+    # Ledgers so far summed a student's payments across every year; each is
+    # rebuilt from its own year's payments the next time it is read.
+    FeeLedger.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='fee_structure',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='core.feestructure'),
+        ),
+        migrations.AlterField(
+            model_name='feestructure',
+            name='student',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='fee_structures', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='feestructure',
+            index=models.Index(fields=['student', 'academic_year'], name='core_fee_student_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['fee_structure', 'status', 'payment_type', 'amount'], name='core_txn_fee_status_type'),
+        ),
+        migrations.RunPython(assign_fee_structures, migrations.RunPython.noop),
+    ]
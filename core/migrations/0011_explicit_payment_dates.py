@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_transaction_fee_structure'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='paymenthistory',
+            name='date_paid',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='transaction_date',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -1,8 +1,13 @@
-from django.db import models
-from django.core.exceptions import ValidationError
+from django.db import models, transaction as db_transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from authentication.models import User
 from decimal import Decimal
 
+from core.academic import current_academic_year
+from core.locks import payment_write
+from core.queries import FEE_TYPES, get_fee_summary, paid_totals
+
 
 class ProgramFee(models.Model):
     program = models.CharField(max_length=100)
@@ -18,8 +23,27 @@ class ProgramFee(models.Model):
         return f"{self.program} - Level {self.level}"
 
 
+class FeeStructureQuerySet(models.QuerySet):
+    def current_for(self, student, academic_year=None):
+        """
+        ``student``'s structure for the current academic year, with its ledger.
+        Without one, the most recent earlier year's, then a later year's.
+        """
+        academic_year = academic_year or current_academic_year()
+        later = models.Case(
+            models.When(academic_year__gt=academic_year, then=models.Value(1)),
+            default=models.Value(0),
+        )
+        return (
+            self.filter(student=student)
+            .select_related('ledger')
+            .order_by(later, '-academic_year', '-pk')
+            .first()
+        )
+
+
 class FeeStructure(models.Model):
-    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='fee_structures')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='fee_structures', db_index=False)
     academic_year = models.CharField(max_length=20)
 
     tuition_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
@@ -32,6 +56,14 @@ class FeeStructure(models.Model):
 
     total_fee = models.DecimalField(max_digits=10, decimal_places=2, editable=False)
 
+    objects = FeeStructureQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # current_for: one seek per student, years in order.
+            models.Index(fields=['student', 'academic_year'], name='core_fee_student_year_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         self.total_fee = self.tuition_fee + self.hostel_fee + self.other_fee
         super().save(*args, **kwargs)
@@ -44,33 +76,33 @@ class FeeStructure(models.Model):
     #         payment_type=fee_type, status__in=['pending', 'completed']  
     #     ).aggregate(total=models.Sum('amount'))['total'] or 0
 
+    def get_ledger(self):
+        try:
+            return self.ledger
+        except FeeLedger.DoesNotExist:
+            return FeeLedger.rebuild(self)
+
     def get_paid_by_type(self, fee_type):
-        return self.student.transactions.filter(
-            payment_type=fee_type,
-            status='completed'  # Only completed ones count
-        ).aggregate(total=models.Sum('amount'))['total'] or 0
+        return self.get_ledger().paid_for(fee_type)
 
     
 
+    def get_summary(self):
+        return get_fee_summary(self)
+
     def get_pending_payments(self):
+        summary = self.get_summary()
         return {
-            'tuition': {
-                'amount': float(self.tuition_fee - self.get_paid_by_type('tuition')),
-                'due_date': self.tuition_due_date
-            },
-            'hostel': {
-                'amount': float(self.hostel_fee - self.get_paid_by_type('hostel')),
-                'due_date': self.hostel_due_date
-            },
-            'other': {
-                'amount': float(self.other_fee - self.get_paid_by_type('other')),
-                'due_date': self.other_due_date
-            },
+            fee_type: {
+                'amount': float(summary.balance_for(fee_type)),
+                'due_date': summary.due_dates[fee_type]
+            }
+            for fee_type in FEE_TYPES
         }
 
 
     def get_total_paid(self):
-        return sum(t.amount for t in self.student.transactions.filter(status='completed'))
+        return self.get_ledger().total_paid
     
     
 
@@ -87,19 +119,64 @@ class FeeStructure(models.Model):
 
 
     def get_balance(self):
-        return self.total_fee - self.get_total_paid()
+        return self.get_summary().outstanding_balance
 
     def is_fully_paid(self):
-        return self.get_total_paid() >= self.total_fee
+        return self.get_balance() <= 0
 
     def is_fee_type_paid(self, fee_type):
-        required = {
-            'tuition': self.tuition_fee,
-            'hostel': self.hostel_fee,
-            'other': self.other_fee
-        }.get(fee_type, 0)
-        paid = self.get_paid_by_type(fee_type)
-        return paid >= required
+        return self.get_summary().balance_for(fee_type) <= 0
+
+
+class FeeLedger(models.Model):
+    """
+    Running paid totals for one fee structure (a student's fees for one
+    academic year), kept in step with completed transactions so balance
+    reads are a single primary-key lookup.
+    """
+    PAID_FIELDS = {
+        'tuition': 'tuition_paid',
+        'hostel': 'hostel_paid',
+        'other': 'other_paid',
+    }
+
+    fee_structure = models.OneToOneField(FeeStructure, on_delete=models.CASCADE, primary_key=True, related_name='ledger')
+    tuition_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    hostel_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    other_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"FeeLedger({self.fee_structure})"
+
+    def paid_for(self, fee_type):
+        field = self.PAID_FIELDS.get(fee_type)
+        return getattr(self, field) if field else Decimal('0.00')
+
+    @classmethod
+    def compute(cls, fee_structure):
+        totals = paid_totals(fee_structure.transactions.all())
+        computed = {field: totals[fee_type] for fee_type, field in cls.PAID_FIELDS.items()}
+        computed['total_paid'] = totals['total']
+        return computed
+
+    @classmethod
+    def rebuild(cls, fee_structure):
+        ledger, _ = cls.objects.update_or_create(
+            fee_structure=fee_structure,
+            defaults=cls.compute(fee_structure),
+        )
+        fee_structure.ledger = ledger
+        return ledger
+
+    @classmethod
+    def record_payment(cls, fee_structure, transaction):
+        field = cls.PAID_FIELDS[transaction.payment_type]
+        cls.objects.filter(pk=fee_structure.pk).update(**{
+            field: models.F(field) + transaction.amount,
+            'total_paid': models.F('total_paid') + transaction.amount,
+        })
 
 
 class Transaction(models.Model):
@@ -120,58 +197,75 @@ class Transaction(models.Model):
     ]
 
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions')
+    # The fees this payment goes towards; set when the payment is validated.
+    fee_structure = models.ForeignKey(
+        FeeStructure, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='transactions', db_index=False,
+    )
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     payment_type = models.CharField(max_length=20, choices=PAYMENT_TYPE_CHOICES)
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
-    transaction_date = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add so bulk loads can keep their own dates.
+    transaction_date = models.DateTimeField(default=timezone.now, editable=False)
     installment_number = models.PositiveIntegerField(null=True, blank=True)
+    reference = models.CharField(max_length=20, unique=True, null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-transaction_date', '-id'], name='core_txn_date_id_idx'),
+            # A student's completed payments, newest first.
+            models.Index(fields=['student', 'status', '-transaction_date'], name='core_txn_student_status_date'),
+            # Covers the per-type paid/pending totals in core.queries.paid_totals
+            # without touching the table.
+            models.Index(fields=['student', 'status', 'payment_type', 'amount'], name='core_txn_student_status_type'),
+            # The same totals for one fee structure (ledger rebuilds, in-flight checks).
+            models.Index(fields=['fee_structure', 'status', 'payment_type', 'amount'], name='core_txn_fee_status_type'),
+        ]
 
    
     
     def clean(self):
-        latest_fee_structure = self.student.fee_structures.last()
-        if not latest_fee_structure:
-            raise ValidationError("No fee structure assigned to this student.")
-
-        if latest_fee_structure.is_fee_type_paid(self.payment_type):
-            raise ValidationError(f"{self.payment_type.capitalize()} fee has already been fully paid.")
-
-        required_for_type = {
-            'tuition': latest_fee_structure.tuition_fee,
-            'hostel': latest_fee_structure.hostel_fee,
-            'other': latest_fee_structure.other_fee
-        }.get(self.payment_type, Decimal('0.00'))
-
-        # 🟡 Now check what has been paid so far
-        already_paid = latest_fee_structure.get_paid_by_type(self.payment_type)
-        remaining = required_for_type - already_paid
-
-        # ✅ Enforce full remaining payment (no more, no less)
-        
-        if self.amount != remaining:
-            print(self.amount)
-            print(remaining)
-            raise ValidationError({
-                "amount": [f"You must pay the full remaining amount of GHS {remaining:.2f} for {self.payment_type}. You already paid GHS {already_paid:.2f}."]
-            })
-
-        # ✅ Optional: prevent overpaying total fee
-        total_paid = latest_fee_structure.get_total_paid()
-        if (total_paid + self.amount) > latest_fee_structure.total_fee:
-            raise ValidationError("This payment would exceed the total required fees.")
-
-
-
-
-
-
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        self.status = 'completed'
-        super().save(*args, **kwargs)  
+        from core.validation import PaymentSnapshot
+
+        if self.student_id is None or self.amount is None or not self.payment_type:
+            return
+        snapshot = PaymentSnapshot.take(self.student, exclude_pk=self.pk, fee_structure=self.fee_structure)
+        snapshot.validate(self.payment_type, self.amount)
+        self.fee_structure = snapshot.summary.fee_structure
+
+    def save(self, *args, validate=True, **kwargs):
+        # Validation applies to new payments; status updates from the
+        # gateway worker must not re-run the balance checks. Callers that
+        # already validated against a locked snapshot pass validate=False.
+        if validate and self._state.adding:
+            self.full_clean()
+        super().save(*args, **kwargs)
 
-    
+    def complete(self):
+        with payment_write(), db_transaction.atomic():
+            fee_structure = self.fee_structure
+            if fee_structure is None:
+                # Recorded before payments were tied to a fee structure.
+                fee_structure = FeeStructure.objects.current_for(self.student)
+                self.fee_structure = fee_structure
+            if fee_structure:
+                # Make sure the ledger exists before this payment counts
+                # as completed, otherwise a rebuild would include it twice.
+                fee_structure.get_ledger()
+            self.status = 'completed'
+            self.save(update_fields=['status', 'fee_structure'])
+            if fee_structure:
+                FeeLedger.record_payment(fee_structure, self)
+            PaymentHistory.objects.create(
+                transaction=self,
+                student=self.student,
+                amount=self.amount,
+            )
+
+    def fail(self):
+        self.status = 'failed'
+        self.save(update_fields=['status'])
 
 
     def __str__(self):
@@ -184,7 +278,38 @@ class PaymentHistory(models.Model):
     transaction = models.OneToOneField(Transaction, on_delete=models.CASCADE, related_name='payment_history')
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='payment_histories')
     amount = models.DecimalField(max_digits=10, decimal_places=2)
-    date_paid = models.DateTimeField(auto_now_add=True)
+    date_paid = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date_paid', '-id'], name='core_history_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"PaymentHistory({self.id})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    The first response to a request sent with an ``Idempotency-Key`` header,
+    replayed to retries that reuse the key (see core.idempotency).
+    ``status_code`` stays empty while the first request is still running.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    locked_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='core_idempotency_user_key'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='core_idempotency_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"IdempotencyKey({self.user_id}, {self.key})"
@@ -0,0 +1,40 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction as db_transaction
+
+from core.metrics import timed
+
+
+def user_group(user_id):
+    return f"user.{user_id}"
+
+
+def role_group(role):
+    return f"role.{role}"
+
+
+def notification_groups(user):
+    return [user_group(user.pk), role_group(user.role)]
+
+
+async def _send_to_groups(groups, event):
+    channel_layer = get_channel_layer()
+    with timed('channel_layer'):
+        for group in groups:
+            await channel_layer.group_send(group, event)
+
+
+def notify_payment(transaction, message):
+    """
+    Tell the paying student and admin listeners about a payment once the
+    current DB transaction commits, so nobody hears about a rolled-back row.
+    """
+    event = {
+        "type": "send_message",
+        "message": message,
+        "reference": transaction.reference,
+        "transactionId": transaction.id,
+        "status": transaction.status,
+    }
+    groups = [user_group(transaction.student_id), role_group('admin')]
+    db_transaction.on_commit(lambda: async_to_sync(_send_to_groups)(groups, event))
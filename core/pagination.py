@@ -0,0 +1,85 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+def get_pagination_settings():
+    return {
+        'PAGE_SIZE': 50,
+        'MAX_PAGE_SIZE': 500,
+        'LEGACY_UNPAGINATED': True,
+        **getattr(settings, 'CORE_PAGINATION', {}),
+    }
+
+
+def encode_cursor(date_value, pk):
+    raw = json.dumps([date_value.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_raw, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        date_value = parse_datetime(date_raw)
+        if date_value is None or not isinstance(pk, int):
+            raise ValueError(cursor)
+        return date_value, pk
+    except (ValueError, TypeError, binascii.Error):
+        raise ValidationError({"cursor": ["Invalid cursor."]})
+
+
+def get_page_size(request):
+    config = get_pagination_settings()
+    page_size = request.query_params.get('page_size')
+    if page_size is None:
+        return config['PAGE_SIZE']
+    try:
+        page_size = int(page_size)
+    except ValueError:
+        raise ValidationError({"page_size": ["A valid integer is required."]})
+    return max(1, min(page_size, config['MAX_PAGE_SIZE']))
+
+
+def wants_pagination(request):
+    """
+    Clients opt in by sending ``cursor`` or ``page_size``. With
+    ``LEGACY_UNPAGINATED`` turned off every request is paginated.
+    """
+    if not get_pagination_settings()['LEGACY_UNPAGINATED']:
+        return True
+    return 'cursor' in request.query_params or 'page_size' in request.query_params
+
+
+def paginate_keyset(request, queryset, date_field):
+    """
+    Newest-first keyset pagination over ``(date_field, id)``. Each page is an
+    index range scan starting after the previous page's last row, so deep
+    pages cost the same as the first. A ``.values()`` queryset must include
+    ``date_field`` and ``id``. Returns ``(rows, next_cursor)``.
+    """
+    page_size = get_page_size(request)
+    queryset = queryset.order_by(f'-{date_field}', '-id')
+
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        date_value, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{date_field}__lt': date_value}) | Q(**{date_field: date_value, 'id__lt': pk})
+        )
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last[date_field], last['id'])
+        else:
+            next_cursor = encode_cursor(getattr(last, date_field), last.pk)
+    return rows, next_cursor
@@ -0,0 +1,145 @@
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction as db_transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.metrics import timed
+from core.notifications import notify_payment
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+class GatewayResult:
+    def __init__(self, success, provider_reference='', message=''):
+        self.success = success
+        self.provider_reference = provider_reference
+        self.message = message
+
+
+class BaseGateway:
+    """
+    Interface every mobile-money provider implements. ``charge`` is called
+    from a background worker and may block for as long as the provider needs.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+
+    def charge(self, transaction, phone_number, network):
+        raise NotImplementedError('Payment gateways must implement charge()')
+
+
+class StubGateway(BaseGateway):
+    """
+    Offline provider for development and load testing. Waits ``latency``
+    seconds and approves every charge except numbers listed in ``fail_numbers``.
+    """
+
+    def charge(self, transaction, phone_number, network):
+        time.sleep(float(self.options.get('latency', 0)))
+        if phone_number in self.options.get('fail_numbers', ()):
+            return GatewayResult(False, message='Charge declined by provider')
+        return GatewayResult(True, provider_reference=f"STUB{uuid.uuid4().hex[:12].upper()}")
+
+
+def get_gateway():
+    config = settings.PAYMENT_GATEWAY
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PAYMENT_GATEWAY.get('WORKERS', 4),
+            thread_name_prefix='payment-gateway',
+        )
+    return _executor
+
+
+def submit_payment(transaction, phone_number, network):
+    """
+    Hand a pending transaction to the gateway. With ``ASYNC`` enabled the
+    charge runs on the worker pool once the current DB transaction commits,
+    so the request returns without waiting on the provider. The pool lives
+    in this process only; charges it loses on a restart are failed by
+    ``expire_stale_payments`` once ``TIMEOUT`` has passed.
+    """
+    if not settings.PAYMENT_GATEWAY.get('ASYNC', True):
+        process_payment(transaction.pk, phone_number, network)
+        return
+
+    db_transaction.on_commit(
+        lambda: _get_executor().submit(_run_in_worker, transaction.pk, phone_number, network)
+    )
+
+
+def _run_in_worker(transaction_id, phone_number, network):
+    close_old_connections()
+    try:
+        process_payment(transaction_id, phone_number, network)
+    except Exception:
+        logger.exception("Payment processing failed for transaction %s", transaction_id)
+    finally:
+        close_old_connections()
+
+
+def process_payment(transaction_id, phone_number, network):
+    from core.models import Transaction
+
+    transaction = Transaction.objects.select_related('student').get(pk=transaction_id)
+    if transaction.status != 'pending':
+        return transaction
+
+    try:
+        with timed('gateway'):
+            result = get_gateway().charge(transaction, phone_number, network)
+    except Exception as e:
+        logger.exception("Gateway error for transaction %s", transaction_id)
+        result = GatewayResult(False, message=str(e))
+
+    if result.success:
+        transaction.complete()
+        message = "New Transaction made successfully!"
+    else:
+        transaction.fail()
+        message = f"Transaction {transaction.reference} failed: {result.message}"
+
+    notify_payment(transaction, message)
+    return transaction
+
+
+def pending_cutoff(now=None):
+    """Pending transactions created before this have outlived the gateway."""
+    timeout = settings.PAYMENT_GATEWAY.get('TIMEOUT', 600)
+    return (now or timezone.now()) - timedelta(seconds=timeout)
+
+
+def expire_stale_payments(now=None):
+    """
+    Fail pending transactions older than ``TIMEOUT``: their charge was lost
+    with the worker that ran it, so they would otherwise stay pending and
+    block the student's next payment of that fee type. Returns how many
+    were failed.
+    """
+    from core.models import Transaction
+
+    stale = Transaction.objects.filter(status='pending', transaction_date__lt=pending_cutoff(now))
+    expired = 0
+    for transaction in stale.select_related('student').iterator():
+        with db_transaction.atomic():
+            # A worker may still finish the charge between the query and here.
+            if not Transaction.objects.filter(pk=transaction.pk, status='pending').update(status='failed'):
+                continue
+            transaction.status = 'failed'
+            notify_payment(transaction, f"Transaction {transaction.reference} failed: no response from the payment provider")
+        expired += 1
+    return expired
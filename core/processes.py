@@ -0,0 +1,38 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+# Settings a parent may have changed after start-up (a test database, a
+# benchmark's scratch file) that its workers must agree with.
+INHERITED_SETTINGS = ('DATABASES', 'MEDIA_ROOT')
+
+
+def _init_django_worker(settings_module, inherited):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    # Before setup, which may already open connections.
+    for name, value in inherited.items():
+        setattr(settings, name, value)
+    django.setup()
+
+
+def django_process_pool(max_workers=None):
+    """
+    ProcessPoolExecutor whose workers have Django set up and their own
+    database connections, for CPU-bound batch jobs.
+
+    Workers are spawned rather than forked: the caller may be a threaded
+    server, and a forked child would inherit locks held by other threads
+    and their open database handles.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_django_worker,
+        initargs=(
+            os.environ.get('DJANGO_SETTINGS_MODULE', 'mpas_backend.settings'),
+            {name: getattr(settings, name) for name in INHERITED_SETTINGS},
+        ),
+    )
@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation returns a value read from the database
+# unchanged, so projected values are used as they are.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+    PrimaryKeyRelatedField,
+)
+
+
+def _datetime_converter(field, current_timezone):
+    """
+    DateTimeField.to_representation with the output timezone and format
+    looked up once instead of for every value.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else current_timezone
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return convert
+
+
+def _compile(serializer, current_timezone, prefix=''):
+    """
+    ``(lookups, plan)`` for one serializer: the ``.values()`` lookups its
+    fields read, and per output field ``(name, lookup, convert, nested)``
+    where convert is None for pass-through fields and nested is the plan
+    of a nested serializer, whose lookup is then the related row's pk.
+    """
+    lookups = []
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            raise ImproperlyConfigured(f"{type(serializer).__name__}.{name} cannot be read from .values().")
+        if isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+            raise ImproperlyConfigured(f"{type(serializer).__name__}.{name}: many=True is not supported.")
+        lookup = prefix + '__'.join(field.source_attrs)
+
+        if isinstance(field, serializers.BaseSerializer):
+            # A missing related row renders as null, like the serializer;
+            # its pk tells that apart from a row of empty columns.
+            nested_lookups, nested_plan = _compile(field, current_timezone, lookup + '__')
+            lookups += [lookup + '__pk', *nested_lookups]
+            plan.append((name, lookup + '__pk', None, nested_plan))
+            continue
+
+        if isinstance(field, serializers.RelatedField) and (
+            not isinstance(field, PrimaryKeyRelatedField) or field.pk_field is not None
+        ):
+            raise ImproperlyConfigured(f"{type(serializer).__name__}.{name}: only primary key relations are supported.")
+        lookups.append(lookup)
+        if isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, serializers.MultipleChoiceField):
+            convert = None
+        elif isinstance(field, serializers.DateTimeField):
+            convert = _datetime_converter(field, current_timezone)
+        else:
+            convert = field.to_representation
+        plan.append((name, lookup, convert, None))
+    return lookups, plan
+
+
+def _build(plan, row):
+    item = {}
+    for name, lookup, convert, nested in plan:
+        value = row[lookup]
+        if value is None:
+            item[name] = None
+        elif nested is not None:
+            item[name] = _build(nested, row)
+        else:
+            item[name] = value if convert is None else convert(value)
+    return item
+
+
+class Projection:
+    """
+    Read-only rendering of a ModelSerializer's output straight from
+    ``.values()`` rows: no model instances, no per-row serializer, each
+    field's converter looked up once. The output matches
+    ``serializer_class(queryset, many=True).data``.
+
+    Suits list endpoints over plain model fields, nested serializers and
+    primary key relations; anything else is refused when first used.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._compiled = {}
+
+    def _get_compiled(self):
+        # Built on first use (serializer fields need the app registry), once
+        # per active timezone since datetimes are rendered in it.
+        current_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        if current_timezone not in self._compiled:
+            self._compiled[current_timezone] = _compile(self.serializer_class(), current_timezone)
+        return self._compiled[current_timezone]
+
+    def values(self, queryset):
+        """``queryset`` narrowed to the columns the serializer reads, as dicts."""
+        lookups, _ = self._get_compiled()
+        return queryset.values(*lookups)
+
+    def render(self, rows):
+        _, plan = self._get_compiled()
+        return [_build(plan, row) for row in rows]
+
+    def data(self, queryset):
+        return self.render(self.values(queryset))
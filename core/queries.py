@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db.models import Q, Sum
+
+FEE_TYPES = ('tuition', 'hostel', 'other')
+
+
+def paid_totals(transactions, status='completed'):
+    """
+    Paid amount per fee type plus the overall total for a queryset of
+    transactions, computed in one conditional-aggregation query.
+    """
+    aggregates = {
+        fee_type: Sum('amount', filter=Q(payment_type=fee_type))
+        for fee_type in FEE_TYPES
+    }
+    aggregates['total'] = Sum('amount', filter=Q(payment_type__in=FEE_TYPES))
+    row = transactions.filter(status=status).aggregate(**aggregates)
+    return {key: value or Decimal('0.00') for key, value in row.items()}
+
+
+@dataclass(frozen=True)
+class FeeSummary:
+    fee_structure: object
+    paid_by_type: dict
+    total_paid: Decimal
+
+    @property
+    def required_by_type(self):
+        return {
+            'tuition': self.fee_structure.tuition_fee,
+            'hostel': self.fee_structure.hostel_fee,
+            'other': self.fee_structure.other_fee,
+        }
+
+    @property
+    def due_dates(self):
+        return {
+            'tuition': self.fee_structure.tuition_due_date,
+            'hostel': self.fee_structure.hostel_due_date,
+            'other': self.fee_structure.other_due_date,
+        }
+
+    @property
+    def total_required(self):
+        return self.fee_structure.total_fee
+
+    @property
+    def outstanding_balance(self):
+        return self.total_required - self.total_paid
+
+    def balance_for(self, fee_type):
+        return self.required_by_type.get(fee_type, Decimal('0.00')) - self.paid_by_type.get(fee_type, Decimal('0.00'))
+
+    def outstanding_by_type(self):
+        """Fee types that still have a positive balance, in display order."""
+        outstanding = {}
+        for fee_type in FEE_TYPES:
+            balance = self.balance_for(fee_type)
+            if balance > 0:
+                outstanding[fee_type] = {
+                    'amount': round(balance, 2),
+                    'due_date': self.due_dates[fee_type],
+                }
+        return outstanding
+
+
+def get_fee_summary(fee_structure):
+    ledger = fee_structure.get_ledger()
+    return FeeSummary(
+        fee_structure=fee_structure,
+        paid_by_type={fee_type: ledger.paid_for(fee_type) for fee_type in FEE_TYPES},
+        total_paid=ledger.total_paid,
+    )
@@ -0,0 +1,76 @@
+import glob
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+
+from authentication.utils import draw_receipt_pdf
+
+# Bump when the receipt layout changes so cached files are re-rendered.
+RECEIPT_VERSION = 1
+
+
+def receipt_digest(transaction):
+    """Hash of every value printed on the receipt, plus the layout version."""
+    parts = [
+        RECEIPT_VERSION,
+        transaction.id,
+        transaction.student.full_name,
+        transaction.amount,
+        transaction.payment_type,
+        transaction.payment_method,
+        transaction.transaction_date.isoformat(),
+        transaction.status,
+    ]
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+
+
+def receipts_dir():
+    return os.path.join(settings.MEDIA_ROOT, 'receipts')
+
+
+def receipt_path(transaction, digest=None):
+    digest = digest or receipt_digest(transaction)
+    return os.path.join(receipts_dir(), f"{transaction.id}-v{RECEIPT_VERSION}-{digest}.pdf")
+
+
+def get_or_render_receipt(transaction):
+    """
+    Return ``(path, digest)`` for the transaction's receipt, rendering it
+    only if no file exists for the current content. Stale renders for the
+    same transaction are removed, so there is at most one file per receipt.
+    """
+    digest = receipt_digest(transaction)
+    path = receipt_path(transaction, digest)
+    if os.path.exists(path):
+        return path, digest
+
+    os.makedirs(receipts_dir(), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=receipts_dir(), suffix='.tmp')
+    os.close(fd)
+    try:
+        draw_receipt_pdf(transaction, transaction.student, tmp_path)
+        # Atomic rename: concurrent renders of the same receipt are harmless.
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    for stale in glob.glob(os.path.join(receipts_dir(), f"{transaction.id}-v*.pdf")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+    return path, digest
+
+
+def render_receipt_by_id(transaction_id):
+    """Process-pool entry point used by the prerender_receipts command."""
+    from core.models import Transaction
+
+    transaction = Transaction.objects.select_related('student').get(pk=transaction_id)
+    path, _ = get_or_render_receipt(transaction)
+    return path
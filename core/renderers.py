@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Selected by ``?format=csv``. Export views stream their own body; this
+    only renders error payloads such as validation failures.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['field', 'error'])
+        for field, errors in (data or {}).items():
+            for error in errors if isinstance(errors, list) else [errors]:
+                writer.writerow([field, error])
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data, default=str) + '\n').encode(self.charset)
+
+
+class PDFRenderer(BaseRenderer):
+    """
+    Lets clients send ``Accept: application/pdf`` to the receipt endpoint,
+    which returns the file itself; only error payloads pass through here.
+    """
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return json.dumps(data, default=str).encode()
@@ -2,5 +2,8 @@ from django.urls import path
 from . import consumer
 
 websocket_urlpatterns=[
+    path('ws/notifications/',consumer.MyConsumer.as_asgi()),
+    # Older clients still connect with a room name; it no longer selects
+    # what they receive.
     path('ws/chat/<str:room_name>/',consumer.MyConsumer.as_asgi()),
-]
\ No newline at end of file
+]
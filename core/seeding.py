@@ -0,0 +1,234 @@
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from authentication.models import AdminProfile, StudentProfile, User
+from core.academic import academic_year_label, academic_year_start
+from core.models import FeeLedger, FeeStructure, PaymentHistory, ProgramFee, Transaction
+
+PROGRAMS = [
+    "Computer Science", "Information Technology", "Telecommunications Engineering",
+    "Electrical Engineering", "Business Administration", "Accounting", "Procurement",
+    "Nursing", "Mathematics", "Statistics", "Economics", "Marketing",
+]
+LEVELS = ["100", "200", "300", "400", "500", "600"]
+DEPARTMENTS = ["Finance", "Registry", "Admissions", "IT Services", "Student Affairs"]
+FIRST_NAMES = [
+    "Kwame", "Ama", "Kofi", "Akosua", "Yaw", "Abena", "Kojo", "Efua", "Kwesi", "Adwoa",
+    "Kwabena", "Afua", "Yaa", "Kweku", "Esi", "Nana", "Fiifi", "Akua", "Selorm", "Dzifa",
+]
+LAST_NAMES = [
+    "Mensah", "Owusu", "Boateng", "Asante", "Osei", "Agyeman", "Appiah", "Amoah", "Darko",
+    "Addo", "Ofori", "Sarpong", "Tetteh", "Quaye", "Annan", "Ampofo", "Nkrumah", "Bediako",
+]
+NETWORK_PREFIXES = ["024", "054", "055", "020", "050", "026", "027"]
+
+# Chance that a student has settled each fee type in full this year, and
+# the most installments a settled fee is spread over.
+PAID_CHANCE = {'tuition': 0.7, 'hostel': 0.55, 'other': 0.8}
+MAX_INSTALLMENTS = {'tuition': 4, 'hostel': 2, 'other': 1}
+
+
+def _money(rng, low, high, step=50):
+    return Decimal(rng.randrange(low, high + step, step)).quantize(Decimal('0.01'))
+
+
+def _split(amount, parts, rng):
+    """``amount`` in ``parts`` installments, whole cedis except the last."""
+    if parts == 1:
+        return [amount]
+    weights = [rng.uniform(0.5, 1.5) for _ in range(parts)]
+    shares = [Decimal(int(amount * Decimal(w) / Decimal(sum(weights)))) for w in weights[:-1]]
+    return shares + [amount - sum(shares)]
+
+
+def seed_program_fees(rng, programs, levels):
+    fees = []
+    for program in PROGRAMS[:programs]:
+        for level in LEVELS[:levels]:
+            fee, _ = ProgramFee.objects.get_or_create(
+                program=program,
+                level=level,
+                defaults={
+                    'tuition_fee': _money(rng, 2000, 6000),
+                    'hostel_fee': _money(rng, 800, 2000),
+                    'other_fee': _money(rng, 100, 500),
+                },
+            )
+            fees.append(fee)
+    return fees
+
+
+class InstitutionSeeder:
+    """
+    Generates students with profiles, this year's fee structures, payment
+    activity and ledgers, ``batch_size`` students per transaction. The same
+    ``seed`` always produces the same data.
+    """
+
+    def __init__(self, seed=0, password="Password123!", prefix="SEED", batch_size=5000,
+                 failed_rate=0.3, now=None):
+        self.rng = random.Random(seed)
+        self.password_hash = make_password(password, salt=f"seed{seed}")
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.failed_rate = failed_rate
+        self.now = now or timezone.now()
+        start = academic_year_start(timezone.localdate(self.now))
+        self.year_start = timezone.make_aware(datetime.combine(start, time(8)))
+        self.academic_year = academic_year_label(start)
+        self.counts = {'students': 0, 'transactions': 0, 'payment_histories': 0, 'admins': 0}
+        self._references = 0
+
+    def _date_between(self, earliest, latest):
+        span = max((latest - earliest).total_seconds(), 1)
+        return earliest + timedelta(seconds=self.rng.uniform(0, span))
+
+    def _name(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def _reference(self):
+        self._references += 1
+        return f"{self.prefix[:6]}{self._references:012d}"
+
+    def _phone(self):
+        return f"{self.rng.choice(NETWORK_PREFIXES)}{self.rng.randrange(10**6, 10**7)}"
+
+    def seed_students(self, count, program_fees, progress=None):
+        for start in range(0, count, self.batch_size):
+            self._seed_batch(range(start, min(start + self.batch_size, count)), program_fees)
+            if progress:
+                progress(self.counts)
+        return self.counts
+
+    def _payments_for(self, fee_structure):
+        """
+        Transactions for one student's year, oldest first. Only completed
+        and failed ones: nothing is left in flight with a gateway that
+        will never answer it.
+        """
+        rows = []
+        earliest = self.year_start
+        for fee_type in ('tuition', 'hostel', 'other'):
+            fee = getattr(fee_structure, f"{fee_type}_fee")
+            roll = self.rng.random()
+            if roll < PAID_CHANCE[fee_type]:
+                parts = self.rng.randint(1, MAX_INSTALLMENTS[fee_type])
+                amounts = _split(fee, parts, self.rng)
+            elif roll < PAID_CHANCE[fee_type] + 0.15 and MAX_INSTALLMENTS[fee_type] > 1:
+                # Part-way through an installment plan.
+                amounts = _split(fee, MAX_INSTALLMENTS[fee_type], self.rng)[:-1]
+            else:
+                amounts = []
+
+            dates = sorted(self._date_between(earliest, self.now) for _ in amounts)
+            for number, (amount, when) in enumerate(zip(amounts, dates), start=1):
+                while self.rng.random() < self.failed_rate:
+                    rows.append((fee_type, amount, 'failed', when - timedelta(minutes=self.rng.randint(1, 90)), None))
+                rows.append((fee_type, amount, 'completed', when, number if len(amounts) > 1 else None))
+        return rows
+
+    def _seed_batch(self, indexes, program_fees):
+        with db_transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    full_name=self._name(),
+                    student_id=f"{self.prefix}{i:07d}",
+                    email=f"{self.prefix.lower()}{i:07d}@students.example.edu",
+                    phone_number=self._phone(),
+                    role='student',
+                    password=self.password_hash,
+                )
+                for i in indexes
+            ])
+            fees = [self.rng.choice(program_fees) for _ in users]
+            StudentProfile.objects.bulk_create([
+                StudentProfile(
+                    user=user,
+                    program=fee.program,
+                    level=fee.level,
+                    status='active' if self.rng.random() < 0.95 else 'inactive',
+                )
+                for user, fee in zip(users, fees)
+            ])
+            fee_structures = FeeStructure.objects.bulk_create([
+                FeeStructure(
+                    student=user,
+                    academic_year=self.academic_year,
+                    tuition_fee=fee.tuition_fee,
+                    hostel_fee=fee.hostel_fee,
+                    other_fee=fee.other_fee,
+                    tuition_due_date=(self.year_start + timedelta(days=60)).date(),
+                    hostel_due_date=(self.year_start + timedelta(days=30)).date(),
+                    other_due_date=(self.year_start + timedelta(days=90)).date(),
+                    total_fee=fee.tuition_fee + fee.hostel_fee + fee.other_fee,
+                )
+                for user, fee in zip(users, fees)
+            ])
+
+            transactions, ledgers = [], []
+            for user, fee_structure in zip(users, fee_structures):
+                paid = {'tuition': Decimal('0.00'), 'hostel': Decimal('0.00'), 'other': Decimal('0.00')}
+                for fee_type, amount, status, when, installment in self._payments_for(fee_structure):
+                    transactions.append(Transaction(
+                        student=user,
+                        fee_structure=fee_structure,
+                        amount=amount,
+                        payment_type=fee_type,
+                        payment_method='mobile_money' if self.rng.random() < 0.85 else 'bank',
+                        status=status,
+                        transaction_date=when,
+                        installment_number=installment,
+                        reference=self._reference(),
+                    ))
+                    if status == 'completed':
+                        paid[fee_type] += amount
+                ledgers.append(FeeLedger(
+                    fee_structure=fee_structure,
+                    tuition_paid=paid['tuition'],
+                    hostel_paid=paid['hostel'],
+                    other_paid=paid['other'],
+                    total_paid=sum(paid.values()),
+                ))
+
+            transactions = Transaction.objects.bulk_create(transactions)
+            histories = PaymentHistory.objects.bulk_create([
+                PaymentHistory(transaction=tx, student=tx.student, amount=tx.amount, date_paid=tx.transaction_date)
+                for tx in transactions if tx.status == 'completed'
+            ])
+            FeeLedger.objects.bulk_create(ledgers)
+
+        self.counts['students'] += len(users)
+        self.counts['transactions'] += len(transactions)
+        self.counts['payment_histories'] += len(histories)
+
+    def seed_admins(self, count):
+        with db_transaction.atomic():
+            admins = User.objects.bulk_create([
+                User(
+                    full_name=self._name(),
+                    email=f"{self.prefix.lower()}-admin{i}@example.edu",
+                    phone_number=self._phone(),
+                    role='admin',
+                    password=self.password_hash,
+                )
+                for i in range(count)
+            ])
+            AdminProfile.objects.bulk_create([
+                AdminProfile(user=admin, department=self.rng.choice(DEPARTMENTS)) for admin in admins
+            ])
+        self.counts['admins'] += len(admins)
+        return admins
+
+
+def seed_institution(students, admins=10, programs=6, levels=4, seed=0, progress=None, **options):
+    """Program fees, ``students`` students with a year of payments, and ``admins`` admins."""
+    seeder = InstitutionSeeder(seed=seed, **options)
+    program_fees = seed_program_fees(seeder.rng, programs, levels)
+    seeder.seed_students(students, program_fees, progress=progress)
+    seeder.seed_admins(admins)
+    return seeder.counts
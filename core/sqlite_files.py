@@ -0,0 +1,89 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+class SQLiteFile:
+    """
+    Pooled connections to one SQLite file that several worker processes
+    share, as the cache (core.cache) and channel layer (core.layers) do.
+    Connections use WAL mode so readers carry on while another process
+    writes; the first one creates ``schema`` and makes the file readable
+    by its owner only, since callers store pickles in it.
+
+    Pooled rather than thread-local: async_to_sync callers run each call on
+    a fresh executor thread.
+    """
+
+    def __init__(self, path, schema):
+        self.path = str(path)
+        self.schema = schema
+        self._connections = queue.SimpleQueue()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(self.schema)
+                    try:
+                        os.chmod(self.path, 0o600)
+                    except OSError:
+                        pass
+                    self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._connections.get_nowait()
+        except queue.Empty:
+            conn = self.connect()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    @contextmanager
+    def write(self):
+        """
+        A connection inside ``BEGIN IMMEDIATE``: the write lock is taken up
+        front, so a busy file is waited on rather than failing when a read
+        turns into a write.
+        """
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def shared_file(path, schema):
+    """
+    The process-wide ``SQLiteFile`` for ``path``. Keyed by pid too, so a
+    forked worker never reuses its parent's connections.
+    """
+    key = (str(path), os.getpid())
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = SQLiteFile(path, schema)
+        return _shared[key]
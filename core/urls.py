@@ -9,5 +9,8 @@ urlpatterns=[
     path('fees/stats/', views.get_fee_stats, name='get-fee-stats'),
     path('transactions/recent/', views.recent_transactions, name='recent_transactions'),
     path('transactions/', views.transactions, name='transactions'),
+    path('transactions/<int:transaction_id>/receipt/', views.transaction_receipt, name='transaction-receipt'),
+    path('transactions/export/', views.export_transactions, name='export-transactions'),
     path('history/', views.get_student_payment_history, name='student-payment-history'),
+    path('history/export/', views.export_payment_history, name='export-payment-history'),
 ]
\ No newline at end of file
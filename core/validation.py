@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from core.locks import payment_write
+from core.payments import pending_cutoff
+from core.queries import get_fee_summary, paid_totals
+
+
+class PaymentSnapshot:
+    """
+    A student's fee position read once: the current fee structure, its
+    ledger counters and the amounts still in flight with the gateway, all
+    scoped to that structure's academic year. Pending rows older than the
+    gateway ``TIMEOUT`` are lost charges, not in flight, and are ignored.
+
+    Taken with ``lock=True`` inside ``transaction.atomic`` the ledger rows are
+    written first, which holds the row lock (or SQLite's write lock) until
+    commit, so concurrent payments for the same student validate one at a time.
+    """
+
+    def __init__(self, summary, in_flight):
+        self.summary = summary
+        self.in_flight = in_flight
+
+    @classmethod
+    def take(cls, student, lock=False, exclude_pk=None, fee_structure=None):
+        from core.models import FeeLedger, FeeStructure
+
+        if lock:
+            FeeLedger.objects.filter(fee_structure__student=student).update(updated_at=timezone.now())
+
+        if fee_structure is None:
+            fee_structure = FeeStructure.objects.current_for(student)
+        elif lock:
+            # The caller's copy was read before the lock was taken.
+            ledger = FeeLedger.objects.filter(pk=fee_structure.pk).first()
+            if ledger:
+                fee_structure.ledger = ledger
+        if not fee_structure:
+            raise ValidationError("No fee structure assigned to this student.")
+
+        if lock:
+            # First payment against this structure: creating the ledger row
+            # takes the same lock as the update above.
+            fee_structure.get_ledger()
+
+        pending = fee_structure.transactions.filter(transaction_date__gte=pending_cutoff())
+        if exclude_pk:
+            pending = pending.exclude(pk=exclude_pk)
+
+        return cls(get_fee_summary(fee_structure), paid_totals(pending, status='pending'))
+
+    def validate(self, payment_type, amount):
+        summary = self.summary
+
+        if summary.balance_for(payment_type) <= 0:
+            raise ValidationError(f"{payment_type.capitalize()} fee has already been fully paid.")
+
+        if self.in_flight.get(payment_type, Decimal('0.00')) > 0:
+            raise ValidationError(f"A {payment_type} payment is already being processed.")
+
+        # Enforce full remaining payment (no more, no less)
+        already_paid = summary.paid_by_type.get(payment_type, Decimal('0.00'))
+        remaining = summary.balance_for(payment_type)
+        if amount != remaining:
+            raise ValidationError({
+                "amount": [f"You must pay the full remaining amount of GHS {remaining:.2f} for {payment_type}. You already paid GHS {already_paid:.2f}."]
+            })
+
+        committed = summary.total_paid + self.in_flight['total']
+        if (committed + amount) > summary.total_required:
+            raise ValidationError("This payment would exceed the total required fees.")
+
+
+def create_payment(student, amount, payment_type, payment_method, reference=None, fee_structure=None):
+    """
+    Validate and store a pending payment against one locked snapshot of the
+    student's fee position. ``fee_structure`` is the student's current one
+    when the caller has already resolved it.
+    """
+    from core.models import Transaction
+
+    transaction = Transaction(
+        student=student,
+        amount=amount,
+        payment_type=payment_type,
+        payment_method=payment_method,
+        status='pending',
+        reference=reference,
+    )
+    # Field checks need no queries; the student FK is already a loaded user.
+    transaction.clean_fields(exclude=['student'])
+
+    with payment_write(), db_transaction.atomic():
+        snapshot = PaymentSnapshot.take(student, lock=True, fee_structure=fee_structure)
+        snapshot.validate(transaction.payment_type, transaction.amount)
+        transaction.fee_structure = snapshot.summary.fee_structure
+        transaction.save(validate=False)
+
+    return transaction
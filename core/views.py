@@ -1,22 +1,50 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.http import FileResponse, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
 from django.core.exceptions import ValidationError
+import hmac
+import os
 import uuid
-import time
 
-from authentication.utils import generate_receipt_pdf
-from .models import Transaction, PaymentHistory
+from .models import FeeStructure, Transaction, PaymentHistory
+from . import metrics as request_metrics
+from .idempotency import idempotent
+from .exports import HISTORY_COLUMNS, TRANSACTION_COLUMNS, filter_export_queryset, stream_export
+from .projections import Projection
+from .pagination import paginate_keyset, wants_pagination
+from .payments import submit_payment
+from .queries import get_fee_summary
+from .receipts import get_or_render_receipt
+from .renderers import CSVRenderer, NDJSONRenderer, PDFRenderer
+from .validation import create_payment
 from authentication.models import User
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 from core.serilizers import  *
 
+HISTORY_LIST = Projection(PaymentHistorySerializer)
+
+
+def is_admin(user):
+    return user.role == 'admin' or user.is_staff
+
+
+def current_fee_structure(request):
+    """The user's current fee structure (with its ledger), looked up once per request."""
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, 'current_fee_structure'):
+        http_request.current_fee_structure = FeeStructure.objects.current_for(request.user)
+    return http_request.current_fee_structure
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def payment_view(request):
     data = request.data
 
@@ -33,44 +61,31 @@ def payment_view(request):
     except ValueError:
         return Response({'error': 'Invalid amount format'}, status=status.HTTP_400_BAD_REQUEST)
 
-    time.sleep(2)
     payment_reference = f"MP{uuid.uuid4().hex[:10].upper()}"
 
     try:
-        transaction = Transaction(
+        fee_structure = current_fee_structure(request)
+        transaction = create_payment(
             student=request.user,
             amount=amount,
             payment_type=fee_type,
             payment_method='mobile_money',
-            status='pending'
+            reference=payment_reference,
+            fee_structure=fee_structure,
         )
-        transaction.full_clean()
-        transaction.save()
 
-        PaymentHistory.objects.create(
-            transaction=transaction,
-            student=request.user,
-            amount=amount,
-            date_paid=timezone.now()
-        )
+        # The gateway call runs in the background; completion is pushed
+        # to WebSocket listeners by core.payments.process_payment.
+        submit_payment(transaction, phone, network)
+        transaction.refresh_from_db(fields=['status'])
 
-        fee_structure = request.user.fee_structures.last()
-        pending = {}
-        if fee_structure:
-            pending = fee_structure.get_pending_payments()
-
-        # Optional: Send notification to WebSocket
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            "chat__room1",
-            {
-                "type": "send_message",
-                "message": "New Transaction made successfully!",
-            }
-        )
+        # create_payment loaded the ledger; a gateway that answered inline
+        # has moved it on since.
+        fee_structure.ledger.refresh_from_db()
+        pending = fee_structure.get_pending_payments()
 
         return Response({
-            "message": "Payment processed",
+            "message": "Payment submitted",
             "reference": payment_reference,
             "amount": amount,
             "feeType": fee_type,
@@ -79,7 +94,7 @@ def payment_view(request):
             "transactionId": transaction.id,
             "status": transaction.status,
             "pending_payments": pending
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_202_ACCEPTED)
 
     except ValidationError as ve:
         return Response(
@@ -98,38 +113,12 @@ def payment_view(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_pending_payments(request):
-    user = request.user
-    fee_structure = user.fee_structures.last()
+    fee_structure = current_fee_structure(request)
 
     if not fee_structure:
         return Response({"detail": "No fee structure found for this user."}, status=status.HTTP_404_NOT_FOUND)
 
-    pending_payments = {}
-
-    fee_info = {
-        'tuition': {
-            'required': fee_structure.tuition_fee,
-            'due_date': fee_structure.tuition_due_date
-        },
-        'hostel': {
-            'required': fee_structure.hostel_fee,
-            'due_date': fee_structure.hostel_due_date
-        },
-        'other': {
-            'required': fee_structure.other_fee,
-            'due_date': fee_structure.other_due_date
-        }
-    }
-
-    for fee_type, info in fee_info.items():
-        paid = fee_structure.get_paid_by_type(fee_type)
-        balance = info['required'] - paid
-
-        if balance > 0:
-            pending_payments[fee_type] = {
-                "amount": round(balance, 2),
-                "due_date": info['due_date']  # Will return ISO date format or null
-            }
+    pending_payments = get_fee_summary(fee_structure).outstanding_by_type()
 
     return Response({"pending_payments": pending_payments}, status=status.HTTP_200_OK)
 
@@ -147,20 +136,17 @@ def get_completed_transactions(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_fee_stats(request):
-    user = request.user
-    fee_structure = user.fee_structures.last()
+    fee_structure = current_fee_structure(request)
 
     if not fee_structure:
         return Response({"detail": "No fee structure found for this user."}, status=status.HTTP_404_NOT_FOUND)
 
-    total_required = fee_structure.total_fee
-    total_paid = fee_structure.get_total_paid()
-    outstanding = fee_structure.get_balance()
+    summary = get_fee_summary(fee_structure)
 
     return Response({
-        "total_fee_required": round(total_required, 2),
-        "total_paid": round(total_paid, 2),
-        "outstanding_balance": round(outstanding, 2)
+        "total_fee_required": round(summary.total_required, 2),
+        "total_paid": round(summary.total_paid, 2),
+        "outstanding_balance": round(summary.outstanding_balance, 2)
     }, status=status.HTTP_200_OK)
 
 
@@ -168,7 +154,7 @@ def get_fee_stats(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def recent_transactions(request):
-    transactions = Transaction.objects.order_by('-transaction_date')[:5]
+    transactions = Transaction.objects.select_related('student').order_by('-transaction_date', '-id')[:5]
     data = [
         {
             "id": tx.id,
@@ -187,7 +173,12 @@ def recent_transactions(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def transactions(request):
-    transactions = Transaction.objects.order_by('-transaction_date')
+    transactions = Transaction.objects.select_related('student').order_by('-transaction_date', '-id')
+    next_cursor = None
+    paginated = wants_pagination(request)
+    if paginated:
+        transactions, next_cursor = paginate_keyset(request, transactions, 'transaction_date')
+
     data = [
         {
             "id": tx.id,
@@ -200,6 +191,8 @@ def transactions(request):
         }
         for tx in transactions
     ]
+    if paginated:
+        return Response({"results": data, "next_cursor": next_cursor})
     return Response(data)
 
 
@@ -207,6 +200,83 @@ def transactions(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_student_payment_history(request):
-    histories = PaymentHistory.objects.all().order_by('-date_paid')
-    serializer = PaymentHistorySerializer(histories, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+    histories = HISTORY_LIST.values(PaymentHistory.objects.order_by('-date_paid', '-id'))
+    if wants_pagination(request):
+        histories, next_cursor = paginate_keyset(request, histories, 'date_paid')
+        return Response({"results": HISTORY_LIST.render(histories), "next_cursor": next_cursor}, status=status.HTTP_200_OK)
+
+    return Response(HISTORY_LIST.render(histories), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([CSVRenderer, NDJSONRenderer])
+def export_transactions(request):
+    if not is_admin(request.user):
+        return Response({"detail": "Only admins can export payments."}, status=status.HTTP_403_FORBIDDEN)
+    queryset = filter_export_queryset(request, Transaction.objects.all(), 'transaction_date', allow_status=True)
+    return stream_export(request, queryset, TRANSACTION_COLUMNS, 'transaction_date', 'transactions')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([CSVRenderer, NDJSONRenderer])
+def export_payment_history(request):
+    if not is_admin(request.user):
+        return Response({"detail": "Only admins can export payments."}, status=status.HTTP_403_FORBIDDEN)
+    queryset = filter_export_queryset(request, PaymentHistory.objects.all(), 'date_paid')
+    return stream_export(request, queryset, HISTORY_COLUMNS, 'date_paid', 'payment_history')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, PDFRenderer])
+def transaction_receipt(request, transaction_id):
+    user = request.user
+    try:
+        transaction = Transaction.objects.select_related('student').get(pk=transaction_id)
+    except Transaction.DoesNotExist:
+        return Response({"detail": "Transaction not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    if transaction.student_id != user.pk and not is_admin(user):
+        return Response({"detail": "Transaction not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    if transaction.status != 'completed':
+        return Response(
+            {"detail": "Receipts are only available for completed transactions."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Rendered once per receipt version; repeats are served from disk or
+    # answered with 304 when the client's copy is current.
+    path, digest = get_or_render_receipt(transaction)
+    etag = f'"{digest}"'
+    last_modified = int(os.path.getmtime(path))
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    response = FileResponse(open(path, 'rb'), content_type='application/pdf', filename=f"receipt-{transaction.id}.pdf")
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@require_GET
+def metrics(request):
+    """
+    Request metrics in the Prometheus text format. A plain Django view so
+    scraping does not go through JWT authentication; the scraper must send
+    METRICS['TOKEN'] as a bearer token. Without a token configured the
+    endpoint is only open with DEBUG on.
+    """
+    token = request_metrics.get_metrics_settings()['TOKEN']
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+    return HttpResponse(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -10,18 +10,21 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter,URLRouter
-from channels.auth import AuthMiddlewareStack
-import core.routing
 
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mpas_backend.settings')
 
+# Initialise Django before importing anything that touches models.
+django_asgi_app = get_asgi_application()
+
+import core.routing  # noqa: E402
+from core.middleware import JWTAuthMiddlewareStack  # noqa: E402
+
 application = ProtocolTypeRouter(
     {
-        "http":get_asgi_application(),
-        "websocket":URLRouter(
+        "http":django_asgi_app,
+        "websocket":JWTAuthMiddlewareStack(URLRouter(
             core.routing.websocket_urlpatterns
-        )
+        ))
     }
 )
-
@@ -4,6 +4,7 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 import environ
+from corsheaders.defaults import default_headers
 import os
 
 
@@ -21,7 +22,7 @@ print("SECRET_KEY from env:", env('SECRET_KEY', default='NOT FOUND'))
 
 
 
-ALLOWED_HOSTS = ['oys25.pythonanywhere.com']
+ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=['oys25.pythonanywhere.com'])
 
 
 
@@ -41,7 +42,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,6 +55,8 @@ MIDDLEWARE = [
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+
 SECURE_CROSS_ORIGIN_OPENER_POLICY = None
 
 
@@ -84,10 +88,36 @@ ASGI_APPLICATION = "mpas_backend.asgi.application"
 
 
 
+# Run on every new SQLite connection. WAL lets readers carry on while a
+# write commits; synchronous=NORMAL is durable across crashes in WAL mode
+# short of power loss; mmap and a 64 MB page cache keep hot pages in memory.
+SQLITE_INIT_COMMAND = ';'.join([
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=%d' % (env.int('SQLITE_BUSY_TIMEOUT_MS', default=20000)),
+    'PRAGMA mmap_size=%d' % (env.int('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024)),
+    'PRAGMA cache_size=-64000',
+    'PRAGMA temp_store=MEMORY',
+])
+
+# CONN_MAX_AGE defaults to 0: the app is served by Daphne (ASGI), where sync
+# code runs on request-scoped threads and a persistent connection would be
+# left open on a thread no later request reuses. Under a WSGI server, set
+# DB_CONN_MAX_AGE to keep connections across requests.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': env('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=0),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': env.int('SQLITE_BUSY_TIMEOUT_MS', default=20000) / 1000,
+            # Take the write lock when a transaction starts rather than on
+            # its first write: a lock upgrade that loses a race fails with
+            # "database is locked" immediately, ignoring busy_timeout.
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': SQLITE_INIT_COMMAND,
+        },
     }
 }
 
@@ -146,18 +176,73 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.jwt.CachedJWTAuthentication',
     )
 }
 
+# Authenticated users are resolved from the cache for up to TIMEOUT seconds.
+# With TOKEN_CLAIMS the tokens also carry the user's role and profile.
+JWT_USER_CACHE = {
+    'TIMEOUT': env.int('JWT_USER_CACHE_TIMEOUT', default=60),
+    'TOKEN_CLAIMS': env.bool('JWT_TOKEN_CLAIMS', default=False),
+}
+
+
+# Shared by every worker process on this host through a local SQLite file,
+# so password reset tokens, throttle buckets and cached users set by one
+# worker are seen by the rest.
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.SQLiteCache',
+        'LOCATION': env('CACHE_PATH', default=str(BASE_DIR / 'cache.sqlite3')),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+            'CULL_INTERVAL': 5,
+        },
+    },
+}
+
 
+# Shared by every worker process on this host through a local SQLite file,
+# so group_send reaches WebSocket clients connected to any Daphne worker.
 CHANNEL_LAYERS = {
     'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'BACKEND': 'core.layers.SQLiteChannelLayer',
+        'CONFIG': {
+            'path': env('CHANNEL_LAYER_PATH', default=str(BASE_DIR / 'channels.sqlite3')),
+            'group_expiry': 86400,
+        },
     },
 }
 
 
+# Keyset pagination for transaction and payment history listings. With
+# LEGACY_UNPAGINATED, clients that send neither cursor nor page_size still
+# receive the full unpaginated list.
+CORE_PAGINATION = {
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 500,
+    'LEGACY_UNPAGINATED': True,
+}
+
+
+# Mobile-money provider used by core.payments. Charges run on a thread pool
+# of WORKERS threads; set ASYNC to False to process them inline. Payments
+# still pending TIMEOUT seconds after they were made are treated as lost
+# (e.g. the worker restarted mid-charge) and failed by the
+# expire_pending_payments command.
+PAYMENT_GATEWAY = {
+    'BACKEND': env('PAYMENT_GATEWAY_BACKEND', default='core.payments.StubGateway'),
+    'OPTIONS': {
+        'latency': env.float('PAYMENT_GATEWAY_LATENCY', default=2.0),
+    },
+    'WORKERS': env.int('PAYMENT_GATEWAY_WORKERS', default=8),
+    'ASYNC': True,
+    'TIMEOUT': env.int('PAYMENT_GATEWAY_TIMEOUT', default=600),
+}
+
+
 
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -169,4 +254,71 @@ EMAIL_HOST_USER = 'yawsarfo2019@gmail.com'
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 
 
+# Outgoing mail is queued in authentication.EmailOutbox and delivered by
+# `manage.py send_outbox`; failed sends back off exponentially and are
+# marked dead after MAX_ATTEMPTS. A batch leases its messages for
+# LEASE_SECONDS so overlapping runs never send the same one twice.
+EMAIL_OUTBOX = {
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_SECONDS': 30,
+    'LEASE_SECONDS': 300,
+}
+
+# Async login: password checks run on a pool of HASH_WORKERS threads (half
+# the cores by default, never more than one below the core count) so a
+# login storm cannot starve other requests.
+# Logins beyond MAX_QUEUE waiting get a 503.
+LOGIN_HASHING = {
+    'HASH_WORKERS': env.int('LOGIN_HASH_WORKERS', default=max(1, (os.cpu_count() or 2) // 2)),
+    'MAX_QUEUE': env.int('LOGIN_MAX_QUEUE', default=200),
+    'SLOW_QUEUE_SECONDS': 1.0,
+}
 
+# Payment requests sent with an Idempotency-Key header store their first
+# response for TTL_SECONDS and replay it to retries (`manage.py
+# purge_idempotency_keys` clears old keys). A retry arriving while the
+# first request runs waits up to WAIT_SECONDS for it; a first request
+# silent for STALE_SECONDS is presumed dead and its key is taken over.
+IDEMPOTENCY = {
+    'TTL_SECONDS': 86400,
+    'WAIT_SECONDS': 10,
+    'POLL_INTERVAL': 0.05,
+    'STALE_SECONDS': 60,
+}
+
+# Per-view request metrics, served in the Prometheus format at /metrics/.
+# Scrapers must send "Authorization: Bearer <TOKEN>"; with no TOKEN set the
+# endpoint answers 403 unless DEBUG is on.
+# With PROFILING, a request sent with "X-Profile: cprofile" or
+# "X-Profile: sql" also gets a profile or SQL trace written to PROFILE_DIR.
+METRICS = {
+    'TOKEN': env('METRICS_TOKEN', default=''),
+    'PROFILING': env.bool('METRICS_PROFILING', default=DEBUG),
+    'PROFILE_HEADER': 'X-Profile',
+    'PROFILE_DIR': env('METRICS_PROFILE_DIR', default=str(BASE_DIR / 'profiles')),
+}
+
+# Token buckets for the unauthenticated auth endpoints, one per client IP
+# and one per username/email: "N/period" allows bursts of N, refilled at N
+# per period. Set a rate to None to turn that bucket off.
+AUTH_THROTTLES = {
+    'login': {'IP': '30/min', 'IDENTIFIER': '10/min'},
+    'forgot_password': {'IP': '10/hour', 'IDENTIFIER': '3/hour'},
+    'reset_password': {'IP': '20/hour', 'IDENTIFIER': '5/hour'},
+}
+
+# Month the academic year starts in: fee structures, new students' years
+# and payments are labelled "2025/2026" from this month of 2025.
+ACADEMIC_YEAR_START_MONTH = 9
+
+# Bulk student import: rows per bulk_create and password hashing workers
+# (None uses every CPU). Small files are hashed in-process. The API takes at
+# most MAX_API_ROWS rows, since hashing holds the request open; larger files
+# go through `manage.py import_students`.
+STUDENT_IMPORT = {
+    'CHUNK_SIZE': env.int('STUDENT_IMPORT_CHUNK_SIZE', default=1000),
+    'HASH_WORKERS': env.int('STUDENT_IMPORT_HASH_WORKERS', default=None),
+    'INLINE_HASH_THRESHOLD': 200,
+    'MAX_API_ROWS': env.int('STUDENT_IMPORT_MAX_API_ROWS', default=200),
+}
@@ -19,9 +19,12 @@ from django.urls import path,include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core import views as core_views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/core/', include("core.urls")),
     path('api/users/', include("authentication.urls")),
+    path('metrics/', core_views.metrics, name='metrics'),
 
 ]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,122 @@
+import pytest  # type: ignore
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from authentication.models import AdminProfile, StudentProfile
+from core.models import FeeStructure, PaymentHistory, Transaction
+
+
+@pytest.fixture(autouse=True)
+def cache_path(settings, tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.SQLiteCache',
+            'LOCATION': str(path),
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        },
+    }
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(cache_path):
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def channel_layer_path(settings, tmp_path):
+    path = tmp_path / 'channels.sqlite3'
+    settings.CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'core.layers.SQLiteChannelLayer',
+            'CONFIG': {'path': str(path)},
+        },
+    }
+    return path
+
+
+@pytest.fixture
+def seed_rows():
+    """
+    Bulk-load ``count`` students (with profiles, fee structures, one completed
+    transaction and payment history each) and ``count`` admins with profiles.
+    """
+    User = get_user_model()
+
+    def _seed(count):
+        students = User.objects.bulk_create([
+            User(
+                full_name=f"Student {i}",
+                email=f"student{i}@example.com",
+                student_id=f"ST{i:06d}",
+                role='student',
+                password='!',
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user=student, program='Computer Science', level='100')
+            for student in students
+        ], batch_size=1000)
+        fee_structures = FeeStructure.objects.bulk_create([
+            FeeStructure(
+                student=student,
+                academic_year='2025/2026',
+                tuition_fee=Decimal('1000.00'),
+                hostel_fee=Decimal('500.00'),
+                other_fee=Decimal('100.00'),
+                total_fee=Decimal('1600.00'),
+            )
+            for student in students
+        ], batch_size=1000)
+        transactions = Transaction.objects.bulk_create([
+            Transaction(
+                student=fee_structure.student,
+                fee_structure=fee_structure,
+                amount=Decimal('100.00'),
+                payment_type='other',
+                payment_method='mobile_money',
+                status='completed',
+            )
+            for fee_structure in fee_structures
+        ], batch_size=1000)
+        PaymentHistory.objects.bulk_create([
+            PaymentHistory(transaction=tx, student=tx.student, amount=tx.amount)
+            for tx in transactions
+        ], batch_size=1000)
+
+        admins = User.objects.bulk_create([
+            User(
+                full_name=f"Admin {i}",
+                email=f"admin{i}@example.com",
+                role='admin',
+                password='!',
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        AdminProfile.objects.bulk_create([
+            AdminProfile(user=admin, department='Finance')
+            for admin in admins
+        ], batch_size=1000)
+        return students, admins
+
+    return _seed
+
+
+@pytest.fixture
+def query_budget(django_assert_max_num_queries):
+    """
+    Fetch ``url`` with ``client`` and fail if it runs more than ``budget``
+    SQL queries. Budgets must not depend on the number of rows returned.
+    """
+    def _check(client, url, budget):
+        with django_assert_max_num_queries(budget, info=f"Query budget exceeded for {url}"):
+            response = client.get(url)
+        assert response.status_code == 200, url
+        return response
+
+    return _check
@@ -0,0 +1,83 @@
+import multiprocessing
+import time
+from decimal import Decimal
+
+import pytest  # type: ignore
+
+from core.cache import SQLiteCache
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return SQLiteCache(str(tmp_path / 'shared.sqlite3'), {'OPTIONS': {'MAX_ENTRIES': 10, 'CULL_INTERVAL': 0}})
+
+
+def test_values_round_trip_and_expire(sqlite_cache):
+    sqlite_cache.set('token', 'AB12CD', timeout=60)
+    sqlite_cache.set('profile', {'level': '100', 'fee': Decimal('10.50')})
+    sqlite_cache.set('gone', 1, timeout=0)
+
+    assert sqlite_cache.get('token') == 'AB12CD'
+    assert sqlite_cache.get('profile') == {'level': '100', 'fee': Decimal('10.50')}
+    assert sqlite_cache.get('gone', 'missing') == 'missing'
+    assert sqlite_cache.get_many(['token', 'gone', 'nope']) == {'token': 'AB12CD'}
+
+    # Another instance on the same file (another worker) sees the same data.
+    other = SQLiteCache(sqlite_cache.path, {})
+    assert other.get('token') == 'AB12CD'
+    assert other.delete('token')
+    assert sqlite_cache.get('token') is None
+
+
+def test_add_only_replaces_expired_entries(sqlite_cache):
+    assert sqlite_cache.add('lock', 'first', timeout=60)
+    assert not sqlite_cache.add('lock', 'second', timeout=60)
+    assert sqlite_cache.get('lock') == 'first'
+
+    sqlite_cache.set('stale', 'old', timeout=0.05)
+    time.sleep(0.1)
+    assert sqlite_cache.add('stale', 'new')
+    assert sqlite_cache.get('stale') == 'new'
+
+
+def test_incr_keeps_expiry_and_type(sqlite_cache):
+    sqlite_cache.set('hits', 1, timeout=0.2)
+    assert sqlite_cache.incr('hits', 4) == 5
+    assert sqlite_cache.decr('hits') == 4
+    time.sleep(0.3)
+    assert sqlite_cache.get('hits') is None
+
+    sqlite_cache.set('amount', Decimal('1.50'))
+    assert sqlite_cache.incr('amount') == Decimal('2.50')
+    with pytest.raises(ValueError):
+        sqlite_cache.incr('missing')
+
+
+def test_entries_are_culled_past_max_entries(sqlite_cache):
+    sqlite_cache.set_many({f"key{i}": i for i in range(12)}, timeout=60)
+    sqlite_cache.set('forever', 'kept', timeout=None)
+    assert sqlite_cache.get('forever') == 'kept'
+    assert len(sqlite_cache.get_many([f"key{i}" for i in range(12)])) < 12
+
+
+def test_update_reads_and_writes_in_one_step(sqlite_cache):
+    assert sqlite_cache.update('bucket', lambda current: ((current or 0) + 2, current)) is None
+    assert sqlite_cache.update('bucket', lambda current: (current * 10, current)) == 2
+    assert sqlite_cache.get('bucket') == 20
+
+
+def _hammer(path, count):
+    cache = SQLiteCache(path, {})
+    for _ in range(count):
+        cache.incr('counter')
+
+
+def test_incr_is_atomic_across_processes(sqlite_cache):
+    sqlite_cache.set('counter', 0, timeout=None)
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_hammer, args=(sqlite_cache.path, 200)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert sqlite_cache.get('counter') == 800
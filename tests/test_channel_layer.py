@@ -0,0 +1,109 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest  # type: ignore
+from asgiref.sync import async_to_sync
+from channels.exceptions import ChannelFull
+
+from core.layers import SQLiteChannelLayer
+
+
+@pytest.fixture
+def make_layer(channel_layer_path):
+    def _make(**config):
+        return SQLiteChannelLayer(path=str(channel_layer_path), **config)
+    return _make
+
+
+def test_group_send_reaches_channels_registered_by_another_process(make_layer):
+    # Two layer instances on one file behave like two worker processes.
+    worker_a, worker_b = make_layer(), make_layer()
+    channel = async_to_sync(worker_a.new_channel)()
+    async_to_sync(worker_a.group_add)("payments", channel)
+
+    async_to_sync(worker_b.group_send)("payments", {"type": "send_message", "message": "hello"})
+
+    assert async_to_sync(worker_a.receive)(channel) == {"type": "send_message", "message": "hello"}
+
+
+def test_expired_group_membership_is_not_delivered(make_layer):
+    layer = make_layer(group_expiry=1)
+    async_to_sync(layer.group_add)("payments", "stale.channel")
+    async_to_sync(layer._run)(
+        lambda conn: conn.execute("UPDATE channel_groups SET joined = ?", (time.time() - 5,))
+    )
+
+    async_to_sync(layer.group_send)("payments", {"type": "send_message"})
+
+    assert async_to_sync(layer._run)(
+        lambda conn: conn.execute("SELECT COUNT(*) FROM channel_messages").fetchone()[0]
+    ) == 0
+
+
+def test_send_respects_channel_capacity(make_layer):
+    layer = make_layer(capacity=2)
+    async_to_sync(layer.send)("busy.channel", {"n": 1})
+    async_to_sync(layer.send)("busy.channel", {"n": 2})
+
+    with pytest.raises(ChannelFull):
+        async_to_sync(layer.send)("busy.channel", {"n": 3})
+
+    assert async_to_sync(layer.receive)("busy.channel") == {"n": 1}
+
+
+def test_one_poller_serves_every_receiver_in_the_process(make_layer, monkeypatch):
+    layer = make_layer(poll_interval=0.01, max_poll_interval=0.05)
+    polls = []
+    original = layer._receive_many
+    monkeypatch.setattr(layer, '_receive_many', lambda channels, now: polls.append(len(channels)) or original(channels, now))
+    channels = [f"client.{i}" for i in range(50)]
+
+    async def run():
+        receivers = [asyncio.ensure_future(layer.receive(channel)) for channel in channels]
+        await asyncio.sleep(0.3)
+        idle_polls = len(polls)
+        await layer.send("client.7", {"n": 7})
+        await layer.group_add("payments", "client.8")
+        await layer.group_send("payments", {"n": 8})
+        done, pending = await asyncio.wait(receivers, timeout=2, return_when=asyncio.FIRST_COMPLETED)
+        while len(done) < 2:
+            more, pending = await asyncio.wait(pending, timeout=2, return_when=asyncio.FIRST_COMPLETED)
+            done |= more
+        for receiver in pending:
+            receiver.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return idle_polls, sorted(receiver.result()["n"] for receiver in done)
+
+    idle_polls, received = async_to_sync(run)()
+
+    # Roughly one query every max_poll_interval for all 50 channels, not
+    # one per channel.
+    assert idle_polls < 20
+    assert max(polls) == 50
+    assert received == [7, 8]
+    assert not layer._receivers
+
+
+def test_poller_survives_a_failed_poll(make_layer, monkeypatch, caplog):
+    layer = make_layer(poll_interval=0.01, max_poll_interval=0.05)
+    original = layer._receive_many
+    failures = []
+
+    def flaky(channels, now):
+        if not failures:
+            failures.append(now)
+            raise sqlite3.OperationalError("database is locked")
+        return original(channels, now)
+
+    monkeypatch.setattr(layer, '_receive_many', flaky)
+
+    async def run():
+        receiver = asyncio.ensure_future(layer.receive("client.1"))
+        await asyncio.sleep(0.05)
+        await layer.send("client.1", {"n": 1})
+        return await asyncio.wait_for(receiver, timeout=2)
+
+    assert async_to_sync(run)() == {"n": 1}
+    assert failures
+    assert "Channel layer poll failed" in caplog.text
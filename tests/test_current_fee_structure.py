@@ -0,0 +1,105 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient  # type: ignore
+
+from core.academic import current_academic_year
+from core.models import FeeLedger, FeeStructure, Transaction
+from core.validation import create_payment
+
+
+@pytest.fixture
+def student(db):
+    return get_user_model().objects.create_user(
+        full_name="Returning Student",
+        email="returning@example.com",
+        student_id="ST8400",
+        password="ReturnPass123",
+        role="student",
+    )
+
+
+def add_structure(student, academic_year, tuition="1000.00"):
+    return FeeStructure.objects.create(
+        student=student,
+        academic_year=academic_year,
+        tuition_fee=Decimal(tuition),
+        hostel_fee=Decimal("500.00"),
+        other_fee=Decimal("100.00"),
+    )
+
+
+def test_academic_year_turns_over_in_start_month(settings):
+    assert current_academic_year(date(2026, 8, 31)) == "2025/2026"
+    assert current_academic_year(date(2026, 9, 1)) == "2026/2027"
+    settings.ACADEMIC_YEAR_START_MONTH = 1
+    assert current_academic_year(date(2026, 8, 31)) == "2026/2027"
+
+
+@pytest.mark.django_db
+def test_current_year_wins_over_insertion_order(student):
+    current = add_structure(student, "2025/2026")
+    # Created later, but for the next year and an earlier one.
+    add_structure(student, "2026/2027")
+    add_structure(student, "2024/2025")
+
+    assert FeeStructure.objects.current_for(student, "2025/2026") == current
+    # No structure for the year yet: the latest earlier one, then a later one.
+    assert FeeStructure.objects.current_for(student, "2027/2028").academic_year == "2026/2027"
+    assert FeeStructure.objects.current_for(student, "2023/2024").academic_year == "2026/2027"
+
+
+@pytest.mark.django_db
+def test_payments_count_towards_their_own_year(student):
+    previous = add_structure(student, "2000/2001")
+    old = Transaction.objects.create(
+        student=student, fee_structure=previous, amount=Decimal("1000.00"),
+        payment_type='tuition', payment_method='mobile_money',
+    )
+    old.complete()
+    current = add_structure(student, current_academic_year(), tuition="2000.00")
+
+    # Last year's tuition neither counts as paid nor blocks this year's.
+    payment = create_payment(student, Decimal("2000.00"), 'tuition', 'mobile_money')
+    assert payment.fee_structure == current
+    payment.complete()
+
+    assert FeeLedger.objects.get(pk=current.pk).tuition_paid == Decimal("2000.00")
+    assert FeeLedger.objects.get(pk=previous.pk).tuition_paid == Decimal("1000.00")
+    FeeLedger.objects.all().delete()
+    assert FeeLedger.rebuild(current).total_paid == Decimal("2000.00")
+
+
+@pytest.mark.django_db
+def test_pending_and_stats_read_current_structure_once(student, django_assert_num_queries):
+    add_structure(student, "2000/2001", tuition="9999.00")
+    add_structure(student, current_academic_year())
+    client = APIClient()
+    client.force_authenticate(user=student)
+    client.get("/api/core/fees/stats/")
+
+    # Fee structure and ledger in one query.
+    with django_assert_num_queries(1):
+        stats = client.get("/api/core/fees/stats/").data
+    assert stats["total_fee_required"] == Decimal("1600.00")
+    with django_assert_num_queries(1):
+        pending = client.get("/api/core/payments/pending/").data["pending_payments"]
+    assert pending["tuition"]["amount"] == Decimal("1000.00")
+
+
+@pytest.mark.django_db
+def test_current_for_seeks_student_year_index(seed_rows):
+    students, _ = seed_rows(200)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    with CaptureQueriesContext(connection) as queries:
+        FeeStructure.objects.current_for(students[0])
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {queries.captured_queries[-1]['sql']}")
+        plan = [row[-1] for row in cursor.fetchall()]
+    assert any("core_fee_student_year_idx" in line for line in plan), plan
@@ -0,0 +1,100 @@
+import smtplib
+from datetime import timedelta
+
+import pytest  # type: ignore
+from io import StringIO
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient  # type: ignore
+
+from authentication.models import EmailOutbox
+from authentication.outbox import claim_due, deliver_batch, queue_email
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise smtplib.SMTPServerDisconnected("connection dropped")
+
+
+class OverlappingBackend(BaseEmailBackend):
+    """Starts a second delivery run while the first is mid-batch."""
+    overlapping = []
+
+    def send_messages(self, email_messages):
+        if not self.overlapping:
+            self.overlapping.append(deliver_batch())
+        return len(email_messages)
+
+
+@pytest.mark.django_db
+def test_registration_queues_email_instead_of_sending():
+    response = APIClient().post("/api/users/register/", {
+        "full_name": "Queued Student",
+        "email": "queued@example.com",
+        "student_id": "ST2001",
+        "password": "QueuedPass123",
+        "role": "student"
+    })
+
+    assert response.status_code == 201
+    assert len(mail.outbox) == 0
+    assert EmailOutbox.objects.get().to_email == "queued@example.com"
+
+
+@pytest.mark.django_db
+def test_worker_sends_batch_and_clears_bodies():
+    for i in range(3):
+        queue_email(f"user{i}@example.com", "Hello", f"<p>PIN {i}</p>")
+
+    call_command('send_outbox', '--batch-size', '2', stdout=StringIO())
+
+    assert len(mail.outbox) == 3
+    assert mail.outbox[0].alternatives[0][0] == "<p>PIN 0</p>"
+    assert set(EmailOutbox.objects.values_list('status', flat=True)) == {'sent'}
+    assert set(EmailOutbox.objects.values_list('html_message', flat=True)) == {''}
+
+
+@pytest.mark.django_db
+def test_failed_sends_back_off_then_dead_letter(settings):
+    settings.EMAIL_BACKEND = 'test_email_outbox.FailingBackend'
+    settings.EMAIL_OUTBOX = {'MAX_ATTEMPTS': 2, 'BACKOFF_SECONDS': 0}
+    item = queue_email("flaky@example.com", "Hello", "<p>Hi</p>")
+
+    assert deliver_batch() == (0, 1)
+    item.refresh_from_db()
+    assert item.status == 'pending'
+    assert item.attempts == 1
+    assert "connection dropped" in item.last_error
+
+    assert deliver_batch() == (0, 1)
+    item.refresh_from_db()
+    assert item.status == 'dead'
+    assert item.html_message == ''
+    assert deliver_batch() == (0, 0)
+
+
+@pytest.mark.django_db
+def test_overlapping_runs_do_not_send_twice(settings):
+    settings.EMAIL_BACKEND = 'test_email_outbox.OverlappingBackend'
+    for i in range(3):
+        queue_email(f"user{i}@example.com", "Hello", f"<p>PIN {i}</p>")
+
+    assert deliver_batch() == (3, 0)
+    assert OverlappingBackend.overlapping == [(0, 0)]
+    assert EmailOutbox.objects.filter(status='sent', attempts=1).count() == 3
+
+
+@pytest.mark.django_db
+def test_abandoned_lease_comes_due_again():
+    item = queue_email("user@example.com", "Hello", "<p>Hi</p>")
+
+    # A run claims the message and dies before sending it.
+    claimed = claim_due(10, 300, timezone.now())
+    assert [claimed_item.pk for claimed_item in claimed] == [item.pk]
+    assert deliver_batch() == (0, 0)
+
+    EmailOutbox.objects.filter(pk=item.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+    assert deliver_batch() == (1, 0)
+    assert len(mail.outbox) == 1
@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+
+import pytest  # type: ignore
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework.test import APIClient  # type: ignore
+
+from authentication.jwt import get_tokens_for_user
+from core import exports
+from core.models import Transaction
+
+
+@pytest.fixture
+def export_client(seed_rows):
+    students, admins = seed_rows(25)
+    Transaction.objects.filter(pk__in=[tx.pk for tx in Transaction.objects.order_by('id')[:5]]).update(status='failed')
+    client = APIClient()
+    client.force_authenticate(user=admins[0])
+    return client
+
+
+def body_of(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Small export chunks, counting each one as it is read from the database."""
+    monkeypatch.setattr(exports, 'EXPORT_CHUNK_SIZE', 4)
+    fetched = []
+    original = exports.iter_keyset_chunks
+
+    def counted(*args, **kwargs):
+        for rows in original(*args, **kwargs):
+            fetched.append(len(rows))
+            yield rows
+
+    monkeypatch.setattr(exports, 'iter_keyset_chunks', counted)
+    return fetched
+
+
+@pytest.mark.django_db
+def test_csv_export_streams_every_row_across_chunks(export_client, monkeypatch):
+    monkeypatch.setattr(exports, 'EXPORT_CHUNK_SIZE', 4)
+
+    response = export_client.get("/api/core/transactions/export/", {"format": "csv"})
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/csv')
+    rows = list(csv.DictReader(io.StringIO(body_of(response))))
+    assert len(rows) == 25
+    assert len({row['id'] for row in rows}) == 25
+    assert rows[0]['amount'] == '100.00'
+
+
+@pytest.mark.django_db
+def test_ndjson_export_applies_status_filter(export_client):
+    response = export_client.get("/api/core/transactions/export/", {"format": "ndjson", "status": "failed"})
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in body_of(response).splitlines()]
+    assert len(lines) == 5
+    assert {line['status'] for line in lines} == {'failed'}
+
+
+@pytest.mark.django_db
+def test_history_export_and_invalid_filters(export_client):
+    response = export_client.get("/api/core/history/export/", {"format": "ndjson", "start": "2000-01-01"})
+    assert response.status_code == 200
+    assert len(body_of(response).splitlines()) == 25
+
+    response = export_client.get("/api/core/transactions/export/", {"format": "ndjson", "end": "yesterday"})
+    assert response.status_code == 400
+    assert "end" in json.loads(response.content)
+
+
+@pytest.mark.django_db
+def test_exports_are_admin_only(seed_rows):
+    students, _ = seed_rows(2)
+    client = APIClient()
+    client.force_authenticate(user=students[0])
+
+    for url in ("/api/core/transactions/export/", "/api/core/history/export/"):
+        assert client.get(url, {"format": "ndjson"}).status_code == 403
+
+
+@pytest.mark.django_db
+def test_wsgi_export_reads_each_chunk_as_it_is_sent(seed_rows, fetches):
+    _, admins = seed_rows(10)
+    client = APIClient()
+    client.force_authenticate(user=admins[0])
+
+    response = client.get("/api/core/history/export/", {"format": "ndjson"})
+    assert not response.is_async
+    parts = [(part, len(fetches)) for part in response.streaming_content]
+
+    # Nothing is read ahead of what the client has taken.
+    assert [seen for _, seen in parts] == [1, 2, 3]
+    assert len(b''.join(part for part, _ in parts).splitlines()) == 10
+
+
+@pytest.mark.django_db
+def test_asgi_export_sends_each_chunk_as_it_is_read(seed_rows, fetches):
+    _, admins = seed_rows(10)
+    access = get_tokens_for_user(admins[0])['access']
+
+    async def run():
+        response = await AsyncClient().get(
+            "/api/core/history/export/", {"format": "ndjson"}, headers={"Authorization": f"Bearer {access}"},
+        )
+        assert response.status_code == 200
+        assert response.is_async
+        return [(part, len(fetches)) async for part in response.streaming_content]
+
+    parts = async_to_sync(run)()
+    assert [seen for _, seen in parts] == [1, 2, 3]
+    assert len(b''.join(part for part, _ in parts).splitlines()) == 10
@@ -0,0 +1,115 @@
+import pytest  # type: ignore
+from decimal import Decimal
+from io import StringIO
+from rest_framework.test import APIClient  # type: ignore
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from core.models import FeeLedger, FeeStructure, Transaction
+from core.queries import paid_totals
+
+
+@pytest.fixture
+def fee_structure():
+    User = get_user_model()
+    user = User.objects.create_user(
+        full_name="Ledger Student",
+        email="ledger@example.com",
+        student_id="ST6000",
+        password="LedgerPass123",
+        role="student"
+    )
+    return FeeStructure.objects.create(
+        student=user,
+        academic_year="2025/2026",
+        tuition_fee=Decimal("1000.00"),
+        hostel_fee=Decimal("500.00"),
+        other_fee=Decimal("100.00"),
+    )
+
+
+def make_payment(fee_structure, payment_type, amount):
+    transaction = Transaction.objects.create(
+        student=fee_structure.student,
+        amount=Decimal(amount),
+        payment_type=payment_type,
+        payment_method='mobile_money',
+    )
+    transaction.complete()
+    return transaction
+
+
+@pytest.mark.django_db
+def test_completed_payments_update_ledger(fee_structure):
+    make_payment(fee_structure, 'hostel', '500.00')
+    make_payment(fee_structure, 'other', '100.00')
+
+    ledger = FeeLedger.objects.get(pk=fee_structure.pk)
+    assert ledger.hostel_paid == Decimal("500.00")
+    assert ledger.other_paid == Decimal("100.00")
+    assert ledger.total_paid == Decimal("600.00")
+
+    fee_structure = FeeStructure.objects.get(pk=fee_structure.pk)
+    assert fee_structure.get_balance() == Decimal("1000.00")
+    assert fee_structure.is_fee_type_paid('hostel')
+    assert not fee_structure.is_fully_paid()
+
+
+@pytest.mark.django_db
+def test_balance_reads_cost_one_query(fee_structure, django_assert_num_queries):
+    make_payment(fee_structure, 'tuition', '1000.00')
+    make_payment(fee_structure, 'hostel', '500.00')
+    fee_structure = FeeStructure.objects.get(pk=fee_structure.pk)
+
+    with django_assert_num_queries(1):
+        fee_structure.get_pending_payments()
+        fee_structure.get_balance()
+        fee_structure.is_fully_paid()
+
+
+@pytest.mark.django_db
+def test_verify_command_detects_and_rebuild_fixes_drift(fee_structure):
+    make_payment(fee_structure, 'hostel', '500.00')
+    FeeLedger.objects.filter(pk=fee_structure.pk).update(total_paid=Decimal("0.00"))
+
+    with pytest.raises(CommandError):
+        call_command('rebuild_fee_ledger', '--verify', stdout=StringIO())
+
+    call_command('rebuild_fee_ledger', stdout=StringIO())
+    call_command('rebuild_fee_ledger', '--verify', stdout=StringIO())
+    assert FeeLedger.objects.get(pk=fee_structure.pk).total_paid == Decimal("500.00")
+
+
+@pytest.mark.django_db
+def test_paid_totals_is_a_single_query(fee_structure, django_assert_num_queries):
+    make_payment(fee_structure, 'hostel', '500.00')
+    make_payment(fee_structure, 'other', '100.00')
+
+    with django_assert_num_queries(1):
+        totals = paid_totals(fee_structure.student.transactions.all())
+
+    assert totals == {
+        'tuition': Decimal("0.00"),
+        'hostel': Decimal("500.00"),
+        'other': Decimal("100.00"),
+        'total': Decimal("600.00"),
+    }
+
+
+@pytest.mark.django_db
+def test_pending_and_stats_views_share_fee_summary(fee_structure):
+    make_payment(fee_structure, 'hostel', '500.00')
+    client = APIClient()
+    client.force_authenticate(user=fee_structure.student)
+
+    pending = client.get("/api/core/payments/pending/").data["pending_payments"]
+    stats = client.get("/api/core/fees/stats/").data
+
+    assert set(pending) == {'tuition', 'other'}
+    assert pending['tuition']['amount'] == Decimal("1000.00")
+    assert stats == {
+        "total_fee_required": Decimal("1600.00"),
+        "total_paid": Decimal("500.00"),
+        "outstanding_balance": Decimal("1100.00"),
+    }
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient  # type: ignore
+
+from core import idempotency
+from core.models import FeeStructure, IdempotencyKey, Transaction
+
+
+@pytest.fixture
+def gateway_settings(settings):
+    settings.PAYMENT_GATEWAY = {
+        'BACKEND': 'core.payments.StubGateway',
+        'OPTIONS': {'latency': 0.3},
+        'ASYNC': False,
+    }
+    return settings
+
+
+@pytest.fixture
+def student():
+    user = get_user_model().objects.create_user(
+        full_name="Retrying Student", student_id="ST8200", password="RetryPass123", role="student",
+    )
+    FeeStructure.objects.create(
+        student=user,
+        academic_year="2025/2026",
+        tuition_fee=Decimal("1000.00"),
+        hostel_fee=Decimal("500.00"),
+        other_fee=Decimal("100.00"),
+    )
+    return user
+
+
+def pay(user, key, amount="500.00"):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client.post(
+        "/api/core/payments/",
+        {"phoneNumber": "0241234567", "network": "MTN", "amount": amount, "feeType": "hostel"},
+        format='json',
+        headers={'Idempotency-Key': key},
+    )
+
+
+@pytest.mark.django_db
+def test_retry_replays_first_response(gateway_settings, student):
+    first = pay(student, "retry-1")
+    retry = pay(student, "retry-1")
+
+    assert first.status_code == retry.status_code == 202
+    assert retry.json() == first.json()
+    assert retry['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first
+    assert Transaction.objects.filter(student=student).count() == 1
+
+    # A fresh key runs the view again and gets the real answer.
+    assert pay(student, "retry-2").status_code == 400
+
+
+@pytest.mark.django_db
+def test_key_reused_for_different_body_is_rejected(gateway_settings, student):
+    assert pay(student, "reused").status_code == 202
+    response = pay(student, "reused", amount="100.00")
+    assert response.status_code == 422
+    assert Transaction.objects.filter(student=student).count() == 1
+
+
+@pytest.mark.django_db
+def test_duplicate_waits_for_in_flight_first_request(gateway_settings, student, monkeypatch):
+    first = pay(student, "double-tap")
+    # Put the key back in flight, as if the first request were still running.
+    IdempotencyKey.objects.filter(key="double-tap").update(status_code=None)
+
+    polls = []
+
+    def first_request_finishes(seconds):
+        polls.append(seconds)
+        IdempotencyKey.objects.filter(key="double-tap").update(status_code=202)
+
+    monkeypatch.setattr(idempotency.time, 'sleep', first_request_finishes)
+    duplicate = pay(student, "double-tap")
+
+    assert len(polls) == 1
+    assert duplicate.status_code == 202
+    assert duplicate.json() == first.json()
+    assert Transaction.objects.filter(student=student).count() == 1
+
+
+@pytest.mark.django_db
+def test_duplicate_gives_up_with_409_then_takes_over_stale_key(gateway_settings, student):
+    gateway_settings.IDEMPOTENCY = {**gateway_settings.IDEMPOTENCY, 'WAIT_SECONDS': 0}
+    # A short payment is rejected without touching the ledger, so it can run twice.
+    assert pay(student, "stuck", amount="1.00").status_code == 400
+    IdempotencyKey.objects.filter(key="stuck").update(status_code=None)
+
+    busy = pay(student, "stuck", amount="1.00")
+    assert busy.status_code == 409
+    assert busy['Retry-After'] == '1'
+
+    # The first request never finished; once its key is stale the retry runs.
+    IdempotencyKey.objects.filter(key="stuck").update(locked_at=timezone.now() - timedelta(minutes=5))
+    retry = pay(student, "stuck", amount="1.00")
+    assert retry.status_code == 400
+    assert 'Idempotent-Replayed' not in retry
+    assert IdempotencyKey.objects.get(key="stuck").status_code == 400
+
+
+@pytest.mark.django_db
+def test_expired_keys_are_purged(student):
+    old = IdempotencyKey.objects.create(user=student, key="old", fingerprint="x", status_code=202)
+    IdempotencyKey.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=2))
+    IdempotencyKey.objects.create(user=student, key="new", fingerprint="x", status_code=202)
+
+    call_command('purge_idempotency_keys')
+    assert list(IdempotencyKey.objects.values_list('key', flat=True)) == ["new"]
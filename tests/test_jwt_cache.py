@@ -0,0 +1,82 @@
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient  # type: ignore
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.jwt import get_tokens_for_user
+from authentication.models import StudentProfile
+
+
+@pytest.fixture
+def student(db):
+    user = get_user_model().objects.create_user(
+        full_name="Cached Student", student_id="ST8001", email="cached@example.com",
+        password="StrongPass123", role="student",
+    )
+    StudentProfile.objects.create(user=user, program="Computer Science", level="100")
+    return user
+
+
+def client_with_token(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(user)['access']}")
+    return client
+
+
+@pytest.mark.django_db
+def test_repeat_requests_resolve_user_without_queries(student):
+    client = client_with_token(student)
+    assert client.get("/api/users/profile/").status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/users/profile/")
+
+    assert response.status_code == 200
+    assert response.data['student_profile']['level'] == "100"
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_profile_and_user_saves_invalidate_the_cache(student):
+    client = client_with_token(student)
+    client.get("/api/users/profile/")
+
+    profile = StudentProfile.objects.get(user=student)
+    profile.level = "200"
+    profile.save()
+    assert client.get("/api/users/profile/").data['student_profile']['level'] == "200"
+
+    student.is_active = False
+    student.save()
+    assert client.get("/api/users/profile/").status_code == 401
+
+
+@pytest.mark.django_db
+def test_password_reset_revokes_existing_tokens(student):
+    from django.core.cache import cache
+
+    client = client_with_token(student)
+    assert client.get("/api/users/profile/").status_code == 200
+    cache.set("password_reset_cached@example.com", "ABC123")
+
+    response = APIClient().post("/api/users/reset-password/", {
+        "email": "cached@example.com", "token": "ABC123", "new_password": "NewPass12345",
+    })
+
+    assert response.status_code == 200
+    assert client.get("/api/users/profile/").status_code == 401
+    assert client_with_token(get_user_model().objects.get(pk=student.pk)).get("/api/users/profile/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_role_and_profile_claims_are_opt_in(settings, student):
+    student = get_user_model().objects.select_related('student_profile').get(pk=student.pk)
+    assert 'role' not in AccessToken(get_tokens_for_user(student)['access'])
+
+    settings.JWT_USER_CACHE = {'TOKEN_CLAIMS': True}
+    token = AccessToken(get_tokens_for_user(student)['access'])
+
+    assert token['role'] == 'student'
+    assert token['profile'] == {'program': "Computer Science", 'level': "100", 'status': "active"}
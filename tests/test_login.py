@@ -0,0 +1,97 @@
+import threading
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient  # type: ignore
+
+from authentication import login
+
+
+@pytest.fixture
+def student(db):
+    return get_user_model().objects.create_user(
+        full_name="Login Student", student_id="ST7001", password="StrongPass123", role="student",
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    login.metrics.reset()
+    yield
+    login.metrics.reset()
+
+
+@pytest.mark.django_db
+def test_login_accepts_json_and_hashes_on_pool(student, monkeypatch):
+    threads = []
+    original = login.check_password
+
+    def spy(password, encoded):
+        threads.append(threading.current_thread().name)
+        return original(password, encoded)
+
+    monkeypatch.setattr(login, 'check_password', spy)
+
+    response = APIClient().post(
+        "/api/users/login/",
+        {"username": "ST7001", "password": "StrongPass123", "role": "student"},
+        format='json',
+    )
+
+    assert response.status_code == 200
+    assert response.data['user']['student_id'] == "ST7001"
+    assert threads and threads[0].startswith('login-hash')
+    snapshot = login.metrics.snapshot()
+    assert snapshot['submitted'] == 1
+    assert snapshot['waiting'] == 0 and snapshot['running'] == 0
+
+
+@pytest.mark.django_db
+def test_login_rejects_bad_credentials(student):
+    client = APIClient()
+
+    wrong = client.post("/api/users/login/", {"username": "ST7001", "password": "nope", "role": "student"})
+    assert wrong.status_code == 401
+    assert wrong.data == {'non_field_errors': ['Invalid credentials.']}
+
+    missing = client.post("/api/users/login/", {"username": "ST7001", "role": "student"})
+    assert missing.status_code == 401
+    assert 'password' in missing.data
+
+    assert client.get("/api/users/login/").status_code == 405
+
+
+@pytest.mark.django_db
+def test_login_sheds_load_when_queue_is_full(settings, student):
+    settings.LOGIN_HASHING = {'MAX_QUEUE': 0}
+
+    response = APIClient().post(
+        "/api/users/login/", {"username": "ST7001", "password": "StrongPass123", "role": "student"},
+    )
+
+    assert response.status_code == 503
+    assert response['Retry-After'] == '1'
+    assert login.metrics.snapshot()['rejected'] == 1
+
+
+@pytest.mark.parametrize("cpus,configured,expected", [(1, 2, 1), (2, 2, 1), (8, 4, 4), (8, 16, 7)])
+def test_hashing_pool_leaves_a_core_for_the_event_loop(settings, monkeypatch, cpus, configured, expected):
+    settings.LOGIN_HASHING = {'HASH_WORKERS': configured}
+    monkeypatch.setattr(login.os, 'cpu_count', lambda: cpus)
+
+    assert login.hash_workers() == expected
+
+
+def test_static_files_middleware_stays_async():
+    from asgiref.sync import async_to_sync, iscoroutinefunction
+    from django.test import RequestFactory
+
+    from core.middleware import StaticFilesMiddleware
+
+    async def view(request):
+        return "passed through"
+
+    middleware = StaticFilesMiddleware(view)
+
+    assert iscoroutinefunction(middleware)
+    assert async_to_sync(middleware)(RequestFactory().get("/api/users/login/")) == "passed through"
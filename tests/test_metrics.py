@@ -0,0 +1,110 @@
+import pytest  # type: ignore
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import Client
+from rest_framework.test import APIClient  # type: ignore
+
+from core import metrics
+from core.models import FeeStructure
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def student_client(settings):
+    settings.PAYMENT_GATEWAY = {
+        'BACKEND': 'core.payments.StubGateway',
+        'OPTIONS': {'latency': 0},
+        'ASYNC': False,
+    }
+    student = get_user_model().objects.create_user(
+        full_name="Metered Student", student_id="ST8100", password="MeterPass123", role="student",
+    )
+    FeeStructure.objects.create(
+        student=student,
+        academic_year="2025/2026",
+        tuition_fee=Decimal("1000.00"),
+        hostel_fee=Decimal("500.00"),
+        other_fee=Decimal("100.00"),
+    )
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return client
+
+
+def pay(client, fee_type="hostel", amount="500.00", headers=None):
+    return client.post(
+        "/api/core/payments/",
+        {"phoneNumber": "0241234567", "network": "MTN", "amount": amount, "feeType": fee_type},
+        headers=headers,
+    )
+
+
+def test_histogram_buckets_are_cumulative_and_series_bounded():
+    histogram = metrics.Histogram('test_seconds', 'Test.', ('view',), buckets=(0.1, 1.0), max_series=2)
+    for value, view in [(0.05, 'a'), (0.5, 'a'), (5.0, 'a'), (0.1, 'b'), (0.2, 'c'), (0.3, 'd')]:
+        histogram.observe(value, view)
+
+    lines = histogram.collect()
+    assert 'test_seconds_bucket{view="a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{view="a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{view="a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{view="a"} 3' in lines
+    # Only two label sets fit, so c and d share "other".
+    assert 'test_seconds_count{view="other"} 2' in lines
+    assert not any('view="c"' in line for line in lines)
+
+
+@pytest.mark.django_db
+def test_request_records_sql_and_gateway_time(student_client, settings):
+    settings.DEBUG = True
+    response = pay(student_client)
+    assert response.status_code == 202
+
+    text = Client().get("/metrics/").content.decode()
+    assert 'mpas_request_duration_seconds_count{view="payment",method="POST",status="2xx"} 1' in text
+    assert 'mpas_request_queries_count{view="payment"} 1' in text
+    assert 'mpas_request_external_seconds_count{view="payment",service="gateway"} 1' in text
+    assert 'mpas_external_call_seconds_count{service="gateway"} 1' in text
+    assert 'mpas_login_hashing_submitted' in text
+
+    queries = next(line for line in text.splitlines() if line.startswith('mpas_request_queries_sum{view="payment"}'))
+    assert int(queries.split()[-1]) > 0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_configured_token(settings):
+    settings.DEBUG = False
+    assert Client().get("/metrics/").status_code == 403
+
+    settings.METRICS = {**settings.METRICS, 'TOKEN': 'scrape-secret'}
+    assert Client().get("/metrics/").status_code == 403
+    assert Client().get("/metrics/", headers={'Authorization': 'Bearer wrong'}).status_code == 403
+
+    response = Client().get("/metrics/", headers={'Authorization': 'Bearer scrape-secret'})
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('mode, suffix', [('sql', '.sql.txt'), ('cprofile', '.prof')])
+def test_profile_header_writes_report_only_when_enabled(student_client, settings, tmp_path, mode, suffix):
+    settings.METRICS = {**settings.METRICS, 'PROFILING': False, 'PROFILE_DIR': str(tmp_path)}
+    assert 'X-Profile-Report' not in pay(student_client, headers={'X-Profile': mode})
+
+    settings.METRICS = {**settings.METRICS, 'PROFILING': True}
+    response = pay(student_client, fee_type="tuition", amount="1000.00", headers={'X-Profile': mode})
+    assert response.status_code == 202
+    report = response['X-Profile-Report']
+    assert '/' not in report and report.endswith(suffix)
+    report = tmp_path / report
+    if mode == 'sql':
+        with open(report) as fh:
+            content = fh.read()
+        assert content.startswith('-- payment:')
+        assert 'SELECT' in content
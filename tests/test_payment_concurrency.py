@@ -0,0 +1,93 @@
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, connection
+from django.utils import timezone
+
+from core.models import FeeStructure, Transaction
+from core.validation import create_payment
+
+
+@pytest.fixture
+def student():
+    User = get_user_model()
+    user = User.objects.create_user(
+        full_name="Double Tap",
+        email="doubletap@example.com",
+        student_id="ST7000",
+        password="TapTap123",
+        role="student"
+    )
+    FeeStructure.objects.create(
+        student=user,
+        academic_year="2025/2026",
+        tuition_fee=Decimal("1000.00"),
+        hostel_fee=Decimal("500.00"),
+        other_fee=Decimal("100.00"),
+    )
+    return user
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_payments_never_overpay(student):
+    threads = 8
+    barrier = threading.Barrier(threads)
+    outcomes = []
+
+    def attempt():
+        barrier.wait()
+        try:
+            for _ in range(50):
+                try:
+                    create_payment(student, Decimal("500.00"), 'hostel', 'mobile_money')
+                    outcomes.append('accepted')
+                    return
+                except OperationalError:
+                    # SQLite reports lock contention instead of waiting; retry.
+                    continue
+                except ValidationError:
+                    outcomes.append('rejected')
+                    return
+            outcomes.append('gave_up')
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=attempt) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert outcomes.count('accepted') == 1
+    assert Transaction.objects.filter(student=student, payment_type='hostel').count() == 1
+
+
+@pytest.mark.django_db
+def test_payment_validates_against_one_snapshot(student, django_assert_max_num_queries):
+    create_payment(student, Decimal("500.00"), 'hostel', 'mobile_money')
+
+    # BEGIN, ledger lock, fee structure + ledger, in-flight totals, insert,
+    # COMMIT. The previous clean()/full_clean() path took around ten reads.
+    with django_assert_max_num_queries(6):
+        create_payment(student, Decimal("1000.00"), 'tuition', 'mobile_money')
+
+    with pytest.raises(ValidationError):
+        create_payment(student, Decimal("1000.00"), 'tuition', 'mobile_money')
+
+
+@pytest.mark.django_db
+def test_payment_left_pending_past_gateway_timeout_does_not_block(student, settings):
+    lost = create_payment(student, Decimal("500.00"), 'hostel', 'mobile_money')
+    with pytest.raises(ValidationError):
+        create_payment(student, Decimal("500.00"), 'hostel', 'mobile_money')
+
+    timeout = settings.PAYMENT_GATEWAY.get('TIMEOUT', 600)
+    Transaction.objects.filter(pk=lost.pk).update(
+        transaction_date=timezone.now() - timedelta(seconds=timeout + 1),
+    )
+    retried = create_payment(student, Decimal("500.00"), 'hostel', 'mobile_money')
+    assert retried.status == 'pending'
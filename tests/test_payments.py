@@ -0,0 +1,127 @@
+import pytest  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from rest_framework.test import APIClient  # type: ignore
+from rest_framework import status  # type: ignore
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from core import payments
+from core.models import FeeStructure, PaymentHistory, Transaction
+from core.payments import StubGateway
+
+
+@pytest.fixture
+def gateway_settings(settings):
+    settings.PAYMENT_GATEWAY = {
+        'BACKEND': 'core.payments.StubGateway',
+        'OPTIONS': {'latency': 0, 'fail_numbers': ['0200000000']},
+        'ASYNC': False,
+        'TIMEOUT': 600,
+    }
+    return settings
+
+
+@pytest.fixture
+def student():
+    User = get_user_model()
+    user = User.objects.create_user(
+        full_name="Paying Student",
+        email="payer@example.com",
+        student_id="ST5000",
+        password="PayPass123",
+        role="student"
+    )
+    FeeStructure.objects.create(
+        student=user,
+        academic_year="2025/2026",
+        tuition_fee=Decimal("1000.00"),
+        hostel_fee=Decimal("500.00"),
+        other_fee=Decimal("100.00"),
+    )
+    return user
+
+
+@pytest.fixture
+def student_client(student):
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return client
+
+
+def pay(client, **overrides):
+    payload = {
+        "phoneNumber": "0241234567",
+        "network": "MTN",
+        "amount": "500.00",
+        "feeType": "hostel",
+    }
+    payload.update(overrides)
+    return client.post("/api/core/payments/", payload)
+
+
+@pytest.mark.django_db
+def test_payment_is_accepted_and_completed_by_gateway(gateway_settings, student, student_client):
+    response = pay(student_client)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data["reference"].startswith("MP")
+    transaction = Transaction.objects.get(pk=response.data["transactionId"])
+    assert transaction.reference == response.data["reference"]
+    assert transaction.status == "completed"
+    assert PaymentHistory.objects.filter(transaction=transaction).exists()
+
+
+@pytest.mark.django_db
+def test_declined_payment_is_marked_failed(gateway_settings, student, student_client):
+    response = pay(student_client, phoneNumber="0200000000")
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    transaction = Transaction.objects.get(pk=response.data["transactionId"])
+    assert transaction.status == "failed"
+    assert not PaymentHistory.objects.filter(transaction=transaction).exists()
+
+
+@pytest.mark.django_db
+def test_async_payment_is_deferred_until_commit(gateway_settings, student, student_client, django_capture_on_commit_callbacks):
+    gateway_settings.PAYMENT_GATEWAY = dict(gateway_settings.PAYMENT_GATEWAY, ASYNC=True)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = pay(student_client)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data["status"] == "pending"
+    assert len(callbacks) == 1
+
+
+class DyingGateway(StubGateway):
+    """The worker process is killed while the provider call is in flight."""
+
+    def charge(self, transaction, phone_number, network):
+        raise SystemExit()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_charge_lost_with_its_worker_is_failed_after_timeout(gateway_settings, student, student_client, monkeypatch):
+    gateway_settings.PAYMENT_GATEWAY = dict(
+        gateway_settings.PAYMENT_GATEWAY, BACKEND='tests.test_payments.DyingGateway', ASYNC=True,
+    )
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(payments, '_executor', executor)
+
+    response = pay(student_client)
+    executor.shutdown(wait=True)
+    transaction = Transaction.objects.get(pk=response.data["transactionId"])
+    assert transaction.status == "pending"
+
+    # Within the timeout the charge may still be running.
+    call_command('expire_pending_payments')
+    transaction.refresh_from_db()
+    assert transaction.status == "pending"
+
+    later = timezone.now() + timedelta(seconds=gateway_settings.PAYMENT_GATEWAY['TIMEOUT'] + 1)
+    assert payments.expire_stale_payments(now=later) == 1
+    transaction.refresh_from_db()
+    assert transaction.status == "failed"
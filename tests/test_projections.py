@@ -0,0 +1,69 @@
+import json
+from decimal import Decimal
+from operator import itemgetter
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient  # type: ignore
+
+from authentication.serializers import AdminDetailSerializer, StudentDetailSerializer
+from core.models import PaymentHistory
+from core.projections import Projection
+from core.serilizers import PaymentHistorySerializer
+
+
+@pytest.fixture
+def seeded(seed_rows):
+    students, admins = seed_rows(30)
+    User = get_user_model()
+    # No profile and no phone number: nested and plain nulls.
+    User.objects.create_user(
+        full_name="Profileless Student", email="bare@example.com", student_id="ST8500",
+        password="BarePass123", role="student",
+    )
+    User.objects.filter(pk=students[0].pk).update(phone_number="0240000000")
+    PaymentHistory.objects.filter(student=students[1]).update(amount=Decimal("12.5"))
+    return students, admins
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("serializer_class,queryset", [
+    (StudentDetailSerializer, lambda: get_user_model().objects.filter(role='student').order_by('id')),
+    (AdminDetailSerializer, lambda: get_user_model().objects.filter(role='admin').order_by('id')),
+    (PaymentHistorySerializer, lambda: PaymentHistory.objects.order_by('-date_paid', '-id')),
+])
+def test_projection_matches_serializer_output(seeded, serializer_class, queryset):
+    expected = serializer_class(queryset(), many=True).data
+    assert render(Projection(serializer_class).data(queryset())) == render(expected)
+
+
+@pytest.mark.django_db
+def test_list_views_build_rows_without_model_instances(seeded, django_assert_num_queries):
+    students, _ = seeded
+    client = APIClient()
+    client.force_authenticate(user=students[0])
+
+    with django_assert_num_queries(1):
+        listed = client.get("/api/users/students/").json()
+    expected = StudentDetailSerializer(get_user_model().objects.filter(role='student'), many=True).data
+    by_id = itemgetter('id')
+    assert sorted(listed, key=by_id) == sorted(json.loads(render(expected)), key=by_id)
+
+    first = client.get("/api/core/history/?page_size=20").json()
+    second = client.get(f"/api/core/history/?page_size=20&cursor={first['next_cursor']}").json()
+    assert first['results'] + second['results'] == client.get("/api/core/history/").json()
+
+
+def test_unsupported_fields_are_refused():
+    class Computed(serializers.Serializer):
+        label = serializers.SerializerMethodField()
+
+    with pytest.raises(ImproperlyConfigured):
+        Projection(Computed).render([])
@@ -0,0 +1,53 @@
+import pytest  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+from django.contrib.auth import get_user_model
+from django.test import Client
+
+
+API_BUDGETS = [
+    ("/api/core/transactions/", 1),
+    ("/api/core/transactions/?page_size=50", 1),
+    ("/api/core/transactions/recent/", 1),
+    ("/api/core/history/", 1),
+    ("/api/core/history/?page_size=50", 1),
+    ("/api/core/transactions/completed/", 1),
+    ("/api/users/students/", 1),
+    ("/api/users/admins/", 1),
+]
+
+# Session and permission lookups, the paginator count and the page itself.
+ADMIN_BUDGETS = [
+    ("/admin/core/transaction/", 8),
+    ("/admin/core/paymenthistory/", 8),
+    ("/admin/core/feestructure/", 8),
+    ("/admin/authentication/studentprofile/", 8),
+    ("/admin/authentication/adminprofile/", 8),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [10, 1000, 10000])
+def test_list_endpoints_stay_within_query_budget(seed_rows, query_budget, rows):
+    students, _ = seed_rows(rows)
+    client = APIClient()
+    client.force_authenticate(user=students[0])
+
+    for url, budget in API_BUDGETS:
+        query_budget(client, url, budget)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [10, 1000, 10000])
+def test_admin_changelists_stay_within_query_budget(seed_rows, query_budget, rows):
+    seed_rows(rows)
+    superuser = get_user_model().objects.create_superuser(
+        email="root@example.com",
+        password="RootPass123",
+        full_name="Root",
+        role="admin"
+    )
+    client = Client()
+    client.force_login(superuser)
+
+    for url, budget in ADMIN_BUDGETS:
+        query_budget(client, url, budget)
@@ -0,0 +1,85 @@
+"""
+EXPLAIN QUERY PLAN checks for the hot queries. Each must reach its table
+through an index; a plain ``SCAN <table>`` or a temp B-tree for ORDER BY
+means an index was dropped or a query stopped matching it.
+"""
+import re
+
+import pytest  # type: ignore
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient  # type: ignore
+
+from core.queries import paid_totals
+from core.validation import PaymentSnapshot
+
+# (url, index the main query must use)
+VIEW_PLANS = [
+    ("/api/core/transactions/completed/", "core_txn_student_status_date"),
+    ("/api/core/transactions/?page_size=50", "core_txn_date_id_idx"),
+    ("/api/core/transactions/recent/", "core_txn_date_id_idx"),
+    ("/api/core/history/?page_size=50", "core_history_date_id_idx"),
+    ("/api/users/students/", "auth_user_role_created_idx"),
+    ("/api/users/admins/", "auth_user_role_created_idx"),
+]
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def explain(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def assert_indexed(plan, index):
+    full_scans = [line for line in plan if FULL_SCAN.match(line)]
+    assert not full_scans, f"full table scan: {plan}"
+    assert not any("TEMP B-TREE" in line for line in plan), f"sort without index: {plan}"
+    assert any(index in line for line in plan), f"{index} not used: {plan}"
+
+
+@pytest.fixture
+def seeded(seed_rows):
+    students, _ = seed_rows(200)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return students
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url,index", VIEW_PLANS)
+def test_view_queries_use_indexes(seeded, url, index):
+    client = APIClient()
+    client.force_authenticate(user=seeded[0])
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+
+    plans = [explain(query['sql']) for query in queries.captured_queries]
+    main = [plan for plan in plans if any(index in line for line in plan)]
+    assert main, f"{index} not used: {plans}"
+    assert_indexed(main[0], index)
+    for plan in plans:
+        assert not [line for line in plan if FULL_SCAN.match(line)], plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("status", ["completed", "pending"])
+def test_paid_totals_is_answered_from_covering_index(seeded, status):
+    with CaptureQueriesContext(connection) as queries:
+        paid_totals(seeded[0].transactions.all(), status=status)
+
+    plan = explain(queries.captured_queries[-1]['sql'])
+    assert_indexed(plan, "core_txn_student_status_type")
+    assert any("COVERING INDEX" in line for line in plan), plan
+
+
+@pytest.mark.django_db
+def test_payment_snapshot_queries_use_indexes(seeded):
+    with CaptureQueriesContext(connection) as queries:
+        PaymentSnapshot.take(seeded[0], lock=True)
+
+    for query in queries.captured_queries:
+        plan = explain(query['sql'])
+        assert not [line for line in plan if FULL_SCAN.match(line)], (query['sql'], plan)
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+from decimal import Decimal
+from io import StringIO
+
+import pytest  # type: ignore
+from django.conf import settings as django_settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from rest_framework.test import APIClient  # type: ignore
+
+from core.models import Transaction
+
+
+@pytest.fixture
+def receipt_setup(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    User = get_user_model()
+    owner = User.objects.create_user(full_name="Receipt Owner", student_id="ST3001", password="x", role="student")
+    other = User.objects.create_user(full_name="Someone Else", student_id="ST3002", password="x", role="student")
+    transaction = Transaction(
+        student=owner,
+        amount=Decimal("250.00"),
+        payment_type='other',
+        payment_method='mobile_money',
+        status='completed',
+    )
+    transaction.save(validate=False)
+    return owner, other, transaction, tmp_path
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+def test_receipt_is_rendered_once_and_revalidated_with_etag(receipt_setup):
+    owner, _, transaction, media_root = receipt_setup
+    client = client_for(owner)
+    url = f"/api/core/transactions/{transaction.id}/receipt/"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first['Content-Type'] == 'application/pdf'
+    assert b''.join(first.streaming_content).startswith(b'%PDF')
+    files = os.listdir(media_root / 'receipts')
+    assert len(files) == 1
+
+    second = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+    assert second.status_code == 304
+    assert os.listdir(media_root / 'receipts') == files
+
+
+@pytest.mark.django_db
+def test_receipt_is_rerendered_when_content_changes(receipt_setup):
+    owner, _, transaction, media_root = receipt_setup
+    client = client_for(owner)
+    url = f"/api/core/transactions/{transaction.id}/receipt/"
+
+    etag = client.get(url)['ETag']
+    owner.full_name = "Renamed Owner"
+    owner.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert len(os.listdir(media_root / 'receipts')) == 1
+
+
+@pytest.mark.django_db
+def test_other_students_cannot_fetch_receipt(receipt_setup):
+    _, other, transaction, _ = receipt_setup
+
+    response = client_for(other).get(f"/api/core/transactions/{transaction.id}/receipt/")
+
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def worker_database(monkeypatch, tmp_path):
+    """
+    The in-memory test database copied to a file that spawned pool workers
+    (core.processes) are pointed at; this process keeps using the original.
+    """
+    path = tmp_path / 'workers.sqlite3'
+    connection.ensure_connection()
+    copy = sqlite3.connect(path)
+    connection.connection.backup(copy)
+    copy.close()
+    databases = {**django_settings.DATABASES, 'default': {**django_settings.DATABASES['default'], 'NAME': str(path)}}
+    monkeypatch.setattr(django_settings, 'DATABASES', databases)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_prerender_command_uses_process_pool(receipt_setup, worker_database):
+    _, _, transaction, media_root = receipt_setup
+
+    call_command('prerender_receipts', '--workers', '2', stdout=StringIO())
+
+    files = os.listdir(media_root / 'receipts')
+    assert len(files) == 1
+    assert files[0].startswith(f"{transaction.id}-v")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("since", ["yesterday", "2026-02-30"])
+def test_prerender_command_rejects_bad_since(since):
+    with pytest.raises(CommandError):
+        call_command('prerender_receipts', '--since', since, stdout=StringIO())
@@ -0,0 +1,49 @@
+from io import StringIO
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from core.models import FeeLedger, FeeStructure, PaymentHistory, ProgramFee, Transaction
+from core.seeding import InstitutionSeeder, seed_program_fees
+
+
+@pytest.mark.django_db
+def test_seed_institution_command_creates_consistent_data():
+    out = StringIO()
+
+    call_command('seed_institution', '--students', '60', '--admins', '3', '--programs', '2',
+                 '--levels', '2', '--batch-size', '25', stdout=out)
+
+    User = get_user_model()
+    assert ProgramFee.objects.count() == 4
+    assert User.objects.filter(role='student', student_profile__isnull=False).count() == 60
+    assert User.objects.filter(role='admin', admin_profile__isnull=False).count() == 3
+    assert FeeStructure.objects.count() == FeeLedger.objects.count() == 60
+    assert PaymentHistory.objects.count() == Transaction.objects.filter(status='completed').count() > 0
+    assert Transaction.objects.values('transaction_date__date').distinct().count() > 1
+    assert not Transaction.objects.filter(status='pending').exists()
+    assert User.objects.get(student_id="SEED0000000").check_password("Password123!")
+    assert "Created 60 students" in out.getvalue()
+
+    # Ledgers written in bulk agree with the transactions behind them.
+    call_command('rebuild_fee_ledger', '--verify', stdout=StringIO())
+
+    with pytest.raises(CommandError):
+        call_command('seed_institution', '--students', '1', stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_same_seed_generates_the_same_institution():
+    now = timezone.now()
+
+    def generate(prefix):
+        seeder = InstitutionSeeder(seed=7, prefix=prefix, batch_size=10, now=now)
+        seeder.seed_students(20, seed_program_fees(seeder.rng, 3, 2))
+        return list(
+            Transaction.objects.filter(student__student_id__startswith=prefix)
+            .order_by('id').values_list('payment_type', 'amount', 'status', 'transaction_date')
+        )
+
+    assert generate("AAA") == generate("BBB")
@@ -0,0 +1,33 @@
+import os
+import stat
+
+import pytest  # type: ignore
+
+from core.sqlite_files import SQLiteFile, shared_file
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS notes (body TEXT NOT NULL);"
+
+
+def test_file_is_private_and_in_wal_mode(tmp_path):
+    shared = SQLiteFile(tmp_path / 'notes.sqlite3', SCHEMA)
+
+    with shared.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert stat.S_IMODE(os.stat(shared.path).st_mode) == 0o600
+    shared.close()
+
+
+def test_failed_write_is_rolled_back(tmp_path):
+    shared = SQLiteFile(tmp_path / 'notes.sqlite3', SCHEMA)
+
+    with pytest.raises(RuntimeError):
+        with shared.write() as conn:
+            conn.execute("INSERT INTO notes (body) VALUES ('lost')")
+            raise RuntimeError()
+    with shared.write() as conn:
+        conn.execute("INSERT INTO notes (body) VALUES ('kept')")
+
+    with shared.connection() as conn:
+        assert conn.execute("SELECT body FROM notes").fetchall() == [('kept',)]
+    assert shared_file(shared.path, SCHEMA) is shared_file(shared.path, SCHEMA)
+    shared.close()
@@ -0,0 +1,28 @@
+import pytest  # type: ignore
+from django.db import connection, transaction
+
+from core import locks
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_connections_get_the_tuned_pragmas():
+    assert pragma("synchronous") == 1  # NORMAL
+    assert pragma("busy_timeout") == 20000
+    assert pragma("cache_size") == -64000
+    assert connection.transaction_mode == "IMMEDIATE"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_payment_write_lock_is_skipped_inside_atomic_blocks():
+    with locks.payment_write():
+        assert locks._payment_write_lock._is_owned()
+
+    with transaction.atomic():
+        with locks.payment_write():
+            assert not locks._payment_write_lock._is_owned()
@@ -0,0 +1,73 @@
+import pytest  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+from django.contrib.auth import get_user_model
+
+from authentication import stats
+from authentication.models import StudentProfile
+
+
+@pytest.fixture
+def stats_client(seed_rows):
+    students, admins = seed_rows(6)
+    StudentProfile.objects.filter(user=students[0]).update(status='inactive')
+    client = APIClient()
+    client.force_authenticate(user=admins[0])
+    return client
+
+
+@pytest.mark.django_db
+def test_stats_endpoints_share_one_cached_computation(stats_client, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        dashboard = stats_client.get("/api/users/dashboard/stats/").data
+
+    with django_assert_num_queries(0):
+        students = stats_client.get("/api/users/student-stats/").data
+        admins = stats_client.get("/api/users/admin-stats/").data
+
+    assert dashboard == {
+        "total_students": 6,
+        "total_admins": 6,
+        "total_amount_paid": 600.0,
+        "total_active_users": 11,
+    }
+    assert students == {
+        "total_students": 6,
+        "total_active_students": 5,
+        "total_inactive_students": 1,
+        "new_students_this_month": 6,
+    }
+    assert admins["total_admin"] == 6
+    assert admins["total_active_admin"] == 6
+
+
+@pytest.mark.django_db
+def test_saving_a_user_invalidates_cached_stats(stats_client):
+    assert stats_client.get("/api/users/student-stats/").data["total_students"] == 6
+
+    get_user_model().objects.create_user(
+        full_name="Late Joiner",
+        student_id="ST9999",
+        password="LatePass123",
+        role="student"
+    )
+
+    assert stats_client.get("/api/users/student-stats/").data["total_students"] == 7
+
+
+@pytest.mark.django_db
+def test_stats_computed_across_a_change_are_not_cached(stats_client, monkeypatch):
+    compute = stats.compute_stats
+
+    def overtaken(start_of_month):
+        result = compute(start_of_month)
+        # A user is saved after the counts were read, before they are stored.
+        get_user_model().objects.create_user(
+            full_name="Racing Joiner", student_id="ST9998", password="RacePass123", role="student",
+        )
+        return result
+
+    monkeypatch.setattr(stats, 'compute_stats', overtaken)
+    assert stats.get_stats()['total_students'] == 6
+    monkeypatch.undo()
+
+    assert stats.get_stats()['total_students'] == 7
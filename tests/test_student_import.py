@@ -0,0 +1,155 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient  # type: ignore
+
+from authentication.importers import import_students
+from authentication.models import EmailOutbox
+from authentication.stats import get_stats
+from core.models import FeeStructure, ProgramFee
+
+CSV = (
+    "full_name,student_id,email,password,program,level\n"
+    "Ama Mensah,ST5001,ama@example.com,pass1234,Computer Science,100\n"
+    "Kofi Boateng,ST5002,,pass1234,Computer Science,100\n"
+    "Esi Owusu,ST5003,esi@example.com,pass1234,Nursing,200\n"
+)
+
+
+@pytest.fixture
+def program_fee(db):
+    return ProgramFee.objects.create(
+        program="Computer Science", level="100",
+        tuition_fee=Decimal("1000.00"), hostel_fee=Decimal("500.00"), other_fee=Decimal("100.00"),
+    )
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = get_user_model().objects.create_user(
+        full_name="Import Admin", email="importer@example.com", password="x", role="admin",
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+def rows(count, start=0):
+    return [
+        {
+            'full_name': f"Student {i}",
+            'student_id': f"IMP{i:05d}",
+            'email': f"imp{i}@example.com",
+            'password': "pass1234",
+            'program': "Computer Science",
+            'level': "100",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.mark.django_db
+def test_import_creates_users_profiles_and_fee_structures(program_fee):
+    report = import_students(rows(3), notify=True)
+
+    assert report['created'] == 3
+    assert report['errors'] == []
+    user = get_user_model().objects.get(student_id="IMP00001")
+    assert user.check_password("pass1234")
+    assert user.student_profile.program == "Computer Science"
+    fee_structure = FeeStructure.objects.get(student=user)
+    assert fee_structure.total_fee == Decimal("1600.00")
+    assert EmailOutbox.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_invalid_rows_abort_the_whole_import(program_fee):
+    get_user_model().objects.create_user(full_name="Existing", student_id="IMP00002", password="x", role="student")
+    data = rows(4)
+    data[1]['student_id'] = data[0]['student_id']
+    del data[3]['password']
+
+    report = import_students(data)
+
+    assert report['created'] == 0
+    assert [error['row'] for error in report['errors']] == [2, 3, 4]
+    assert not get_user_model().objects.filter(student_id="IMP00000").exists()
+
+    report = import_students(data, skip_invalid=True)
+    assert report['created'] == 1
+
+
+@pytest.mark.django_db
+def test_large_import_hashes_in_process_pool(settings, program_fee):
+    settings.STUDENT_IMPORT = {'INLINE_HASH_THRESHOLD': 5, 'CHUNK_SIZE': 4}
+
+    report = import_students(rows(12), workers=2)
+
+    assert report['created'] == 12
+    assert FeeStructure.objects.count() == 12
+    assert get_user_model().objects.get(student_id="IMP00011").check_password("pass1234")
+
+
+@pytest.mark.django_db
+def test_import_refreshes_cached_dashboard_stats(program_fee):
+    assert get_stats()['total_students'] == 0
+
+    import_students(rows(3))
+
+    assert get_stats()['total_students'] == 3
+
+
+@pytest.mark.django_db
+def test_import_endpoint_accepts_csv_upload(admin_client, program_fee):
+    upload = SimpleUploadedFile("students.csv", CSV.encode(), content_type="text/csv")
+
+    response = admin_client.post("/api/users/students/import/", {'file': upload}, format='multipart')
+
+    assert response.status_code == 201
+    assert response.data['created'] == 3
+    assert [warning['row'] for warning in response.data['warnings']] == [3]
+    assert not FeeStructure.objects.filter(student__student_id="ST5003").exists()
+
+
+@pytest.mark.django_db
+def test_import_endpoint_dry_run_and_permissions(admin_client, program_fee):
+    response = admin_client.post(
+        "/api/users/students/import/", {'students': rows(2), 'dry_run': True}, format='json',
+    )
+    assert response.status_code == 200
+    assert response.data['created'] == 0
+    assert not get_user_model().objects.filter(role='student').exists()
+
+    student = get_user_model().objects.create_user(full_name="Nosy", student_id="ST5999", password="x", role="student")
+    client = APIClient()
+    client.force_authenticate(user=student)
+    assert client.post("/api/users/students/import/", {'students': rows(1)}, format='json').status_code == 403
+
+
+@pytest.mark.django_db
+def test_import_endpoint_sends_large_files_to_the_command(settings, admin_client, program_fee):
+    settings.STUDENT_IMPORT = {'MAX_API_ROWS': 2}
+
+    response = admin_client.post("/api/users/students/import/", {'students': rows(3)}, format='json')
+
+    assert response.status_code == 413
+    assert "import_students" in response.data['error']
+    assert not get_user_model().objects.filter(role='student').exists()
+
+
+@pytest.mark.django_db
+def test_import_students_command(tmp_path, program_fee):
+    path = tmp_path / "students.csv"
+    path.write_text(CSV + "Bad Row,,,,,\n")
+    out = StringIO()
+
+    with pytest.raises(CommandError):
+        call_command('import_students', str(path), stdout=out, stderr=StringIO())
+    assert not get_user_model().objects.filter(role='student').exists()
+
+    call_command('import_students', str(path), '--skip-invalid', stdout=out, stderr=StringIO())
+    assert "3 of 4 students imported" in out.getvalue()
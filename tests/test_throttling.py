@@ -0,0 +1,104 @@
+import multiprocessing
+
+import pytest  # type: ignore
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient  # type: ignore
+
+from authentication import login, throttling
+from authentication.models import EmailOutbox
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    throttling.metrics.reset()
+    yield
+    throttling.metrics.reset()
+
+
+@pytest.fixture
+def student(db):
+    return get_user_model().objects.create_user(
+        full_name="Throttled Student", email="throttled@example.com", student_id="ST8300",
+        password="StrongPass123", role="student",
+    )
+
+
+def test_bucket_allows_burst_then_refills():
+    rate = (2, 60)
+    assert throttling.take_token("throttle:test", rate, now=0) is None
+    assert throttling.take_token("throttle:test", rate, now=0) is None
+    assert throttling.take_token("throttle:test", rate, now=1) == pytest.approx(29)
+    # One token comes back every 30 seconds.
+    assert throttling.take_token("throttle:test", rate, now=31) is None
+    assert throttling.take_token("throttle:test", rate, now=31) is not None
+
+
+def _drain(key, attempts, allowed):
+    for _ in range(attempts):
+        if throttling.take_token(key, (100, 3600)) is None:
+            with allowed.get_lock():
+                allowed.value += 1
+
+
+def test_bucket_is_shared_atomically_by_worker_processes():
+    context = multiprocessing.get_context('fork')
+    allowed = context.Value('i', 0)
+    workers = [context.Process(target=_drain, args=("throttle:shared", 60, allowed)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    # 240 attempts against a bucket of 100: exactly 100 get through.
+    assert allowed.value == 100
+
+
+@pytest.mark.django_db
+def test_login_is_throttled_per_ip_before_hashing(settings, student, monkeypatch):
+    settings.AUTH_THROTTLES = {**settings.AUTH_THROTTLES, 'login': {'IP': '2/min', 'IDENTIFIER': None}}
+    checks = []
+    original = login.check_password
+    monkeypatch.setattr(login, 'check_password', lambda *args: checks.append(1) or original(*args))
+
+    client = APIClient()
+    payload = {"username": "ST8300", "password": "wrong", "role": "student"}
+    statuses = [client.post("/api/users/login/", payload, format='json').status_code for _ in range(3)]
+
+    assert statuses == [401, 401, 429]
+    assert len(checks) == 2
+    response = client.post("/api/users/login/", payload, format='json')
+    assert int(response['Retry-After']) > 0
+    assert response.json()['detail'].startswith('Request was throttled.')
+
+    snapshot = throttling.metrics.snapshot()
+    assert snapshot == {'login_allowed': 2, 'login_throttled_ip': 2}
+
+
+@pytest.mark.django_db
+def test_forgot_password_is_throttled_per_email(settings, student):
+    settings.AUTH_THROTTLES = {
+        **settings.AUTH_THROTTLES, 'forgot_password': {'IP': '10/hour', 'IDENTIFIER': '2/hour'},
+    }
+    client = APIClient()
+    # Case does not give an address a fresh bucket.
+    statuses = [
+        client.post("/api/users/forgot-password/", {"email": email}).status_code
+        for email in ["throttled@example.com", "throttled@example.com", "Throttled@Example.com"]
+    ]
+    assert statuses == [200, 200, 429]
+    assert EmailOutbox.objects.count() == 2
+
+    # Another address still goes through on the same IP.
+    assert client.post("/api/users/forgot-password/", {"email": "other@example.com"}).status_code == 200
+
+
+@pytest.mark.django_db
+def test_reset_password_guesses_are_limited_across_ips(settings, student):
+    settings.AUTH_THROTTLES = {**settings.AUTH_THROTTLES, 'reset_password': {'IP': None, 'IDENTIFIER': '3/hour'}}
+    client = APIClient()
+    payload = {"email": "throttled@example.com", "token": "GUESS1", "new_password": "NewPass12345"}
+    statuses = [
+        client.post("/api/users/reset-password/", payload, REMOTE_ADDR=f"10.0.0.{i}").status_code
+        for i in range(4)
+    ]
+    assert statuses == [400, 400, 400, 429]
+    assert throttling.metrics.snapshot()['reset_password_throttled_identifier'] == 1
@@ -0,0 +1,86 @@
+import json
+from decimal import Decimal
+
+import pytest  # type: ignore
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.middleware import JWTAuthMiddlewareStack
+from core.models import Transaction
+from core.notifications import notify_payment
+from core.routing import websocket_urlpatterns
+
+application = JWTAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+
+
+@pytest.fixture
+def users():
+    User = get_user_model()
+    return {
+        "payer": User.objects.create_user(full_name="Payer", student_id="ST1001", password="x", role="student"),
+        "bystander": User.objects.create_user(full_name="Bystander", student_id="ST1002", password="x", role="student"),
+        "admin": User.objects.create_user(full_name="Bursar", email="bursar@example.com", password="x", role="admin"),
+    }
+
+
+def communicator_for(user=None):
+    path = "/ws/notifications/"
+    if user is not None:
+        path += f"?token={AccessToken.for_user(user)}"
+    return WebsocketCommunicator(application, path)
+
+
+@pytest.mark.django_db
+def test_unauthenticated_connections_are_rejected():
+    async def run():
+        communicator = communicator_for()
+        connected, code = await communicator.connect()
+        return connected, code
+
+    connected, code = async_to_sync(run)()
+
+    assert not connected
+    assert code == 4401
+
+
+@pytest.mark.django_db
+def test_payment_events_reach_only_the_student_and_admins(users, django_capture_on_commit_callbacks):
+    transaction = Transaction(
+        student=users["payer"],
+        amount=Decimal("100.00"),
+        payment_type='other',
+        payment_method='mobile_money',
+        status='completed',
+        reference='MPTEST00001',
+    )
+    transaction.save(validate=False)
+
+    def notify():
+        with django_capture_on_commit_callbacks(execute=True):
+            notify_payment(transaction, "New Transaction made successfully!")
+
+    async def run():
+        communicators = {name: communicator_for(user) for name, user in users.items()}
+        for communicator in communicators.values():
+            connected, _ = await communicator.connect()
+            assert connected
+
+        await sync_to_async(notify)()
+
+        received = {}
+        for name, communicator in communicators.items():
+            if await communicator.receive_nothing(timeout=0.5):
+                received[name] = None
+            else:
+                received[name] = json.loads(await communicator.receive_from())
+            await communicator.disconnect()
+        return received
+
+    received = async_to_sync(run)()
+
+    assert received["bystander"] is None
+    assert received["payer"]["reference"] == "MPTEST00001"
+    assert received["admin"]["transactionId"] == transaction.id